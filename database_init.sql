@@ -14,5 +14,8 @@ CREATE TABLE IF NOT EXISTS room_configs (
 CREATE INDEX IF NOT EXISTS idx_room_configs_domain_room
   ON room_configs (config_domain, room_id);
 
+CREATE INDEX IF NOT EXISTS idx_room_configs_updated_at
+  ON room_configs (updated_at);
+
 CREATE TABLE IF NOT EXISTS schema_version (version INTEGER NOT NULL);
 INSERT OR IGNORE INTO schema_version(version) VALUES(1);
@@ -10,13 +10,25 @@ This is the main entry point that orchestrates all sweeper components:
 4. vault_warden.py - Vault retention management
 5. sweeper_report.py - Comprehensive reporting
 
+By default the components run in-process: hestia.toml is parsed once, the
+component classes are imported from ``automation.sweeper.components`` and the
+index/shared log is handed between them in memory (written to disk once per
+stage boundary that needs it). ``--mode subprocess`` (or
+``automation.sweeper.pipeline_mode = "subprocess"``) runs each component as its
+own interpreter for isolation and is also the fallback when a component cannot
+be imported.
+
 Usage:
     python backup_sweeper.py [--config=/path/to/hestia.toml] [--dry-run]
+                             [--mode inprocess|subprocess]
 
 Compliance: ADR-0018, ADR-0024, ADR-0027
 """
 
 import argparse
+import copy
+import importlib.util
+import json
 import logging
 import subprocess
 import sys
@@ -24,6 +36,9 @@ from datetime import UTC, datetime
 from pathlib import Path
 
 import toml
+import yaml
+
+PIPELINE_MODES = ("inprocess", "subprocess")
 
 
 class BackupSweeperOrchestrator:
@@ -49,6 +64,9 @@ class BackupSweeperOrchestrator:
             "report": self.base_path / self.components_config["report_generator"],
         }
 
+        # In-process shared log (frontmatter + data), see inprocess_steps
+        self.shared_log: dict | None = None
+
         # Pipeline state
         self.pipeline_stats = {
             "start_time": None,
@@ -161,10 +179,171 @@ class BackupSweeperOrchestrator:
             self.pipeline_stats["components_failed"].append(component_name)
             return False, error_msg
 
-    def run_pipeline(self, dry_run: bool = False) -> bool:
+    def _load_component_module(self, component_name: str):
+        """Import a component script by its configured path"""
+        component_path = self.components[component_name]
+        spec = importlib.util.spec_from_file_location(
+            f"hestia_sweeper_{component_name}", component_path
+        )
+        if spec is None or spec.loader is None:
+            raise ImportError(
+                f"Cannot import component {component_name} from {component_path}"
+            )
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+
+    def evict_checksum_cache(self) -> None:
+        """Drop checksum cache entries for gone or changed files (once per pipeline)"""
+        try:
+            # in-process components already imported it (and share its cache instance)
+            ops = sys.modules.get("sweeper_ops")
+            if ops is None:
+                ops_path = (
+                    Path(self.components["sweeper"]).resolve().parent / "sweeper_ops.py"
+                )
+                spec = importlib.util.spec_from_file_location("sweeper_ops", ops_path)
+                if spec is None or spec.loader is None:
+                    raise ImportError(f"Cannot import sweeper_ops from {ops_path}")
+                ops = importlib.util.module_from_spec(spec)
+                spec.loader.exec_module(ops)
+            cache = ops.open_checksum_cache(self.config)
+            if cache is not None:
+                cache.evict_stale()
+        except Exception as e:
+            self.logger.warning(f"Checksum cache eviction skipped: {e}")
+
+    def load_components(self) -> dict | None:
+        """Component classes for in-process mode, or None to use subprocesses"""
+        classes = {
+            "index": "WorkspaceIndexer",
+            "naming": "NamingStandardizer",
+            "sweeper": "FileLifecycleManager",
+            "vault": "VaultRetentionManager",
+            "report": "SweeperReportGenerator",
+        }
+        try:
+            return {
+                name: getattr(self._load_component_module(name), cls)
+                for name, cls in classes.items()
+            }
+        except Exception as e:
+            self.logger.warning(
+                f"In-process mode unavailable ({e}); using subprocess mode"
+            )
+            return None
+
+    @staticmethod
+    def write_shared_log(log_path: str, frontmatter: dict, data: dict) -> None:
+        """Write the shared log in the components' frontmatter + JSON format"""
+        with open(log_path, "w") as f:
+            f.write("---\n")
+            yaml.dump(frontmatter, f, default_flow_style=False)
+            f.write("---\n\n")
+            json.dump(data, f, indent=2, sort_keys=True)
+
+    def flush_shared_log(self) -> None:
+        """Write the in-memory shared log if stages merged results since last write"""
+        shared = self.shared_log
+        if shared and shared["dirty"]:
+            self.write_shared_log(shared["path"], shared["frontmatter"], shared["data"])
+            shared["dirty"] = False
+
+    def run_component_inprocess(self, component_name: str, stage) -> tuple[bool, str]:
+        """Run one in-process stage with the same bookkeeping as run_component"""
+        self.logger.info(f"Running component: {component_name} (in-process)")
+        try:
+            output = stage()
+        except Exception as e:
+            error_msg = f"Error running component {component_name}: {e}"
+            self.logger.error(error_msg)
+            self.pipeline_stats["components_failed"].append(component_name)
+            return False, error_msg
+        if output:
+            self.logger.info(f"{component_name} output: {output}")
+        self.pipeline_stats["components_executed"].append(component_name)
+        self.logger.info(f"✅ Component {component_name} completed successfully")
+        return True, output
+
+    def inprocess_steps(
+        self, classes: dict, shared_log_path: str, dry_run: bool
+    ) -> list[dict]:
+        """Pipeline stages sharing one config dict and the index object in memory"""
+        config_path = str(self.config_path)
+        shared = self.shared_log = {
+            "path": shared_log_path, "frontmatter": None, "data": None, "dirty": False
+        }
+
+        def run_index():
+            indexer = classes["index"](config_path, config=self.config)
+            indexer.discover_workspace_files()
+            index_data = indexer.generate_file_index()
+            indexer.save_index_log(shared_log_path, index_data)
+            # what the later components would read back from the log
+            shared["frontmatter"] = copy.deepcopy(index_data["metadata"])
+            shared["data"] = index_data
+            return f"total_files={index_data['statistics']['total_files']}"
+
+        def processing_stage(name: str, process):
+            def run():
+                if shared["data"] is None:
+                    raise ValueError("No index available from the index stage")
+                component = classes[name](config_path, config=self.config)
+                process(component, shared["data"])
+                if not dry_run:
+                    component.merge_into_shared_log(
+                        shared["frontmatter"], shared["data"]
+                    )
+                    shared["dirty"] = True
+                stats = json.dumps(component.stats, sort_keys=True)
+                return f"dry_run={dry_run} statistics={stats}"
+
+            return run
+
+        def run_report():
+            if shared["data"] is None:
+                raise ValueError("No shared log available from earlier stages")
+            # the one write of the merged shared log
+            self.flush_shared_log()
+            generator = classes["report"](config_path, config=self.config)
+            report_data = generator.generate_comprehensive_report(
+                shared_log_path,
+                {"frontmatter": shared["frontmatter"], "data": shared["data"]},
+            )
+            report_path = generator.save_report(report_data)
+            generator.update_report_index(report_path)
+            self.pipeline_stats["final_report_path"] = report_path
+            return f"report={report_path}"
+
+        steps = [
+            ("index", run_index),
+            (
+                "naming",
+                processing_stage(
+                    "naming", lambda c, d: c.process_file_index(d, dry_run=dry_run)
+                ),
+            ),
+            (
+                "sweeper",
+                processing_stage(
+                    "sweeper", lambda c, d: c.process_file_index(d, dry_run=dry_run)
+                ),
+            ),
+            (
+                "vault",
+                processing_stage(
+                    "vault", lambda c, d: c.process_vault_retention(d, dry_run=dry_run)
+                ),
+            ),
+            ("report", run_report),
+        ]
+        return [{"name": name, "stage": stage} for name, stage in steps]
+
+    def run_pipeline(self, dry_run: bool = False, mode: str | None = None) -> bool:
         """Run the complete backup sweeper pipeline"""
         self.pipeline_stats["start_time"] = datetime.now(UTC)
         self.logger.info("🚀 Starting backup sweeper pipeline")
+        mode = mode or self.sweeper_config.get("pipeline_mode", "inprocess")
 
         if dry_run:
             self.logger.info("🔍 Running in DRY-RUN mode - no changes will be made")
@@ -234,6 +413,13 @@ class BackupSweeperOrchestrator:
             },
         ]
 
+        classes = self.load_components() if mode == "inprocess" else None
+        if classes is not None:
+            pipeline_steps = self.inprocess_steps(classes, shared_log_path, dry_run)
+        self.logger.info(
+            f"Pipeline mode: {'inprocess' if classes is not None else 'subprocess'}"
+        )
+
         # Execute pipeline steps
         all_successful = True
 
@@ -241,9 +427,14 @@ class BackupSweeperOrchestrator:
             # Report component doesn't need dry-run (it just generates reports)
             pass_dry_run = dry_run if step["name"] != "report" else False
 
-            success, output = self.run_component(
-                step["name"], step["path"], step["args"], pass_dry_run
-            )
+            if "stage" in step:
+                success, output = self.run_component_inprocess(
+                    step["name"], step["stage"]
+                )
+            else:
+                success, output = self.run_component(
+                    step["name"], step["path"], step["args"], pass_dry_run
+                )
 
             if not success:
                 # Handle error based on configuration
@@ -259,6 +450,12 @@ class BackupSweeperOrchestrator:
                 else:
                     self.logger.info(f"ℹ️ {step['name']} completed with warnings")
 
+        if classes is not None:
+            # stopped before the report stage: still leave the merged results on disk
+            self.flush_shared_log()
+        if not dry_run:
+            self.evict_checksum_cache()
+
         # Pipeline completion
         self.pipeline_stats["end_time"] = datetime.now(UTC)
         duration = (
@@ -347,6 +544,13 @@ For detailed component options, run each component with --help.
     parser.add_argument(
         "--validate-only", action="store_true", help="Only validate components and configuration"
     )
+    parser.add_argument(
+        "--mode",
+        choices=PIPELINE_MODES,
+        help="inprocess: one interpreter, index shared in memory; subprocess: one "
+        "interpreter per component (default: automation.sweeper.pipeline_mode, "
+        "else inprocess)",
+    )
 
     args = parser.parse_args()
 
@@ -365,7 +569,7 @@ For detailed component options, run each component with --help.
                 return 1
 
         # Run pipeline
-        success = orchestrator.run_pipeline(dry_run=args.dry_run)
+        success = orchestrator.run_pipeline(dry_run=args.dry_run, mode=args.mode)
 
         # Cleanup
         orchestrator.cleanup_temp_files()
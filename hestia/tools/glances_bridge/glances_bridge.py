@@ -7,15 +7,19 @@ Small ADR-0031-compliant tool to normalize Glances API and optionally export via
 Usage:
   glances_bridge.py dry-run
   glances_bridge.py apply
+  glances_bridge.py bench [--payload recorded_all.json ...] [--iterations N]
 
 Behaviors (per ADR-0031):
 - Load config from /config/hestia/config/system/hestia.toml under
     [automation.glances_bridge]
-- dry-run: probe upstream, validate normalization rules, produce report + ledger
+- dry-run: probe upstream, compile the [[automation.glances_bridge.rules]]
+    pipeline and evaluate it on the probed samples, produce report + ledger
     (no writes)
 - apply: perform atomic install of normalizer script, start as background
     process, configure tailscale serve (if available), produce apply report +
     ledger
+- bench: time the streaming diskio normalizer against the legacy full
+    json round-trip on recorded (or live/synthetic) /all payloads; report only
 - Use write-broker if configured for writes
 - Implement run-lock and idempotency checks
 
@@ -26,6 +30,7 @@ from __future__ import annotations
 
 import argparse
 import contextlib
+import importlib.util
 import json
 import shutil
 import subprocess
@@ -36,6 +41,18 @@ from dataclasses import dataclass
 from datetime import UTC, datetime
 from pathlib import Path
 
+# shared ledger tooling (hestia/tools/utils/reportkit); optional
+if importlib.util.find_spec("reportkit") is None:
+    sys.path.append(str(Path(__file__).resolve().parents[1] / "utils"))
+try:
+    from reportkit.ledger_index import LedgerIndex, applied_apu_results
+except Exception:
+    LedgerIndex = None
+try:
+    from reportkit.ledger_retention import keep_tail
+except Exception:
+    keep_tail = None
+
 # --- Constants & defaults
 HTOML = Path("/config/hestia/config/system/hestia.toml")
 TOOL = "glances_bridge"
@@ -52,6 +69,20 @@ DEFAULT_CFG = {
         "normalizer_port": 61209,
         "tailscale_host": "",
         "tailscale_port": 61208,
+        # "threaded" (ThreadingHTTPServer) or "asyncio" (pooled keep-alive upstream)
+        "proxy_mode": "threaded",
+        "max_concurrency": 16,
+        "upstream_pool_size": 8,
+        # gzip/deflate normalized output for clients that accept it (0 = always)
+        "compress_min_bytes": 1024,
+        "compress_level": 6,
+        # per-endpoint coalescing cache TTL (seconds, longest prefix wins; 0 = off)
+        "cache_ttl": {
+            "/api/4/all": 2.0,
+            "/api/3/all": 2.0,
+            "/api/4/diskio": 2.0,
+            "/api/3/diskio": 2.0,
+        },
     },
     "apply": {
         "use_write_broker": False,
@@ -59,6 +90,23 @@ DEFAULT_CFG = {
         "write_broker_mode": "",
     },
     "retention": {"reports_days": 14, "ledger_lines": 20000},
+    # [[automation.glances_bridge.rules]]; compiled by the normalizer at startup
+    "rules": [
+        {
+            "name": "diskio_all_time_since_update",
+            "path_prefix": ["/api/4/all", "/api/3/all"],
+            "pointer": "/diskio/*/time_since_update",
+            "op": "default",
+            "value": 1.0,
+        },
+        {
+            "name": "diskio_list_time_since_update",
+            "path_prefix": ["/api/4/diskio", "/api/3/diskio"],
+            "pointer": "/*/time_since_update",
+            "op": "default",
+            "value": 1.0,
+        },
+    ],
 }
 
 # --- Helpers
@@ -84,6 +132,7 @@ def load_toml_config() -> dict:
     out.setdefault("runtime", DEFAULT_CFG["runtime"])
     out.setdefault("apply", DEFAULT_CFG["apply"])
     out.setdefault("retention", DEFAULT_CFG["retention"])
+    out.setdefault("rules", DEFAULT_CFG["rules"])
     return out
 
 
@@ -106,6 +155,16 @@ class Report:
 
 
 def append_ledger(index: Path, payload: dict):
+    li = None
+    if LedgerIndex is not None:
+        with contextlib.suppress(Exception):
+            li = LedgerIndex(index, applied_apu_results).open()
+    if li is not None:
+        try:
+            li.append(payload)
+        finally:
+            li.close()
+        return
     index.parent.mkdir(parents=True, exist_ok=True)
     with index.open("a", encoding="utf-8") as fh:
         fh.write(json.dumps(payload, separators=(",", ":")) + "\n")
@@ -132,6 +191,13 @@ def acquire_lock(lockfile: Path):
 def last_applied_sha(index: Path, target: str) -> str | None:
     if not index.exists():
         return None
+    if LedgerIndex is not None:
+        # O(1) lookup in the sidecar index (rebuilt from the JSONL if missing)
+        with (
+            contextlib.suppress(Exception),
+            LedgerIndex(index, applied_apu_results) as li,
+        ):
+            return li.latest(target)
     try:
         with index.open("r", encoding="utf-8") as fh:
             for line in reversed(fh.readlines()[-5000:]):
@@ -189,40 +255,522 @@ def broker_rewrite(cfg_apply: dict, dst: Path, temp_src: Path) -> tuple[int, str
 # normalizer script content (kept small and similar to the provided snippet)
 NORMALIZER_SCRIPT = r"""
 #!/usr/bin/env python3
-import json, sys
+import asyncio, gzip, json, re, sys, threading, time, zlib
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
 from urllib.request import urlopen, Request
 from urllib.error import URLError, HTTPError
 
 UPSTREAM = "__UPSTREAM__"
+PROXY_MODE = "__PROXY_MODE__"
+MAX_CONCURRENCY = int("__MAX_CONCURRENCY__")
+UPSTREAM_POOL_SIZE = int("__UPSTREAM_POOL_SIZE__")
+COMPRESS_MIN_BYTES = int("__COMPRESS_MIN_BYTES__")
+COMPRESS_LEVEL = int("__COMPRESS_LEVEL__")
+CODECS = ("gzip", "deflate")
+COMPRESSIBLE = ("application/json", "text/")
+UPSTREAM_TIMEOUT = 8
+CACHE_TTL = json.loads(r'''__CACHE_TTL__''')
+STATS_PATH = "/_bridge/stats"
+HOP_BY_HOP = (
+    "transfer-encoding",
+    "connection",
+    "keep-alive",
+    "proxy-authenticate",
+    "proxy-authorization",
+    "te",
+    "trailers",
+    "upgrade",
+)
+
+
+RULES = json.loads(r'''__RULES__''')
+
+
+# --- Rule pipeline: [[automation.glances_bridge.rules]] compiled once at startup
+#
+# pointer is an RFC 6901 JSON pointer to the member being edited; "*" walks every
+# element of an array. op "default" sets the member to `value` when it is absent,
+# op "rename" moves it to `to` (unless `to` already exists).
+
+DECODER = json.JSONDecoder()
+# JSON strings and structural brackets, for locating a token's nesting depth
+STRUCT_RE = re.compile(r'"(?:[^"\\]|\\.)*"|[{}\[\]]')
+
+
+def token_depth(text, pos):
+    # nesting depth of the JSON token starting at pos; -1 if pos is not a token start
+    depth = 0
+    for m in STRUCT_RE.finditer(text):
+        if m.start() >= pos:
+            return depth if m.start() == pos else -1
+        if m.end() > pos:
+            return -1  # pos lies inside a string
+        c = m.group()
+        if c in "{[":
+            depth += 1
+        elif c in "}]":
+            depth -= 1
+    return -1
+
+
+def parse_pointer(pointer):
+    if not isinstance(pointer, str) or not pointer.startswith("/"):
+        raise ValueError(f"E-RULES-001: pointer must start with '/': {pointer!r}")
+    return [t.replace("~1", "/").replace("~0", "~") for t in pointer[1:].split("/")]
+
+
+def compile_walker(tokens):
+    # returns fn(doc) -> list of dict parents addressed by tokens
+    def walk(doc):
+        nodes = [doc]
+        for tok in tokens:
+            nxt = []
+            for n in nodes:
+                if tok == "*":
+                    if isinstance(n, list):
+                        nxt.extend(n)
+                elif isinstance(n, dict) and tok in n:
+                    nxt.append(n[tok])
+                elif isinstance(n, list) and tok.isdigit() and int(tok) < len(n):
+                    nxt.append(n[int(tok)])
+            nodes = nxt
+        return [n for n in nodes if isinstance(n, dict)]
+
+    return walk
+
+
+class Rule:
+    def __init__(self, spec):
+        self.name = str(spec.get("name") or spec.get("pointer"))
+        prefixes = spec.get("path_prefix")
+        if isinstance(prefixes, str):
+            prefixes = [prefixes]
+        self.prefixes = tuple(prefixes or ())
+        if not self.prefixes:
+            raise ValueError(f"E-RULES-001: rule {self.name!r} has no path_prefix")
+        tokens = parse_pointer(spec.get("pointer"))
+        self.leaf = tokens[-1]
+        self.op = spec.get("op", "default")
+        if self.op == "default":
+            if "value" not in spec:
+                raise ValueError(f"E-RULES-001: rule {self.name!r} needs a value")
+            self.value = spec["value"]
+        elif self.op == "rename":
+            if not spec.get("to"):
+                raise ValueError(f"E-RULES-001: rule {self.name!r} needs 'to'")
+            self.to = spec["to"]
+        else:
+            raise ValueError(f"E-RULES-001: rule {self.name!r} unknown op {self.op!r}")
+        # head: top-level member the rule lives under ("" = whole document)
+        parents = tokens[:-1]
+        self.head = parents[0] if parents and parents[0] != "*" else ""
+        self.walk = compile_walker(parents)
+
+    def matches(self, path):
+        return path.startswith(self.prefixes)
+
+    def apply(self, doc):
+        edits = 0
+        for obj in self.walk(doc):
+            if self.op == "default":
+                if self.leaf not in obj:
+                    obj[self.leaf] = self.value
+                    edits += 1
+            elif self.leaf in obj and self.to not in obj:
+                obj[self.to] = obj.pop(self.leaf)
+                edits += 1
+        return edits
+
+
+class Transform:
+    # All rules for one endpoint. Rules rooted under a top-level member only
+    # decode that member's sub-document (spliced back into the original text);
+    # untouched payloads are returned as the original bytes.
+
+    def __init__(self, rules, stats, lock):
+        self.rules = rules
+        self.stats = stats
+        self.lock = lock
+        self.heads = {}
+        for r in rules:
+            self.heads.setdefault(r.head, []).append(r)
+        self.key_res = {
+            h: re.compile(re.escape(json.dumps(h)) + r"\s*:\s*")
+            for h in self.heads
+            if h
+        }
 
-
-def normalize_diskio_all(payload):
-    try:
-        data = json.loads(payload)
-    except Exception:
+    def _run(self, rules, doc):
+        edits = 0
+        for r in rules:
+            t0 = time.perf_counter()
+            n = r.apply(doc)
+            dt = time.perf_counter() - t0
+            with self.lock:
+                s = self.stats[r.name]
+                s["calls"] += 1
+                s["edits"] += n
+                s["ms"] += dt * 1000.0
+            edits += n
+        return edits
+
+    def __call__(self, payload):
+        try:
+            if isinstance(payload, (bytes, bytearray)):
+                text = payload.decode("utf-8")
+            else:
+                text = payload
+        except UnicodeDecodeError:
+            return payload, "pass"
+        if "" in self.heads or text.lstrip()[:1] != "{":
+            return self._full(payload)
+        spans = []
+        for head, key_re in self.key_res.items():
+            keys = list(key_re.finditer(text))
+            if not keys:
+                continue
+            if len(keys) > 1 or token_depth(text, keys[0].start()) != 1:
+                # member name also (or only) used as a nested key: full parse
+                return self._full(payload)
+            start = keys[0].end()
+            try:
+                sub, end = DECODER.raw_decode(text, start)
+            except ValueError:
+                return payload, "pass"
+            if self._run(self.heads[head], {head: sub}):
+                spans.append((start, end, json.dumps(sub)))
+        if not spans:
+            return payload, "pass"
+        for start, end, repl in sorted(spans, reverse=True):
+            text = text[:start] + repl + text[end:]
+        return text.encode("utf-8"), "changed"
+
+    def _full(self, payload):
+        try:
+            data = json.loads(payload)
+        except Exception:
+            return payload, "pass"
+        if self._run(self.rules, data):
+            return json.dumps(data).encode("utf-8"), "changed"
         return payload, "pass"
-    changed = False
-    if isinstance(data, dict) and isinstance(data.get("diskio"), list):
-        for d in data["diskio"]:
-            if isinstance(d, dict) and "time_since_update" not in d:
-                d["time_since_update"] = 1.0
-                changed = True
-    return (json.dumps(data).encode("utf-8"), "changed" if changed else "pass")
 
 
-def normalize_diskio_list(payload):
+class Pipeline:
+    def __init__(self, specs):
+        self.rules = [Rule(s) for s in specs]
+        names = [r.name for r in self.rules]
+        if len(set(names)) != len(names):
+            raise ValueError(f"E-RULES-001: duplicate rule names in {names}")
+        self.lock = threading.Lock()
+        self.stats = {r.name: {"calls": 0, "edits": 0, "ms": 0.0} for r in self.rules}
+        self.transforms = {}
+
+    def transform_for(self, path):
+        # one compiled Transform per distinct rule set, None = no JSON work at all
+        key = tuple(i for i, r in enumerate(self.rules) if r.matches(path))
+        if not key:
+            return None
+        t = self.transforms.get(key)
+        if t is None:
+            t = self.transforms[key] = Transform(
+                [self.rules[i] for i in key], self.stats, self.lock
+            )
+        return t
+
+    def apply(self, path, body):
+        t = self.transform_for(path)
+        if t is None:
+            return body, "pass"
+        return t(body)
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                name: {**s, "ms": round(s["ms"], 3)} for name, s in self.stats.items()
+            }
+
+
+PIPELINE = Pipeline(RULES)
+
+
+# --- Content-Encoding: decode only for transforms, (re)compress per client
+
+
+def header_get(headers, name):
+    for k, v in headers.items():
+        if k.lower() == name.lower():
+            return v
+    return None
+
+
+def header_pop(headers, name):
+    for k in [k for k in headers if k.lower() == name.lower()]:
+        headers.pop(k)
+
+
+def upstream_headers(items):
+    # The proxy negotiates encoding with Glances itself, so a cached body does
+    # not depend on which client happened to trigger the fetch.
+    skip = ("host", "content-length", "accept-encoding")
+    out = {k: v for k, v in items if k.lower() not in skip}
+    out["Accept-Encoding"] = ", ".join(CODECS)
+    return out
+
+
+def accepted_encodings(value):
+    out = set()
+    for part in (value or "").lower().split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if name and q > 0:
+            out.add(name.strip())
+    if "*" in out:
+        out.update(CODECS)
+    return out
+
+
+def decode_body(body, encoding):
+    if encoding == "gzip":
+        return gzip.decompress(body)
     try:
-        data = json.loads(payload)
-    except Exception:
-        return payload, "pass"
-    changed = False
-    if isinstance(data, list):
-        for d in data:
-            if isinstance(d, dict) and "time_since_update" not in d:
-                d["time_since_update"] = 1.0
-                changed = True
-    return (json.dumps(data).encode("utf-8"), "changed" if changed else "pass")
+        return zlib.decompress(body)
+    except zlib.error:
+        # some servers send raw deflate without the zlib wrapper
+        return zlib.decompress(body, -zlib.MAX_WBITS)
+
+
+def encode_body(body, encoding):
+    if encoding == "gzip":
+        return gzip.compress(body, COMPRESS_LEVEL, mtime=0)
+    return zlib.compress(body, COMPRESS_LEVEL)
+
+
+class Compression:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.memo = {}
+        self.stats = {
+            "decoded_for_transform": 0,
+            "decoded_for_client": 0,
+            "passthrough": 0,
+            "passthrough_bytes": 0,
+            "encoded": 0,
+            "compressed_responses": 0,
+            "bytes_in": 0,
+            "bytes_out": 0,
+            "bytes_saved": 0,
+        }
+
+    def count(self, **kw):
+        with self.lock:
+            for k, v in kw.items():
+                self.stats[k] += v
+
+    def _encode(self, body, target):
+        # cached bodies are shared between clients; compress each one once
+        key = (target, body)
+        with self.lock:
+            out = self.memo.get(key)
+        if out is None:
+            out = encode_body(body, target)
+            with self.lock:
+                if len(self.memo) >= 16:
+                    self.memo.pop(next(iter(self.memo)))
+                self.memo[key] = out
+                self.stats["encoded"] += 1
+        return out
+
+    def for_client(self, headers, body, accept):
+        # Returns the body to send; adjusts Content-Encoding/Vary in headers.
+        enc = (header_get(headers, "Content-Encoding") or "identity").lower()
+        if enc != "identity":
+            try:
+                if enc in accept or enc not in CODECS:
+                    raise ValueError(enc)
+                body = decode_body(body, enc)
+            except (ValueError, OSError, EOFError, zlib.error):
+                self.count(passthrough=1, passthrough_bytes=len(body))
+                headers["Vary"] = "Accept-Encoding"
+                return body
+            header_pop(headers, "Content-Encoding")
+            self.count(decoded_for_client=1)
+        ctype = (header_get(headers, "Content-Type") or "").lower()
+        if len(body) < COMPRESS_MIN_BYTES or not ctype.startswith(COMPRESSIBLE):
+            return body
+        headers["Vary"] = "Accept-Encoding"
+        target = next((c for c in CODECS if c in accept), None)
+        if target is None:
+            return body
+        out = self._encode(body, target)
+        if len(out) >= len(body):
+            return body
+        headers["Content-Encoding"] = target
+        self.count(
+            compressed_responses=1,
+            bytes_in=len(body),
+            bytes_out=len(out),
+            bytes_saved=len(body) - len(out),
+        )
+        return out
+
+    def snapshot(self):
+        with self.lock:
+            return dict(self.stats)
+
+
+COMPRESSION = Compression()
+
+
+def normalize_for_path(path, headers, body):
+    transform = PIPELINE.transform_for(path)
+    if transform is None:
+        return body, "pass"
+    enc = (header_get(headers, "Content-Encoding") or "identity").lower()
+    raw = body
+    if enc != "identity":
+        if enc not in CODECS:
+            return raw, "pass"
+        try:
+            body = decode_body(body, enc)
+        except (OSError, EOFError, zlib.error):
+            return raw, "pass"
+        COMPRESSION.count(decoded_for_transform=1)
+    headers["Content-Type"] = "application/json"
+    body, mode = transform(body)
+    if mode == "pass":
+        # untouched: keep the upstream bytes (and their encoding) as-is
+        return raw, mode
+    header_pop(headers, "Content-Encoding")
+    return body, mode
+
+
+class MicroCache:
+    # Request-coalescing TTL cache for normalized GET responses. Concurrent
+    # identical requests share one upstream fetch + normalization pass; 200s
+    # are then served from memory until the per-endpoint TTL expires.
+
+    def __init__(self, ttls):
+        self.ttls = sorted(ttls.items(), key=lambda kv: len(kv[0]), reverse=True)
+        self.entries = {}
+        self.inflight = {}
+        self.lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0, "uncached": 0}
+
+    def ttl_for(self, path):
+        for prefix, ttl in self.ttls:
+            if path.startswith(prefix):
+                return ttl
+        return 0.0
+
+    def _lookup(self, path, now):
+        # caller holds self.lock
+        entry = self.entries.get(path)
+        if entry and entry[0] > now:
+            self.stats["hits"] += 1
+            return entry[1]
+        return None
+
+    def _store(self, path, ttl, resp, now):
+        # caller holds self.lock
+        for k in [k for k, e in self.entries.items() if e[0] <= now]:
+            del self.entries[k]
+        if resp[0] == 200:
+            self.entries[path] = (now + ttl, resp)
+
+    def get(self, path, fetch):
+        ttl = self.ttl_for(path)
+        if ttl <= 0:
+            with self.lock:
+                self.stats["uncached"] += 1
+            return copy_response(fetch())
+        with self.lock:
+            cached = self._lookup(path, time.monotonic())
+            if cached:
+                return copy_response(cached)
+            slot = self.inflight.get(path)
+            leader = slot is None
+            if leader:
+                slot = self.inflight[path] = [threading.Event(), None]
+                self.stats["misses"] += 1
+            else:
+                self.stats["coalesced"] += 1
+        if not leader:
+            slot[0].wait(UPSTREAM_TIMEOUT * 2)
+            if slot[1] is not None:
+                return copy_response(slot[1])
+            return copy_response(fetch())
+        try:
+            slot[1] = resp = fetch()
+            with self.lock:
+                self._store(path, ttl, resp, time.monotonic())
+        finally:
+            with self.lock:
+                self.inflight.pop(path, None)
+            slot[0].set()
+        return copy_response(resp)
+
+    async def aget(self, path, fetch):
+        # asyncio variant; everything runs on the loop thread, so the futures
+        # in self.inflight stand in for the threading.Event slots above.
+        ttl = self.ttl_for(path)
+        if ttl <= 0:
+            self.stats["uncached"] += 1
+            return copy_response(await fetch())
+        cached = self._lookup(path, time.monotonic())
+        if cached:
+            return copy_response(cached)
+        fut = self.inflight.get(path)
+        if fut is not None:
+            self.stats["coalesced"] += 1
+            return copy_response(await asyncio.shield(fut))
+        self.stats["misses"] += 1
+        fut = self.inflight[path] = asyncio.get_running_loop().create_future()
+        try:
+            resp = await fetch()
+            self._store(path, ttl, resp, time.monotonic())
+            fut.set_result(resp)
+        except BaseException as e:
+            fut.set_exception(e)
+            fut.exception()  # mark retrieved when nobody is waiting
+            raise
+        finally:
+            self.inflight.pop(path, None)
+        return copy_response(resp)
+
+    def snapshot(self):
+        return {
+            **self.stats,
+            "entries": len(self.entries),
+            "ttl": dict(self.ttls),
+        }
+
+
+def copy_response(resp):
+    # handlers mutate headers before sending; never hand out the cached dict
+    status, headers, body = resp
+    return status, dict(headers), body
+
+
+CACHE = MicroCache(CACHE_TTL)
+
+
+def stats_response():
+    body = json.dumps(
+        {
+            "proxy_mode": PROXY_MODE,
+            "cache": CACHE.snapshot(),
+            "rules": PIPELINE.snapshot(),
+            "compression": COMPRESSION.snapshot(),
+        }
+    ).encode()
+    return 200, {"Content-Type": "application/json"}, body
 
 
 class H(BaseHTTPRequestHandler):
@@ -236,9 +784,9 @@ class H(BaseHTTPRequestHandler):
             length = int(self.headers.get("Content-Length", "0"))
             body = self.rfile.read(length) if length > 0 else None
         req = Request(url, data=body, method=self.command)
-        for k, v in self.headers.items():
-            if k.lower() not in ("host", "content-length"):
-                req.add_header(k, v)
+        fwd = upstream_headers(self.headers.items())
+        for k, v in fwd.items():
+            req.add_header(k, v)
         try:
             with urlopen(req, timeout=8) as r:
                 status = r.status
@@ -250,9 +798,8 @@ class H(BaseHTTPRequestHandler):
                 alt_path = path.replace("/api/4/", "/api/3/", 1)
                 alt_url = f"{UPSTREAM}{alt_path}"
                 alt_req = Request(alt_url, data=body, method=self.command)
-                for k, v in self.headers.items():
-                    if k.lower() not in ("host", "content-length"):
-                        alt_req.add_header(k, v)
+                for k, v in fwd.items():
+                    alt_req.add_header(k, v)
                 try:
                     with urlopen(alt_req, timeout=8) as r:
                         status = r.status
@@ -274,30 +821,23 @@ class H(BaseHTTPRequestHandler):
             headers = {"Content-Type": "application/json"}
         return status, headers, resp_body
 
-    def do_GET(self):
+    def _fetch_normalized(self):
         status, headers, body = self._proxy()
-        path = self.path
-        mode = "pass"
-        if path.startswith("/api/4/all") or path.startswith("/api/3/all"):
-            body, mode = normalize_diskio_all(body)
-            headers["Content-Type"] = "application/json"
-        elif path.startswith("/api/4/diskio") or path.startswith("/api/3/diskio"):
-            body, mode = normalize_diskio_list(body)
-            headers["Content-Type"] = "application/json"
+        body, _mode = normalize_for_path(self.path, headers, body)
+        return status, headers, body
+
+    def do_GET(self):
+        if self.path == STATS_PATH:
+            status, headers, body = stats_response()
+        else:
+            status, headers, body = CACHE.get(self.path, self._fetch_normalized)
+        accept = accepted_encodings(self.headers.get("Accept-Encoding"))
+        body = COMPRESSION.for_client(headers, body, accept)
         # write response
         self.send_response(status)
         headers["Content-Length"] = str(len(body))
         for hk in list(headers.keys()):
-            if hk.lower() in (
-                "transfer-encoding",
-                "connection",
-                "keep-alive",
-                "proxy-authenticate",
-                "proxy-authorization",
-                "te",
-                "trailers",
-                "upgrade",
-            ):
+            if hk.lower() in HOP_BY_HOP:
                 headers.pop(hk, None)
         for k, v in headers.items():
             self.send_header(k, v)
@@ -308,17 +848,238 @@ class H(BaseHTTPRequestHandler):
         return
 
 
+# --- asyncio mode: keep-alive upstream pool, pipelined HTTP/1.1 clients
+
+
+class UpstreamPool:
+    # Idle keep-alive connections to Glances; at most UPSTREAM_POOL_SIZE are kept.
+
+    def __init__(self, base_url, size):
+        u = urlsplit(base_url)
+        self.host = u.hostname or "127.0.0.1"
+        self.port = u.port or 80
+        self.prefix = u.path.rstrip("/")
+        self.size = size
+        self.idle = []
+
+    async def request(self, method, path, headers, body=None):
+        conn = self.idle.pop() if self.idle else None
+        while True:
+            reused = conn is not None
+            if conn is None:
+                conn = await asyncio.wait_for(
+                    asyncio.open_connection(self.host, self.port), UPSTREAM_TIMEOUT
+                )
+            try:
+                status, resp_headers, resp_body, keep = await asyncio.wait_for(
+                    self._roundtrip(conn, method, path, headers, body), UPSTREAM_TIMEOUT
+                )
+            except (ConnectionError, asyncio.IncompleteReadError):
+                conn[1].close()
+                conn = None
+                if reused:
+                    # stale pooled socket closed by upstream; retry on a fresh one
+                    continue
+                raise
+            except BaseException:
+                conn[1].close()
+                raise
+            if keep and len(self.idle) < self.size:
+                self.idle.append(conn)
+            else:
+                conn[1].close()
+            return status, resp_headers, resp_body
+
+    async def _roundtrip(self, conn, method, path, headers, body):
+        reader, writer = conn
+        lines = [
+            f"{method} {self.prefix}{path} HTTP/1.1",
+            f"Host: {self.host}:{self.port}",
+        ]
+        for k, v in headers.items():
+            if k.lower() not in ("host", "content-length", *HOP_BY_HOP):
+                lines.append(f"{k}: {v}")
+        if body:
+            lines.append(f"Content-Length: {len(body)}")
+        lines.append("Connection: keep-alive")
+        head = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+        writer.write(head + (body or b""))
+        await writer.drain()
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("upstream closed connection")
+        status = int(status_line.split()[1])
+        resp_headers = await read_headers(reader)
+        lower = {k.lower(): v for k, v in resp_headers.items()}
+        keep = lower.get("connection", "").lower() != "close"
+        if method == "HEAD" or status in (204, 304) or 100 <= status < 200:
+            resp_body = b""
+        elif "chunked" in lower.get("transfer-encoding", "").lower():
+            resp_body = await read_chunked(reader)
+        elif "content-length" in lower:
+            resp_body = await reader.readexactly(int(lower["content-length"]))
+        else:
+            resp_body = await reader.read()
+            keep = False
+        return status, resp_headers, resp_body, keep
+
+
+async def read_headers(reader):
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            return headers
+        k, _, v = line.decode("latin-1").partition(":")
+        headers[k.strip()] = v.strip()
+
+
+async def read_chunked(reader):
+    chunks = []
+    while True:
+        size = int((await reader.readline()).split(b";")[0].strip(), 16)
+        if size == 0:
+            await read_headers(reader)  # trailers
+            return b"".join(chunks)
+        chunks.append(await reader.readexactly(size))
+        await reader.readexactly(2)
+
+
+def error_response(status, exc):
+    body = json.dumps({"error": "upstream_unreachable", "detail": str(exc)}).encode()
+    return status, {"Content-Type": "application/json"}, body
+
+
+async def proxy_async(pool, method, path, headers, body):
+    try:
+        status, resp_headers, resp_body = await pool.request(
+            method, path, headers, body
+        )
+        # Fallback: if upstream doesn't support v4, retry against v3
+        if status == 404 and path.startswith("/api/4/"):
+            alt_path = path.replace("/api/4/", "/api/3/", 1)
+            status, resp_headers, resp_body = await pool.request(
+                method, alt_path, headers, body
+            )
+    except asyncio.TimeoutError:
+        return error_response(504, "upstream_timeout")
+    except (OSError, ValueError, IndexError, asyncio.IncompleteReadError) as e:
+        return error_response(502, e)
+    return status, resp_headers, resp_body
+
+
+async def write_response(writer, status, headers, body, keep_alive):
+    reason = BaseHTTPRequestHandler.responses.get(status, ("",))[0]
+    out = {k: v for k, v in headers.items() if k.lower() not in HOP_BY_HOP}
+    out = {k: v for k, v in out.items() if k.lower() != "content-length"}
+    out["Content-Length"] = str(len(body))
+    out["Connection"] = "keep-alive" if keep_alive else "close"
+    head = [f"HTTP/1.1 {status} {reason}"] + [f"{k}: {v}" for k, v in out.items()]
+    writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+    await writer.drain()
+
+
+async def handle_client(pool, sem, reader, writer):
+    # Requests on one connection are served strictly in order, so pipelined
+    # clients get their responses back in the order they were sent.
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            try:
+                method, path, version = request_line.decode("latin-1").split()
+            except ValueError:
+                await write_response(writer, 400, {}, b"", False)
+                break
+            headers = await read_headers(reader)
+            lower = {k.lower(): v.lower() for k, v in headers.items()}
+            length = int(lower.get("content-length", "0") or 0)
+            body = await reader.readexactly(length) if length > 0 else None
+            if version == "HTTP/1.0":
+                keep_alive = lower.get("connection") == "keep-alive"
+            else:
+                keep_alive = lower.get("connection") != "close"
+            if method != "GET":
+                await write_response(writer, 501, {}, b"", keep_alive)
+            elif path == STATS_PATH:
+                await write_response(writer, *stats_response(), keep_alive)
+            else:
+
+                async def fetch(path=path, headers=headers, body=body):
+                    async with sem:
+                        resp = await proxy_async(
+                            pool, method, path, upstream_headers(headers.items()), body
+                        )
+                    resp_body, _mode = normalize_for_path(path, resp[1], resp[2])
+                    return resp[0], resp[1], resp_body
+
+                status, resp_headers, resp_body = await CACHE.aget(path, fetch)
+                accept = accepted_encodings(lower.get("accept-encoding"))
+                resp_body = COMPRESSION.for_client(resp_headers, resp_body, accept)
+                await write_response(
+                    writer, status, resp_headers, resp_body, keep_alive
+                )
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve_async(host, port):
+    pool = UpstreamPool(UPSTREAM, UPSTREAM_POOL_SIZE)
+    sem = asyncio.Semaphore(MAX_CONCURRENCY)
+    srv = await asyncio.start_server(
+        lambda r, w: handle_client(pool, sem, r, w), host, port
+    )
+    async with srv:
+        await srv.serve_forever()
+
+
 if __name__ == "__main__":
     host = "__LISTEN_HOST__"
     port = int(sys.argv[1]) if len(sys.argv) > 1 else 61209
-    srv = ThreadingHTTPServer((host, port), H)
     try:
-        srv.serve_forever()
+        if PROXY_MODE == "asyncio":
+            asyncio.run(serve_async(host, port))
+        else:
+            srv = ThreadingHTTPServer((host, port), H)
+            srv.serve_forever()
     except KeyboardInterrupt:
         pass
 """
 
 
+def render_normalizer(cfg: dict) -> str:
+    """Fill NORMALIZER_SCRIPT placeholders from [automation.glances_bridge.runtime]."""
+    rt = {**DEFAULT_CFG["runtime"], **cfg.get("runtime", {})}
+    mode = str(rt.get("proxy_mode", "threaded")).lower()
+    if mode not in ("threaded", "asyncio"):
+        raise ValueError(f"E-CFG-001: unsupported runtime.proxy_mode '{mode}'")
+    cache_ttl = {str(k): float(v) for k, v in (rt.get("cache_ttl") or {}).items()}
+    return (
+        NORMALIZER_SCRIPT.replace("__UPSTREAM__", str(rt.get("upstream_url")))
+        .replace("__LISTEN_HOST__", str(rt.get("listen_host", "127.0.0.1")))
+        .replace("__PROXY_MODE__", mode)
+        .replace("__MAX_CONCURRENCY__", str(int(rt.get("max_concurrency"))))
+        .replace("__UPSTREAM_POOL_SIZE__", str(int(rt.get("upstream_pool_size"))))
+        .replace("__COMPRESS_MIN_BYTES__", str(int(rt.get("compress_min_bytes"))))
+        .replace("__COMPRESS_LEVEL__", str(int(rt.get("compress_level"))))
+        .replace("__CACHE_TTL__", json.dumps(cache_ttl, sort_keys=True))
+        .replace("__RULES__", json.dumps(cfg.get("rules", DEFAULT_CFG["rules"])))
+        .lstrip("\n")
+    )
+
+
+def load_normalizer(cfg: dict) -> dict:
+    """Exec the rendered normalizer in-process and return its namespace (no server)."""
+    ns: dict = {"__name__": "glances_normalize"}
+    exec(compile(render_normalizer(cfg), "glances-normalize.py", "exec"), ns)
+    return ns
+
+
 # --- Core operations
 
 
@@ -424,6 +1185,19 @@ def start_normalizer(target_path: Path, port: int, log_dir: Path) -> dict:
     return out
 
 
+def normalizer_stats(port: int, timeout: float = 2.0) -> dict:
+    """Read the running normalizer's /_bridge/stats counters (best-effort)."""
+    import urllib.request
+
+    try:
+        with urllib.request.urlopen(
+            f"http://127.0.0.1:{int(port)}/_bridge/stats", timeout=timeout
+        ) as r:
+            return json.loads(r.read())
+    except Exception as e:
+        return {"error": str(e)}
+
+
 def configure_tailscale(cfg: dict) -> dict:
     host = cfg.get("runtime", {}).get("tailscale_host")
     port = cfg.get("runtime", {}).get("tailscale_port")
@@ -448,26 +1222,45 @@ def dry_run(cfg: dict, report_file: Path, index_file: Path) -> Report:
     repo_root = Path(cfg.get("repo_root", "/config"))
     target = repo_root / "bin" / "glances-normalize.py"
     details = {"probes": {}, "install": {"would_install_to": str(target)}}
+    rt = {**DEFAULT_CFG["runtime"], **cfg.get("runtime", {})}
+    details["install"]["proxy_mode"] = rt.get("proxy_mode")
     upstream = cfg.get("runtime", {}).get("upstream_url")
     p = probe_upstream(upstream)
     details["probes"]["upstream"] = p
-    # simulate normalization by running the normalizer code in-memory on sample if available
-    sample = p.get("samples", {}).get("diskio")
-    if sample is not None:
-        # check missing fields
-        missing = sum(1 for x in sample if isinstance(x, dict) and "time_since_update" not in x)
-        details["probes"]["upstream_missing_time_since_update"] = missing
-        # simulate normalized
-        normalized = []
-        for d in sample:
-            if isinstance(d, dict) and "time_since_update" not in d:
-                d2 = dict(d)
-                d2["time_since_update"] = 1.0
-                normalized.append(d2)
-            else:
-                normalized.append(d)
-        details["probes"]["normalized_preview_count"] = len(normalized)
-    success = bool(p.get("ok"))
+    # evaluate the compiled rule pipeline (exactly as installed) on the samples
+    try:
+        pipeline = load_normalizer(cfg)["PIPELINE"]
+    except ValueError as e:
+        pipeline = None
+        details["probes"]["rules_error"] = str(e)
+    if pipeline is not None:
+        endpoints = {}
+        for name, sample in p.get("samples", {}).items():
+            path = f"/api/{p.get('api_version')}/{name}"
+            before = pipeline.snapshot()
+            body, mode = pipeline.apply(path, json.dumps(sample).encode("utf-8"))
+            after = pipeline.snapshot()
+            normalized = json.loads(body)
+            endpoints[path] = {
+                "mode": mode,
+                "edits": sum(after[n]["edits"] - before[n]["edits"] for n in after),
+                "matched": pipeline.transform_for(path) is not None,
+                "preview_count": len(normalized)
+                if isinstance(normalized, list)
+                else None,
+            }
+            if name == "diskio":
+                details["probes"]["upstream_missing_time_since_update"] = endpoints[
+                    path
+                ]["edits"]
+                details["probes"]["normalized_preview_count"] = endpoints[path][
+                    "preview_count"
+                ]
+        details["probes"]["pipeline"] = {
+            "endpoints": endpoints,
+            "rules": pipeline.snapshot(),
+        }
+    success = bool(p.get("ok")) and pipeline is not None
 
     rep = Report(
         started_at=started,
@@ -507,14 +1300,12 @@ def apply(cfg: dict, report_file: Path, index_file: Path, lock_fp) -> Report:
     bin_dir.mkdir(parents=True, exist_ok=True)
     target = bin_dir / "glances-normalize.py"
     # prepare content and idempotency
-    rt = cfg.get("runtime", {})
-    upstream = rt.get("upstream_url")
-    listen_host = rt.get("listen_host", "127.0.0.1")
-    content = (
-        NORMALIZER_SCRIPT.replace("__UPSTREAM__", str(upstream))
-        .replace("__LISTEN_HOST__", str(listen_host))
-        .lstrip("\n")
-    )
+    try:
+        # compile the rule pipeline before installing anything
+        load_normalizer(cfg)
+    except ValueError as e:
+        raise SystemExit(str(e)) from e
+    content = render_normalizer(cfg)
     new_sha = sha256_bytes(content.encode())
     prev_ledger_sha = last_applied_sha(index_file, str(target))
     existing_sha = None
@@ -523,6 +1314,11 @@ def apply(cfg: dict, report_file: Path, index_file: Path, lock_fp) -> Report:
             existing_sha = sha256_bytes(target.read_bytes())
     idempotent = new_sha in (prev_ledger_sha, existing_sha)
 
+    # snapshot the running normalizer's counters before it is replaced
+    stats = normalizer_stats(cfg.get("runtime", {}).get("normalizer_port"))
+    details["steps"]["normalizer_stats"] = stats
+    details["compression"] = stats.get("compression", {})
+
     # install script (skip if idempotent)
     if not idempotent:
         inst = install_normalizer_script(cfg, target, content)
@@ -572,9 +1368,137 @@ def apply(cfg: dict, report_file: Path, index_file: Path, lock_fp) -> Report:
     return rep
 
 
+# --- Benchmark: streaming vs. full round-trip diskio normalization
+
+
+def legacy_normalize_diskio_all(payload: bytes) -> tuple[bytes, str]:
+    """Pre-streaming normalizer: json.loads + json.dumps of the whole /all payload."""
+    try:
+        data = json.loads(payload)
+    except Exception:
+        return payload, "pass"
+    changed = False
+    if isinstance(data, dict) and isinstance(data.get("diskio"), list):
+        for d in data["diskio"]:
+            if isinstance(d, dict) and "time_since_update" not in d:
+                d["time_since_update"] = 1.0
+                changed = True
+    return (json.dumps(data).encode("utf-8"), "changed" if changed else "pass")
+
+
+def synthetic_all_payload(
+    disks: int = 32, processes: int = 600, missing: bool = True
+) -> bytes:
+    """Build a NAS-sized /api/4/all body (many disks, long processlist)."""
+    diskio = []
+    for i in range(disks):
+        d = {"disk_name": f"sd{i}", "read_bytes": i * 4096, "write_bytes": i * 8192}
+        if not missing:
+            d["time_since_update"] = 1.0
+        diskio.append(d)
+    procs = [
+        {
+            "pid": i,
+            "name": f"proc{i}",
+            "cmdline": ["/usr/bin/proc", f"--id={i}"],
+            "cpu_percent": 0.1 * (i % 10),
+            "memory_info": {"rss": i * 1024, "vms": i * 2048},
+        }
+        for i in range(processes)
+    ]
+    data = {"cpu": {"total": 7.5}, "diskio": diskio, "processlist": procs,
+            "containers": [{"name": f"c{i}", "status": "running"} for i in range(40)]}
+    return json.dumps(data).encode("utf-8")
+
+
+def _fetch_all_sample(upstream: str, timeout: int = 5) -> bytes | None:
+    import urllib.request
+
+    for ver in (4, 3):
+        with (
+            contextlib.suppress(Exception),
+            urllib.request.urlopen(f"{upstream}/api/{ver}/all", timeout=timeout) as r,
+        ):
+            return r.read()
+    return None
+
+
+def _time_per_op(fn, payload: bytes, iterations: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(iterations):
+        fn(payload)
+    return (time.perf_counter() - t0) / iterations * 1000.0
+
+
+def bench(
+    cfg: dict, report_file: Path, payload_files: list[str], iterations: int
+) -> Report:
+    started = now_z()
+    ns = load_normalizer(cfg)
+    samples: dict[str, bytes] = {}
+    for f in payload_files:
+        samples[f] = Path(f).read_bytes()
+    if not samples:
+        live = _fetch_all_sample(cfg.get("runtime", {}).get("upstream_url"))
+        if live:
+            samples["upstream:/all"] = live
+        samples["synthetic:missing"] = synthetic_all_payload(missing=True)
+        samples["synthetic:complete"] = synthetic_all_payload(missing=False)
+        # "diskio" only as a nested key: must stay untouched, like the legacy code
+        samples["synthetic:nested-diskio"] = json.dumps(
+            {
+                "fs": [{"mnt_point": "/", "diskio": {"read_bytes": 1}}],
+                "cpu": {"total": 1.0},
+            }
+        ).encode("utf-8")
+    results = {}
+    for name, payload in samples.items():
+        pipeline = ns["PIPELINE"]
+
+        def streaming(body, pipeline=pipeline):
+            return pipeline.apply("/api/4/all", body)
+
+        new_body, new_mode = streaming(payload)
+        old_body, old_mode = legacy_normalize_diskio_all(payload)
+        try:
+            equivalent = json.loads(new_body) == json.loads(old_body)
+        except Exception:
+            equivalent = new_body == old_body
+        legacy_ms = _time_per_op(legacy_normalize_diskio_all, payload, iterations)
+        stream_ms = _time_per_op(streaming, payload, iterations)
+        results[name] = {
+            "bytes": len(payload),
+            "mode": new_mode,
+            "equivalent": equivalent and new_mode == old_mode,
+            "legacy_ms": round(legacy_ms, 4),
+            "streaming_ms": round(stream_ms, 4),
+            "speedup": round(legacy_ms / stream_ms, 2) if stream_ms else None,
+        }
+    rep = Report(
+        started_at=started,
+        finished_at=now_z(),
+        mode="bench",
+        success=all(r["equivalent"] for r in results.values()),
+        details={"iterations": iterations, "payloads": results},
+    )
+    report_file.write_text(json.dumps(rep.to_dict(), indent=2), encoding="utf-8")
+    return rep
+
+
 def main():
     parser = argparse.ArgumentParser(prog="glances_bridge.py")
-    parser.add_argument("mode", choices=["dry-run", "apply"], help="Operation mode")
+    parser.add_argument(
+        "mode", choices=["dry-run", "apply", "bench"], help="Operation mode"
+    )
+    parser.add_argument(
+        "--payload",
+        action="append",
+        default=[],
+        help="bench: recorded /api/4/all body to replay (repeatable)",
+    )
+    parser.add_argument(
+        "--iterations", type=int, default=200, help="bench: runs per payload"
+    )
     args = parser.parse_args()
     cfg = load_toml_config()
     report_file, index_file, lock_file = build_reports_dirs(cfg, args.mode)
@@ -587,6 +1511,10 @@ def main():
             rep = dry_run(cfg, report_file, index_file)
             print(json.dumps(rep.to_dict(), indent=2))
             sys.exit(0 if rep.success else 2)
+        elif args.mode == "bench":
+            rep = bench(cfg, report_file, args.payload, args.iterations)
+            print(json.dumps(rep.to_dict(), indent=2))
+            sys.exit(0 if rep.success else 2)
         else:
             rep = apply(cfg, report_file, index_file, lock_fp)
             print(json.dumps(rep.to_dict(), indent=2))
@@ -607,6 +1535,11 @@ def _prune_retention(cfg: dict, report_dir: Path, index_file: Path) -> None:
         for f in report_dir.glob("*.json"):
             if f.stat().st_mtime < cutoff:
                 f.unlink()
+    if keep_tail is not None:
+        # streaming reverse-block tail-keep with an atomic swap
+        with contextlib.suppress(Exception):
+            keep_tail(index_file, keep_lines)
+        return
     with contextlib.suppress(Exception):
         if index_file.exists():
             lines = index_file.read_text(encoding="utf-8").splitlines()
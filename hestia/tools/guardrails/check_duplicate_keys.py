@@ -1,4 +1,6 @@
 #!/usr/bin/env python3
+import argparse
+import importlib.util
 import sys
 from pathlib import Path
 
@@ -9,6 +11,14 @@ except Exception:  # pragma: no cover
     YAML = None
     DuplicateKeyError = Exception
 
+# Shared LibYAML/process-pool loader for --jobs (hestia/tools/utils/reportkit)
+if importlib.util.find_spec("reportkit") is None:
+    sys.path.append(str(Path(__file__).resolve().parents[1] / "utils"))
+try:
+    from reportkit import yaml_bulk
+except Exception:  # pragma: no cover
+    yaml_bulk = None
+
 def scan_file(p: Path) -> bool:
     if YAML is None:
         # Fallback: naive duplicate key detector using simple parse of lines
@@ -38,13 +48,37 @@ def scan_file(p: Path) -> bool:
         # Ignore other YAML errors here; other checks will catch syntax.
         return True
 
+def scan_files_bulk(files, jobs: int) -> bool:
+    """Duplicate-key scan via the LibYAML bulk loader; HA tags (!include...) pass."""
+    ok = True
+    for res in yaml_bulk.load_many(files, jobs, custom_tags=True, unique_keys=True):
+        # Other YAML errors are ignored here as in scan_file; other checks catch syntax.
+        if res.error_kind == 'duplicate_key':
+            print(f"Duplicate key in {res.path}: {res.error}")
+            ok = False
+    return ok
+
 def main() -> int:
+    ap = argparse.ArgumentParser(
+        description="Fail on duplicate YAML mapping keys "
+        "(file list on stdin, default: git ls-files)"
+    )
+    ap.add_argument(
+        "--jobs",
+        type=int,
+        default=0,
+        help="parse with the LibYAML bulk loader over N processes "
+        "(default 0: ruamel, in-process)",
+    )
+    args = ap.parse_args()
     files = [Path(f) for f in sys.stdin.read().splitlines() if f.endswith('.yaml')]
     if not files:
         # default to git tracked yaml
         import subprocess
         out = subprocess.check_output(['git', 'ls-files', '*.yaml']).decode().splitlines()
         files = [Path(x) for x in out]
+    if args.jobs and yaml_bulk is not None and yaml_bulk.yaml is not None:
+        return 0 if scan_files_bulk(files, args.jobs) else 1
     ok = True
     for p in files:
         if not scan_file(p):
@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 import argparse
+import importlib.util
 import json
 import os
 import pathlib
@@ -11,6 +12,14 @@ from datetime import UTC, datetime
 
 import yaml  # PyYAML
 
+# Shared LibYAML loader for --jobs (hestia/tools/utils/reportkit)
+if importlib.util.find_spec("reportkit") is None:
+    sys.path.append(str(pathlib.Path(__file__).resolve().parents[1] / "utils"))
+try:
+    from reportkit import yaml_bulk
+except Exception:
+    yaml_bulk = None
+
 TOML = "/config/hestia/config/system/hestia.toml"
 
 def nowz():
@@ -66,9 +75,19 @@ OPTIONAL_GLOBS = [
     "/config/.storage/repairs.issue_registry",
 ]
 
-def find_patterns(path):
+def load_yaml(path, jobs=0):
+    """safe_load ``path``; with --jobs, through the shared LibYAML loader."""
+    if yaml_bulk is not None and jobs > 0:
+        result = yaml_bulk.load_file(path)
+        if not result.ok:
+            raise ValueError(result.error)
+        return result.data
+    with open(path, encoding="utf-8") as f:
+        return yaml.safe_load(f)
+
+def find_patterns(path, jobs=0):
     try:
-        data = yaml.safe_load(open(path, encoding="utf-8")) or {}
+        data = load_yaml(path, jobs) or {}
     except Exception:
         return []
     pats = []
@@ -135,7 +154,7 @@ def write_meta(meta_dir, payload):
     atomic_write(path, json.dumps(payload, indent=2))
     return path
 
-def run(mode, selection_path, active_file, report_dir, meta_dir):
+def run(mode, selection_path, active_file, report_dir, meta_dir, jobs=0):
     ensure_dirs(report_dir, meta_dir)
     missing = [p for p in REQUIRED if not os.path.exists(p)]
     if missing:
@@ -145,7 +164,7 @@ def run(mode, selection_path, active_file, report_dir, meta_dir):
         print(path); sys.exit(2)
 
     log_text = tail_lines("/config/home-assistant.log", 1000)
-    patterns = find_patterns("/config/hestia/library/error_patterns.yml")
+    patterns = find_patterns("/config/hestia/library/error_patterns.yml", jobs)
     classification, hits = classify(log_text, patterns)
     key_hint = None
     if hits:
@@ -247,12 +266,26 @@ def main():
     ap.add_argument("--active-file", default=None)
     ap.add_argument("--report-dir", default=None)
     ap.add_argument("--meta-dir", default=None)
+    ap.add_argument(
+        "--jobs",
+        type=int,
+        default=0,
+        help="Load the YAML this tool reads (error patterns) with the shared "
+        "LibYAML loader; reports are unchanged (default 0: off)",
+    )
     args = ap.parse_args()
 
     cfg = read_toml()
     report_dir = args.report_dir or cfg.get("report_dir", "/config/hestia/reports")
     meta_dir   = args.meta_dir   or cfg.get("meta_dir",   "/config/hestia/library/context/meta")
-    run(args.mode, args.selection_path, args.active_file, report_dir, meta_dir)
+    run(
+        args.mode,
+        args.selection_path,
+        args.active_file,
+        report_dir,
+        meta_dir,
+        args.jobs,
+    )
 
 if __name__ == "__main__":
     main()
@@ -1,9 +1,25 @@
-import os, json, yaml, argparse
-from typing import List, Dict, Any
+import argparse
+import importlib.util
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any
+
+import yaml
 from lineage_guardian.models import EntityNode
 from lineage_guardian.utils import extract_entities_from_state_block
 
-def list_yaml_files(root: str) -> List[str]:
+# Shared LibYAML/process-pool loader (hestia/tools/utils/reportkit); absent when
+# installed standalone
+if importlib.util.find_spec("reportkit") is None:
+    sys.path.append(str(Path(__file__).resolve().parents[2] / "utils"))
+try:
+    from reportkit import yaml_bulk
+except Exception:
+    yaml_bulk = None
+
+def list_yaml_files(root: str) -> list[str]:
     files=[]
     for d,_,fs in os.walk(root):
         for fn in fs:
@@ -11,7 +27,7 @@ def list_yaml_files(root: str) -> List[str]:
                 files.append(os.path.join(d,fn))
     return sorted(files)
 
-def derive_entity_id(domain: str, ent: Dict[str, Any]) -> str:
+def derive_entity_id(domain: str, ent: dict[str, Any]) -> str:
     uid = ent.get("unique_id")
     if isinstance(uid, str) and uid.strip():
         slug = uid.strip()
@@ -20,12 +36,25 @@ def derive_entity_id(domain: str, ent: Dict[str, Any]) -> str:
         slug = str(name).lower().replace(" ","_").replace("-","_")
     return f"{domain}.{slug}"
 
-def scan_file(path: str) -> List[EntityNode]:
+def scan_file(path: str) -> list[EntityNode]:
     try:
         raw = open(path, "r", encoding="utf-8").read()
         data = yaml.safe_load(raw)
     except Exception:
         return []
+    return scan_document(path, data)
+
+def scan_files(files: list[str], jobs: int = 1) -> list[EntityNode]:
+    """scan_file over many files; jobs > 1 parses via the bulk loader, same order."""
+    if jobs <= 1 or yaml_bulk is None or yaml_bulk.yaml is None:
+        return [n for f in files for n in scan_file(f)]
+    nodes = []
+    for res in yaml_bulk.load_many(files, jobs):
+        if res.ok:
+            nodes += scan_document(res.path, res.data)
+    return nodes
+
+def scan_document(path: str, data: Any) -> list[EntityNode]:
     if not isinstance(data, dict):
         return []
     nodes=[]
@@ -70,12 +99,16 @@ def main():
     ap.add_argument("--template-dir", default="/config/domain/templates/")
     ap.add_argument("--output", required=True)
     ap.add_argument("--verbose", action="store_true")
+    ap.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="parse files over N processes with the LibYAML bulk loader",
+    )
     args = ap.parse_args()
     
     files = list_yaml_files(args.template_dir)
-    all_nodes=[]
-    for f in files:
-        all_nodes += scan_file(f)
+    all_nodes = scan_files(files, args.jobs)
     graph = {"nodes":[n.__dict__ for n in all_nodes], "meta":{"count":len(all_nodes)}}
     os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
     open(args.output,"w",encoding="utf-8").write(json.dumps(graph, indent=2))
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Sweeper classifier benchmark
+
+Times the compiled FileClassifier against WorkspaceIndexer's per-rule methods
+(_categorize_file, _check_naming_compliance, _determine_action, ...) over
+synthetic backup/config filenames and checks both classify every path alike.
+Paths include near misses such as /config/hestia/reports_old/... that share a
+retention location's prefix but not its path components.
+
+Usage:
+    python bench_classifier.py [--config=/path/to/hestia.toml] [--files 100000]
+"""
+
+import argparse
+import json
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from index import FileClassifier, WorkspaceIndexer  # noqa: E402
+
+DEFAULT_CONFIG = (
+    Path(__file__).resolve().parents[2] / "config" / "system" / "hestia.toml"
+)
+
+STEMS = [
+    "configuration.yaml",
+    "automations.yaml",
+    "lovelace",
+    "README.md",
+    "notes.txt",
+    "core.json",
+    "bundle.tar.gz",
+]
+SUFFIXES = [
+    "", ".bak", ".bak-2", "_backup", "_backup_old", "_restore", ".perlbak",
+    ".bk.20251015T120000Z", ".BK.20251015T120000Z", ".bk.2025", ".zip", ".toml",
+]
+
+
+def synthetic_paths(config: dict, n: int, seed: int = 1) -> list[str]:
+    rnd = random.Random(seed)
+    roots = [config["paths"]["config_root"], config["paths"]["vault"]["backups"]]
+    locations = [
+        p["location"]
+        for p in config["retention"].values()
+        if str(p.get("location", "")).startswith("/")
+    ]
+    roots += locations
+    # near misses: a location must match whole path components, not a substring
+    roots += [f"{loc.rstrip('/')}_old" for loc in locations] + [
+        f"/srv{loc}" for loc in locations
+    ]
+    dirs = ["", "packages", "domain/templates", "hestia/workspace", "www/community"]
+    paths = []
+    for i in range(n):
+        base = f"{rnd.choice(roots)}/{rnd.choice(dirs)}".rstrip("/")
+        paths.append(f"{base}/{i % 977}_{rnd.choice(STEMS)}{rnd.choice(SUFFIXES)}")
+    return paths
+
+
+def per_rule(indexer: WorkspaceIndexer, path: str, age_days: int) -> tuple:
+    file_path = Path(path)
+    category, file_type = indexer._categorize_file(file_path)
+    compliant = indexer._check_naming_compliance(file_path)
+    action = indexer._determine_action(file_path, age_days, compliant)
+    return (
+        category, file_type, indexer._get_ttl_for_file(file_path), compliant,
+        indexer._check_vault_eligibility(file_path, category), action,
+    )
+
+
+def compiled(classifier: FileClassifier, path: str, age_days: int) -> tuple:
+    c = classifier.classify(path)
+    action = FileClassifier.action(
+        c.naming_compliant, age_days, c.ttl_days, c.vault_eligible
+    )
+    return (
+        c.category,
+        c.file_type,
+        c.ttl_days,
+        c.naming_compliant,
+        c.vault_eligible,
+        action,
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark sweeper file classification"
+    )
+    parser.add_argument(
+        "--config", default=str(DEFAULT_CONFIG), help="Path to hestia.toml"
+    )
+    parser.add_argument("--files", type=int, default=100000)
+    args = parser.parse_args()
+
+    indexer = WorkspaceIndexer(args.config, use_index=False)
+    logging.getLogger().setLevel(logging.WARNING)
+    paths = synthetic_paths(indexer.config, args.files)
+    ages = [i % 30 for i in range(len(paths))]
+
+    start = time.perf_counter()
+    reference = [per_rule(indexer, p, a) for p, a in zip(paths, ages, strict=True)]
+    per_rule_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    classifier = FileClassifier(indexer.config)
+    results = [compiled(classifier, p, a) for p, a in zip(paths, ages, strict=True)]
+    compiled_s = time.perf_counter() - start
+
+    mismatches = [
+        p for p, a, b in zip(paths, reference, results, strict=True) if a != b
+    ]
+    print(json.dumps({
+        "files": len(paths),
+        "per_rule_seconds": round(per_rule_s, 3),
+        "compiled_seconds": round(compiled_s, 3),
+        "speedup": round(per_rule_s / compiled_s, 1) if compiled_s else None,
+        "mismatches": len(mismatches),
+        "examples": mismatches[:5],
+    }, indent=2))
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,8 +6,15 @@ Configuration-driven workspace scanning with intelligent file classification
 Purpose: Scans workspace for files matching configurable patterns and maintains
 rotating log of workspace files requiring action.
 
+Scans are incremental: classifications are kept in a SQLite index under
+``automation.sweeper.index_dir`` (default ``<workspace_root>/.hestia/index``)
+and only files whose (dev, inode, size, mtime_ns) changed - or all files, when
+the classification config changed - are reclassified. Scope patterns of the
+form ``<root>/**/<name-glob>`` are expanded with a single os.scandir walk.
+
 Usage:
     python index.py [--config=/path/to/hestia.toml] [--dry-run]
+                    [--no-index | --rebuild-index]
 
 Compliance: ADR-0018, ADR-0024, ADR-0027
 """
@@ -16,15 +23,22 @@ import argparse
 import hashlib
 import json
 import logging
+import os
 import re
+import sqlite3
 import sys
 from dataclasses import asdict, dataclass
 from datetime import UTC, datetime
+from fnmatch import translate
 from glob import glob
 from pathlib import Path
+from typing import NamedTuple
 
 import toml
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from sweeper_ops import sweeper_index_dir  # noqa: E402
+
 
 @dataclass
 class FileRecord:
@@ -42,12 +56,224 @@ class FileRecord:
     vault_eligible: bool
 
 
+class Classification(NamedTuple):
+    """Stat-independent classification of one path"""
+
+    category: str
+    file_type: str
+    ttl_days: int
+    naming_compliant: bool
+    vault_eligible: bool
+
+
+def location_applies(location: str, path: str) -> bool:
+    """Whether a retention location covers ``path``
+
+    Absolute locations must match whole leading path components, so
+    /config/hestia/reports covers /config/hestia/reports/x but not
+    /config/hestia/reports_old/x; anything else ("same_directory") is a
+    substring test.
+    """
+    if not location.startswith("/"):
+        return location in path
+    root = location.rstrip("/")
+    return path == root or path.startswith(root + "/")
+
+
+class FileClassifier:
+    """Classification rules from hestia.toml, compiled once per run
+
+    Equivalent to WorkspaceIndexer._categorize_file, _check_naming_compliance,
+    _get_ttl_for_file and _check_vault_eligibility, but in one pass per path:
+    the legacy backup globs are a single anchored alternation and retention
+    locations are resolved with a path-component prefix trie.
+    """
+
+    CANONICAL_RE = re.compile(r".*\.bk\.\d{8}T\d{6}Z$")
+    EXTENSIONS = (
+        ((".yaml", ".yml", ".json", ".toml"), "config_file", "configuration"),
+        ((".md", ".rst", ".txt"), "documentation", "document"),
+        ((".tar.gz", ".tgz", ".zip"), "archive_blob", "archive"),
+    )
+    _POLICY = "\0policy"
+
+    def __init__(self, config: dict):
+        patterns = config["backup"]["legacy_patterns"]["patterns"]
+        # same glob -> regex translation as WorkspaceIndexer._match_pattern
+        self.legacy_re = (
+            re.compile(
+                "^(?:"
+                + "|".join(p.replace("*", ".*").replace("?", ".") for p in patterns)
+                + ")$"
+            )
+            if patterns
+            else None
+        )
+        self.default_ttl = config["backup"]["retention"]["in_place_ttl_days"]
+        self.vault_prefix = config["paths"]["vault"]["backups"]
+        # absolute locations go into the trie; anything else ("same_directory")
+        # keeps the substring test. Config order decides between several matches.
+        self.trie: dict = {}
+        self.substring_locations: list[tuple[int, str, int]] = []
+        for order, policy in enumerate(config["retention"].values()):
+            if "location" not in policy:
+                continue
+            location, ttl = policy["location"], policy.get("ttl_days", -1)
+            if not location.startswith("/"):
+                self.substring_locations.append((order, location, ttl))
+                continue
+            node = self.trie
+            for part in location.rstrip("/").split("/"):
+                node = node.setdefault(part, {})
+            node.setdefault(self._POLICY, (order, ttl))
+        self._dir_state: dict[str, tuple] = {}
+
+    def ttl_for(self, path: str) -> int:
+        directory, _, name = path.rpartition("/")
+        # trie walk over the directory components is shared by every file in it
+        state = self._dir_state.get(directory)
+        if state is None:
+            best, node = None, self.trie
+            for part in directory.split("/"):
+                node = node.get(part)
+                if node is None:
+                    break
+                hit = node.get(self._POLICY)
+                if hit and (best is None or hit < best):
+                    best = hit
+            state = self._dir_state[directory] = (best, node)
+        best, node = state
+        if node is not None:
+            hit = node.get(name, {}).get(self._POLICY)
+            if hit and (best is None or hit < best):
+                best = hit
+        for order, location, ttl in self.substring_locations:
+            if location in path and (best is None or order < best[0]):
+                best = (order, ttl)
+        return best[1] if best else self.default_ttl
+
+    def classify(self, path: str) -> Classification:
+        name = os.path.basename(path)
+        lower = name.lower()
+        legacy = self.legacy_re is not None and self.legacy_re.match(lower) is not None
+        if legacy:
+            category, file_type = "legacy_backup", "backup_file"
+        elif self.CANONICAL_RE.match(lower):
+            category, file_type = "canonical_backup", "backup_file"
+        else:
+            category, file_type = "other", "unknown"
+            for extensions, ext_category, ext_type in self.EXTENSIONS:
+                if lower.endswith(extensions):
+                    category, file_type = ext_category, ext_type
+                    break
+        return Classification(
+            category=category,
+            file_type=file_type,
+            ttl_days=self.ttl_for(path),
+            naming_compliant=not legacy or self.CANONICAL_RE.match(name) is not None,
+            vault_eligible=category in ("legacy_backup", "canonical_backup")
+            and path.startswith(self.vault_prefix),
+        )
+
+    @staticmethod
+    def action(
+        naming_compliant: bool, age_days: int, ttl_days: int, vault_eligible: bool
+    ) -> str:
+        """Action for an already-classified file"""
+        if not naming_compliant:
+            return "rename_to_canonical"
+        elif age_days > ttl_days and ttl_days > 0:
+            return "cleanup_expired"
+        elif vault_eligible:
+            return "vault_management"
+        else:
+            return "no_action"
+
+
+INDEX_SCHEMA_VERSION = "2"
+INDEX_DB_NAME = "sweeper__index.sqlite"
+_MAGIC_RE = re.compile(r"[*?[]")
+
+
+class ScanIndex:
+    """Persistent path -> classification index for incremental workspace scans"""
+
+    COLUMNS = (
+        "path", "dev", "inode", "size", "mtime_ns", "category", "file_type",
+        "ttl_days", "naming_compliant", "vault_eligible", "action",
+    )
+
+    def __init__(self, db_path: Path, fingerprint: str, rebuild: bool = False):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path), timeout=10)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, dev INTEGER,"
+            " inode INTEGER, size INTEGER, mtime_ns INTEGER, category TEXT,"
+            " file_type TEXT, ttl_days INTEGER, naming_compliant INTEGER,"
+            " vault_eligible INTEGER, action TEXT)"
+        )
+        stamp = f"{INDEX_SCHEMA_VERSION}:{fingerprint}"
+        row = self.conn.execute("SELECT value FROM meta WHERE key='stamp'").fetchone()
+        with self.conn:
+            if rebuild or not row or row[0] != stamp:
+                # classification rules changed: every entry must be reclassified
+                self.conn.execute("DELETE FROM files")
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO meta(key, value) VALUES('stamp', ?)",
+                    (stamp,),
+                )
+        self.rows = {
+            r[0]: r
+            for r in self.conn.execute(f"SELECT {', '.join(self.COLUMNS)} FROM files")
+        }
+        self.pending: list[tuple] = []
+
+    def lookup(self, path: str, st: os.stat_result) -> tuple | None:
+        """Cached row when the file is unchanged since it was classified"""
+        row = self.rows.get(path)
+        if row and row[1:5] == (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns):
+            return row
+        return None
+
+    def store(self, row: tuple) -> None:
+        if self.rows.get(row[0]) != row:
+            self.pending.append(row)
+
+    def commit(self, live_paths: set[str]) -> int:
+        """Write changed rows, drop entries for files out of scope; returns evictions"""
+        stale = [(p,) for p in self.rows if p not in live_paths]
+        placeholders = ", ".join("?" * len(self.COLUMNS))
+        with self.conn:
+            self.conn.executemany(
+                f"INSERT OR REPLACE INTO files VALUES ({placeholders})", self.pending
+            )
+            self.conn.executemany("DELETE FROM files WHERE path=?", stale)
+        self.pending = []
+        return len(stale)
+
+    def close(self) -> None:
+        self.conn.close()
+
+
 class WorkspaceIndexer:
     """Configuration-driven workspace scanner"""
 
-    def __init__(self, config_path: str = "/config/hestia/config/system/hestia.toml"):
+    def __init__(
+        self,
+        config_path: str = "/config/hestia/config/system/hestia.toml",
+        use_index: bool = True,
+        rebuild_index: bool = False,
+        config: dict | None = None,
+    ):
         self.config_path = Path(config_path)
-        self.config = self._load_config()
+        # in-process pipelines pass the already-parsed hestia.toml
+        self.config = config if config is not None else self._load_config()
 
         # Extract configuration sections first
         self.sweeper_config = self.config["automation"]["sweeper"]
@@ -55,11 +281,15 @@ class WorkspaceIndexer:
         self.retention_config = self.config["retention"]
         self.backup_config = self.config["backup"]
         self.naming_config = self.config["naming"]
+        self.classifier = FileClassifier(self.config)
 
         # File discovery parameters
         self.scope_patterns = self.sweeper_config["scope_patterns"]
         self.recursive = self.sweeper_config["workspace_scan_recursive"]
         self.log_rotation_count = self.sweeper_config["log_rotation_count"]
+        self.use_index = use_index
+        self.rebuild_index = rebuild_index
+        self.index_dir = sweeper_index_dir(self.config)
 
         # Initialize file registry
         self.file_registry: list[FileRecord] = []
@@ -70,6 +300,9 @@ class WorkspaceIndexer:
             "expired_files": 0,
             "vault_candidates": 0,
             "scan_duration_seconds": 0,
+            "index_reused": 0,
+            "index_reclassified": 0,
+            "index_evicted": 0,
         }
 
     def _load_config(self) -> dict:
@@ -101,41 +334,176 @@ class WorkspaceIndexer:
         self.logger.info(f"Starting workspace scan with {len(self.scope_patterns)} patterns")
 
         discovered_files: set[str] = set()
+        scan_index = self._open_scan_index()
 
         for pattern in self.scope_patterns:
             self.logger.debug(f"Scanning pattern: {pattern}")
 
-            # Handle recursive patterns with **
-            if self.recursive and "**" in pattern:
-                matches = glob(pattern, recursive=True)
-            else:
-                matches = glob(pattern)
+            for match, stat_info in self._iter_pattern(pattern):
+                if match not in discovered_files:
+                    discovered_files.add(match)
+                    self._classify_file(match, stat_info, scan_index)
 
-            for match in matches:
-                file_path = Path(match)
-                if file_path.is_file() and str(file_path) not in discovered_files:
-                    discovered_files.add(str(file_path))
-                    self._classify_file(file_path)
+        if scan_index is not None:
+            try:
+                self.stats["index_evicted"] = scan_index.commit(discovered_files)
+            except sqlite3.Error as e:
+                self.logger.warning(
+                    f"Could not update scan index {scan_index.db_path}: {e}"
+                )
+            finally:
+                scan_index.close()
 
         self.stats["total_files"] = len(discovered_files)
         self.stats["scan_duration_seconds"] = int((datetime.now(UTC) - start_time).total_seconds())
+        self.logger.info(
+            f"Scan index: {self.stats['index_reused']} reused, "
+            f"{self.stats['index_reclassified']} classified, "
+            f"{self.stats['index_evicted']} evicted"
+        )
 
         self.logger.info(
             f"Discovered {self.stats['total_files']} files in {self.stats['scan_duration_seconds']:.2f}s"
         )
 
-    def _classify_file(self, file_path: Path) -> None:
+    def _open_scan_index(self) -> ScanIndex | None:
+        """Open the incremental scan index; None (full classification) if unusable"""
+        if not self.use_index:
+            return None
+        try:
+            return ScanIndex(
+                self.index_dir / INDEX_DB_NAME,
+                self._classification_fingerprint(),
+                self.rebuild_index,
+            )
+        except (OSError, sqlite3.Error) as e:
+            self.logger.warning(f"Scan index unavailable ({e}); classifying every file")
+            return None
+
+    def _classification_fingerprint(self) -> str:
+        """Hash of every config value classification depends on"""
+        inputs = {
+            "legacy_patterns": self.backup_config["legacy_patterns"]["patterns"],
+            "retention": self.retention_config,
+            "in_place_ttl_days": self.backup_config["retention"]["in_place_ttl_days"],
+            "vault_backups": self.config["paths"]["vault"]["backups"],
+        }
+        return hashlib.sha256(
+            json.dumps(inputs, sort_keys=True, default=str).encode()
+        ).hexdigest()[:16]
+
+    def _iter_pattern(self, pattern: str):
+        """Yield (path, stat) for regular files matching a scope pattern"""
+        parts = Path(pattern).parts
+        magic = [i for i, part in enumerate(parts) if _MAGIC_RE.search(part)]
+        rest = parts[magic[0]:] if magic else ()
+        walkable = rest and rest[-1] != "**" and (
+            len(rest) == 1 or (len(rest) == 2 and rest[0] == "**" and self.recursive)
+        )
+        if walkable:
+            yield from self._scandir_matches(
+                Path(*parts[: magic[0]]) if magic[0] else Path("."),
+                rest[-1],
+                recursive=len(rest) == 2,
+            )
+            return
+        # anything else keeps plain glob semantics
+        if self.recursive and "**" in pattern:
+            matches = glob(pattern, recursive=True)
+        else:
+            matches = glob(pattern)
+        for match in matches:
+            try:
+                stat_info = os.stat(match)
+            except OSError:
+                continue
+            if Path(match).is_file():
+                yield str(Path(match)), stat_info
+
+    def _scandir_matches(self, root: Path, name_glob: str, recursive: bool):
+        """One os.scandir walk equal to glob('<root>/**/<name_glob>', recursive=True)"""
+        name_re = re.compile(translate(name_glob))
+        match_hidden = name_glob.startswith(".")
+        visited: set[tuple[int, int]] = set()
+        strip = 2 if str(root) == "." else 0  # "./name" -> "name", as glob reports it
+        stack = [str(root)]
+        while stack:
+            directory = stack.pop()
+            try:
+                dir_stat = os.stat(directory)
+                if (dir_stat.st_dev, dir_stat.st_ino) in visited:
+                    continue  # symlink loop
+                visited.add((dir_stat.st_dev, dir_stat.st_ino))
+                entries = list(os.scandir(directory))
+            except OSError:
+                continue
+            subdirs = []
+            for entry in entries:
+                hidden = entry.name.startswith(".")
+                try:
+                    if entry.is_dir():
+                        if recursive and not hidden:
+                            subdirs.append(entry.path)
+                        continue
+                    if (hidden and not match_hidden) or not name_re.match(entry.name):
+                        continue
+                    if entry.is_file():
+                        yield entry.path[strip:], entry.stat()
+                except OSError:
+                    continue
+            # depth-first, in directory order, like glob's ** expansion
+            stack.extend(reversed(subdirs))
+
+    def _classify_file(
+        self,
+        file_path: Path | str,
+        stat_info: os.stat_result | None = None,
+        scan_index: ScanIndex | None = None,
+    ) -> None:
         """Classify a discovered file and add to registry"""
+        path_str = str(file_path)
         try:
-            stat_info = file_path.stat()
+            if stat_info is None:
+                stat_info = os.stat(path_str)
             modified_time = datetime.fromtimestamp(stat_info.st_mtime, UTC)
             age_days = (datetime.now(UTC) - modified_time).days
 
-            # Determine file category and compliance
-            file_category, file_type = self._categorize_file(file_path)
-            naming_compliant = self._check_naming_compliance(file_path)
-            action_required = self._determine_action(file_path, age_days, naming_compliant)
-            vault_eligible = self._check_vault_eligibility(file_path, file_category)
+            # Determine category and compliance (reused from the index if unchanged)
+            cached = scan_index.lookup(path_str, stat_info) if scan_index else None
+            if cached:
+                (
+                    _,
+                    _,
+                    _,
+                    _,
+                    _,
+                    file_category,
+                    file_type,
+                    ttl_days,
+                    naming_compliant,
+                    vault_eligible,
+                    _,
+                ) = cached
+                naming_compliant, vault_eligible = (
+                    bool(naming_compliant),
+                    bool(vault_eligible),
+                )
+                self.stats["index_reused"] += 1
+            else:
+                c = self.classifier.classify(path_str)
+                file_category, file_type, ttl_days = c.category, c.file_type, c.ttl_days
+                naming_compliant, vault_eligible = c.naming_compliant, c.vault_eligible
+                self.stats["index_reclassified"] += 1
+            # age moves on every run, so the action is always re-derived
+            action_required = FileClassifier.action(
+                naming_compliant, age_days, ttl_days, vault_eligible
+            )
+            if scan_index is not None:
+                scan_index.store((
+                    path_str, stat_info.st_dev, stat_info.st_ino, stat_info.st_size,
+                    stat_info.st_mtime_ns, file_category, file_type, ttl_days,
+                    int(naming_compliant), int(vault_eligible), action_required,
+                ))
 
             # Update statistics
             if file_category == "legacy_backup":
@@ -143,7 +511,7 @@ class WorkspaceIndexer:
             elif file_category == "canonical_backup":
                 self.stats["canonical_backups"] += 1
 
-            if age_days > self._get_ttl_for_file(file_path):
+            if age_days > ttl_days:
                 self.stats["expired_files"] += 1
 
             if vault_eligible:
@@ -151,8 +519,8 @@ class WorkspaceIndexer:
 
             # Create file record
             record = FileRecord(
-                path=str(file_path),
-                basename=file_path.name,
+                path=path_str,
+                basename=os.path.basename(path_str),
                 size_bytes=stat_info.st_size,
                 modified_time=modified_time.isoformat(),
                 file_type=file_type,
@@ -168,6 +536,8 @@ class WorkspaceIndexer:
         except (OSError, PermissionError) as e:
             self.logger.warning(f"Cannot access file {file_path}: {e}")
 
+    # Per-rule reference implementation; scans use FileClassifier (bench_classifier.py)
+
     def _categorize_file(self, file_path: Path) -> tuple[str, str]:
         """Categorize file by type and naming pattern"""
         name = file_path.name.lower()
@@ -217,16 +587,14 @@ class WorkspaceIndexer:
 
     def _determine_action(self, file_path: Path, age_days: int, naming_compliant: bool) -> str:
         """Determine what action is needed for this file"""
-        ttl_days = self._get_ttl_for_file(file_path)
-
-        if not naming_compliant:
-            return "rename_to_canonical"
-        elif age_days > ttl_days and ttl_days > 0:
-            return "cleanup_expired"
-        elif self._check_vault_eligibility(file_path, self._categorize_file(file_path)[0]):
-            return "vault_management"
-        else:
-            return "no_action"
+        return FileClassifier.action(
+            naming_compliant,
+            age_days,
+            self._get_ttl_for_file(file_path),
+            self._check_vault_eligibility(
+                file_path, self._categorize_file(file_path)[0]
+            ),
+        )
 
     def _get_ttl_for_file(self, file_path: Path) -> int:
         """Get TTL days for file based on its location and type"""
@@ -234,7 +602,7 @@ class WorkspaceIndexer:
 
         # Check each retention category
         for category, policy in self.retention_config.items():
-            if "location" in policy and policy["location"] in str_path:
+            if "location" in policy and location_applies(policy["location"], str_path):
                 return policy.get("ttl_days", -1)
 
         # Default to in-place backup TTL
@@ -297,8 +665,10 @@ class WorkspaceIndexer:
         content = json.dumps([asdict(r) for r in self.file_registry], sort_keys=True)
         return hashlib.sha256(content.encode()).hexdigest()[:16]
 
-    def save_index_log(self, output_path: str | None = None) -> str:
-        """Save file index to structured log file"""
+    def save_index_log(
+        self, output_path: str | None = None, index_data: dict | None = None
+    ) -> str:
+        """Save file index (generated unless given) to structured log file"""
         if not output_path:
             # Use configured log location with date substitution
             date_str = datetime.now(UTC).strftime("%Y-%m-%d")
@@ -311,7 +681,8 @@ class WorkspaceIndexer:
         output_file.parent.mkdir(parents=True, exist_ok=True)
 
         # Generate index data
-        index_data = self.generate_file_index()
+        if index_data is None:
+            index_data = self.generate_file_index()
 
         # Write with frontmatter format
         with open(output_file, "w") as f:
@@ -369,12 +740,25 @@ def main():
         "--dry-run", action="store_true", help="Perform scan without creating log files"
     )
     parser.add_argument("--output", help="Custom output path for index log")
+    index_mode = parser.add_mutually_exclusive_group()
+    index_mode.add_argument(
+        "--no-index",
+        action="store_true",
+        help="Classify every file; do not read or update the scan index",
+    )
+    index_mode.add_argument(
+        "--rebuild-index",
+        action="store_true",
+        help="Discard the scan index and reclassify every file",
+    )
 
     args = parser.parse_args()
 
     try:
         # Initialize indexer
-        indexer = WorkspaceIndexer(args.config)
+        indexer = WorkspaceIndexer(
+            args.config, use_index=not args.no_index, rebuild_index=args.rebuild_index
+        )
 
         # Perform workspace scan
         indexer.discover_workspace_files()
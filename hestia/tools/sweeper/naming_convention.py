@@ -20,6 +20,7 @@ import os
 import re
 import shutil
 import sys
+import threading
 from dataclasses import asdict, dataclass
 from datetime import UTC, datetime
 from pathlib import Path
@@ -27,6 +28,13 @@ from pathlib import Path
 import toml
 import yaml
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from sweeper_ops import (  # noqa: E402
+    FileOpPool,
+    calculate_checksum as shared_checksum,
+    open_checksum_cache,
+)
+
 
 @dataclass
 class NamingOperation:
@@ -46,9 +54,14 @@ class NamingOperation:
 class NamingStandardizer:
     """Configuration-driven naming standards enforcement"""
 
-    def __init__(self, config_path: str = "/config/hestia/config/system/hestia.toml"):
+    def __init__(
+        self,
+        config_path: str = "/config/hestia/config/system/hestia.toml",
+        config: dict | None = None,
+    ):
         self.config_path = Path(config_path)
-        self.config = self._load_config()
+        # in-process pipelines pass the already-parsed hestia.toml
+        self.config = config if config is not None else self._load_config()
 
         # Extract configuration sections first
         self.sweeper_config = self.config["automation"]["sweeper"]
@@ -75,6 +88,11 @@ class NamingStandardizer:
             "processing_duration_seconds": 0,
         }
 
+        # Shared I/O pool for per-file operations
+        self.io_pool = FileOpPool.from_config(self.sweeper_config)
+        self.checksums = open_checksum_cache(self.config)
+        self._stats_lock = threading.Lock()
+
     def _load_config(self) -> dict:
         """Load configuration from hestia.toml"""
         try:
@@ -98,6 +116,11 @@ class NamingStandardizer:
         )
         self.logger = logging.getLogger("hestia.sweeper.naming")
 
+    def _count(self, key: str, amount: int = 1) -> None:
+        """Thread-safe statistics increment (per-file work runs on the I/O pool)"""
+        with self._stats_lock:
+            self.stats[key] += amount
+
     def load_file_index(self, index_file_path: str) -> dict:
         """Load file index from previous indexer run"""
         try:
@@ -206,7 +229,7 @@ class NamingStandardizer:
             permissions = int(self.safety_config["backup_file_permissions"], 8)
             backup_path.chmod(permissions)
 
-            self.stats["backup_operations"] += 1
+            self._count("backup_operations")
             self.logger.debug(f"Created backup: {backup_path}")
 
             return str(backup_path)
@@ -217,14 +240,7 @@ class NamingStandardizer:
 
     def calculate_checksum(self, file_path: Path) -> str:
         """Calculate SHA256 checksum of file"""
-        try:
-            hasher = hashlib.sha256()
-            with open(file_path, "rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    hasher.update(chunk)
-            return hasher.hexdigest()[:16]
-        except (OSError, PermissionError):
-            return "unavailable"
+        return shared_checksum(file_path, self.checksums)
 
     def rename_file_atomically(self, original_path: Path, target_path: Path) -> bool:
         """Perform atomic file rename with safety checks"""
@@ -274,13 +290,13 @@ class NamingStandardizer:
             # Validate scope
             if not self.validate_file_scope(original_path):
                 operation.validation_status = "scope_violation"
-                self.stats["validation_failures"] += 1
+                self._count("validation_failures")
                 return operation
 
             # Validate naming pattern
             if not self.validate_naming_pattern(original_path):
                 operation.validation_status = "pattern_violation"
-                self.stats["validation_failures"] += 1
+                self._count("validation_failures")
                 return operation
 
             # Generate canonical name
@@ -297,7 +313,7 @@ class NamingStandardizer:
             if self.rename_file_atomically(original_path, target_path):
                 operation.validation_status = "success"
                 operation.checksum_after = self.calculate_checksum(target_path)
-                self.stats["files_renamed"] += 1
+                self._count("files_renamed")
                 self.logger.info(f"Renamed: {original_path.name} → {canonical_name}")
             else:
                 operation.validation_status = "rename_failed"
@@ -313,7 +329,7 @@ class NamingStandardizer:
             operation.validation_status = f"error: {e}"
             self.logger.error(f"Error processing {original_path}: {e}")
 
-        self.stats["files_processed"] += 1
+        self._count("files_processed")
         return operation
 
     def process_file_index(self, index_data: dict, dry_run: bool = False) -> None:
@@ -323,16 +339,28 @@ class NamingStandardizer:
 
         self.logger.info(f"Processing {len(file_registry)} files from index")
 
+        to_rename = []
         for file_record in file_registry:
             if self.should_rename_file(file_record):
                 if dry_run:
                     self.logger.info(f"Would rename: {file_record['path']}")
-                    self.stats["files_processed"] += 1
+                    self._count("files_processed")
                 else:
-                    operation = self.process_file_naming(file_record)
-                    self.operations.append(operation)
+                    to_rename.append(file_record)
             else:
-                self.stats["files_skipped"] += 1
+                self._count("files_skipped")
+
+        # Directories in parallel; renames within one directory stay sequential
+        # so target-exists checks and backup names cannot race
+        self.operations.extend(
+            self.io_pool.map_grouped(
+                self.process_file_naming,
+                to_rename,
+                key=lambda r: str(Path(r["path"]).parent),
+            )
+        )
+        if self.checksums is not None and not dry_run:
+            self.checksums.flush()
 
         self.stats["processing_duration_seconds"] = int(
             (datetime.now(UTC) - start_time).total_seconds()
@@ -391,6 +419,25 @@ class NamingStandardizer:
         content = json.dumps([asdict(op) for op in self.operations], sort_keys=True)
         return hashlib.sha256(content.encode()).hexdigest()[:16]
 
+    def merge_into_shared_log(self, frontmatter: dict, data: dict) -> None:
+        """Add naming operation results to a parsed shared log (frontmatter + body)"""
+        data["naming_operations"] = {
+            "statistics": self.stats,
+            "operations_count": len(self.operations),
+            "successful_renames": len(
+                [op for op in self.operations if op.validation_status == "success"]
+            ),
+            "processing_timestamp": datetime.now(UTC).isoformat(),
+        }
+
+        # Update frontmatter
+        frontmatter["rows_processed"] = frontmatter.get("rows_processed", 0) + len(
+            self.operations
+        )
+        frontmatter["content_hash"] = hashlib.sha256(
+            json.dumps(data, sort_keys=True).encode()
+        ).hexdigest()[:16]
+
     def update_shared_log(self, log_file_path: str) -> None:
         """Update shared log file with naming operation results"""
         try:
@@ -415,23 +462,7 @@ class NamingStandardizer:
                     frontmatter = yaml.safe_load(frontmatter_content)
                     existing_data = json.loads(json_content)
 
-                    # Add naming operation results
-                    existing_data["naming_operations"] = {
-                        "statistics": self.stats,
-                        "operations_count": len(self.operations),
-                        "successful_renames": len(
-                            [op for op in self.operations if op.validation_status == "success"]
-                        ),
-                        "processing_timestamp": datetime.now(UTC).isoformat(),
-                    }
-
-                    # Update frontmatter
-                    frontmatter["rows_processed"] = frontmatter.get("rows_processed", 0) + len(
-                        self.operations
-                    )
-                    frontmatter["content_hash"] = hashlib.sha256(
-                        json.dumps(existing_data, sort_keys=True).encode()
-                    ).hexdigest()[:16]
+                    self.merge_into_shared_log(frontmatter, existing_data)
 
                     # Write updated log
                     with open(log_path, "w") as f:
@@ -19,6 +19,7 @@ import logging
 import os
 import shutil
 import sys
+import threading
 from dataclasses import asdict, dataclass
 from datetime import UTC, datetime
 from pathlib import Path
@@ -26,6 +27,13 @@ from pathlib import Path
 import toml
 import yaml
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from sweeper_ops import (  # noqa: E402
+    FileOpPool,
+    calculate_checksum as shared_checksum,
+    open_checksum_cache,
+)
+
 
 @dataclass
 class CleanupOperation:
@@ -47,9 +55,14 @@ class CleanupOperation:
 class FileLifecycleManager:
     """Configuration-driven file lifecycle management"""
 
-    def __init__(self, config_path: str = "/config/hestia/config/system/hestia.toml"):
+    def __init__(
+        self,
+        config_path: str = "/config/hestia/config/system/hestia.toml",
+        config: dict | None = None,
+    ):
         self.config_path = Path(config_path)
-        self.config = self._load_config()
+        # in-process pipelines pass the already-parsed hestia.toml
+        self.config = config if config is not None else self._load_config()
 
         # Extract configuration sections first
         self.retention_config = self.config["retention"]
@@ -72,6 +85,11 @@ class FileLifecycleManager:
             "processing_duration_seconds": 0,
         }
 
+        # Shared I/O pool for per-file operations
+        self.io_pool = FileOpPool.from_config(self.sweeper_config)
+        self.checksums = open_checksum_cache(self.config)
+        self._stats_lock = threading.Lock()
+
     def _load_config(self) -> dict:
         """Load configuration from hestia.toml"""
         try:
@@ -95,6 +113,11 @@ class FileLifecycleManager:
         )
         self.logger = logging.getLogger("hestia.sweeper.lifecycle")
 
+    def _count(self, key: str, amount: int = 1) -> None:
+        """Thread-safe statistics increment (per-file work runs on the I/O pool)"""
+        with self._stats_lock:
+            self.stats[key] += amount
+
     def load_file_index(self, index_file_path: str) -> dict:
         """Load file index from previous component run"""
         try:
@@ -139,14 +162,7 @@ class FileLifecycleManager:
 
     def calculate_checksum(self, file_path: Path) -> str:
         """Calculate SHA256 checksum of file"""
-        try:
-            hasher = hashlib.sha256()
-            with open(file_path, "rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    hasher.update(chunk)
-            return hasher.hexdigest()[:16]
-        except (OSError, PermissionError):
-            return "unavailable"
+        return shared_checksum(file_path, self.checksums)
 
     def create_backup(self, original_path: Path) -> str | None:
         """Create backup of original file before cleanup"""
@@ -166,7 +182,7 @@ class FileLifecycleManager:
             permissions = int(self.safety_config["backup_file_permissions"], 8)
             backup_path.chmod(permissions)
 
-            self.stats["backup_operations"] += 1
+            self._count("backup_operations")
             self.logger.debug(f"Created cleanup backup: {backup_path}")
 
             return str(backup_path)
@@ -183,14 +199,17 @@ class FileLifecycleManager:
 
             # Generate unique trash filename
             timestamp = datetime.now(UTC).strftime("%Y%m%dT%H%M%SZ")
-            trash_name = f"{timestamp}_{file_path.name}"
-            trash_path = trash_dir / trash_name
+            trash_path = self._reserve_trash_path(trash_dir, timestamp, file_path.name)
 
-            # Move file atomically
-            if self.safety_config["atomic_writes"]:
-                os.replace(str(file_path), str(trash_path))
-            else:
-                shutil.move(str(file_path), str(trash_path))
+            # Move file atomically (over the reserved placeholder)
+            try:
+                if self.safety_config["atomic_writes"]:
+                    os.replace(str(file_path), str(trash_path))
+                else:
+                    shutil.move(str(file_path), str(trash_path))
+            except BaseException:
+                trash_path.unlink(missing_ok=True)
+                raise
 
             self.logger.debug(f"Moved to trash: {file_path} → {trash_path}")
             return str(trash_path)
@@ -199,6 +218,26 @@ class FileLifecycleManager:
             self.logger.error(f"Failed to move {file_path} to trash: {e}")
             return None
 
+    @staticmethod
+    def _reserve_trash_path(trash_dir: Path, timestamp: str, name: str) -> Path:
+        """Claim ``{timestamp}_{name}`` in the trash (``{timestamp}-N_{name}`` if taken)
+
+        The placeholder is created with O_EXCL, so same-named files cleaned up
+        in the same second (possibly on parallel workers) never replace each
+        other's trash entry.
+        """
+        attempt = 0
+        while True:
+            suffix = f"-{attempt}" if attempt else ""
+            candidate = trash_dir / f"{timestamp}{suffix}_{name}"
+            try:
+                os.close(
+                    os.open(candidate, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600)
+                )
+                return candidate
+            except FileExistsError:
+                attempt += 1
+
     def delete_permanently(self, file_path: Path) -> bool:
         """Permanently delete file"""
         try:
@@ -311,8 +350,8 @@ class FileLifecycleManager:
                     operation.status = "deleted_permanently"
                     operation.destination = "deleted"
                     operation.operation_type = "permanent_delete"
-                    self.stats["files_permanently_deleted"] += 1
-                    self.stats["bytes_freed"] += operation.size_bytes
+                    self._count("files_permanently_deleted")
+                    self._count("bytes_freed", operation.size_bytes)
                 else:
                     operation.status = "delete_failed"
                     operation.error_message = "Failed to delete file"
@@ -323,23 +362,23 @@ class FileLifecycleManager:
                     operation.status = "moved_to_trash"
                     operation.destination = trash_path
                     operation.operation_type = "move_to_trash"
-                    self.stats["files_moved_to_trash"] += 1
+                    self._count("files_moved_to_trash")
                 else:
                     operation.status = "move_failed"
                     operation.error_message = "Failed to move to trash"
 
             if operation.status.endswith("_failed"):
-                self.stats["errors_encountered"] += 1
+                self._count("errors_encountered")
             else:
-                self.stats["files_cleaned"] += 1
+                self._count("files_cleaned")
 
         except Exception as e:
             error_result = self.handle_cleanup_error(file_path, e)
             operation.status = "error_handled"
             operation.error_message = error_result
-            self.stats["errors_encountered"] += 1
+            self._count("errors_encountered")
 
-        self.stats["files_processed"] += 1
+        self._count("files_processed")
         return operation
 
     def process_file_index(self, index_data: dict, dry_run: bool = False) -> None:
@@ -349,14 +388,20 @@ class FileLifecycleManager:
 
         self.logger.info(f"Processing {len(file_registry)} files for cleanup")
 
+        to_cleanup = []
         for file_record in file_registry:
             if self.should_cleanup_file(file_record):
                 if dry_run:
                     self.logger.info(f"Would cleanup: {file_record['path']}")
-                    self.stats["files_processed"] += 1
+                    self._count("files_processed")
                 else:
-                    operation = self.cleanup_file(file_record)
-                    self.operations.append(operation)
+                    to_cleanup.append(file_record)
+
+        # Each cleanup touches only its own file and backup; trash names are
+        # reserved with O_EXCL, so same-named files cannot collide there
+        self.operations.extend(self.io_pool.map(self.cleanup_file, to_cleanup))
+        if self.checksums is not None and not dry_run:
+            self.checksums.flush()
 
         self.stats["processing_duration_seconds"] = int(
             (datetime.now(UTC) - start_time).total_seconds()
@@ -413,6 +458,23 @@ class FileLifecycleManager:
         content = json.dumps([asdict(op) for op in self.operations], sort_keys=True)
         return hashlib.sha256(content.encode()).hexdigest()[:16]
 
+    def merge_into_shared_log(self, frontmatter: dict, data: dict) -> None:
+        """Add cleanup operation results to a parsed shared log (frontmatter + body)"""
+        data["cleanup_operations"] = {
+            "statistics": self.stats,
+            "operations_count": len(self.operations),
+            "bytes_freed": self.stats["bytes_freed"],
+            "processing_timestamp": datetime.now(UTC).isoformat(),
+        }
+
+        # Update frontmatter
+        frontmatter["rows_processed"] = frontmatter.get("rows_processed", 0) + len(
+            self.operations
+        )
+        frontmatter["content_hash"] = hashlib.sha256(
+            json.dumps(data, sort_keys=True).encode()
+        ).hexdigest()[:16]
+
     def update_shared_log(self, log_file_path: str) -> None:
         """Update shared log file with cleanup operation results"""
         try:
@@ -437,21 +499,7 @@ class FileLifecycleManager:
                     frontmatter = yaml.safe_load(frontmatter_content)
                     existing_data = json.loads(json_content)
 
-                    # Add cleanup operation results
-                    existing_data["cleanup_operations"] = {
-                        "statistics": self.stats,
-                        "operations_count": len(self.operations),
-                        "bytes_freed": self.stats["bytes_freed"],
-                        "processing_timestamp": datetime.now(UTC).isoformat(),
-                    }
-
-                    # Update frontmatter
-                    frontmatter["rows_processed"] = frontmatter.get("rows_processed", 0) + len(
-                        self.operations
-                    )
-                    frontmatter["content_hash"] = hashlib.sha256(
-                        json.dumps(existing_data, sort_keys=True).encode()
-                    ).hexdigest()[:16]
+                    self.merge_into_shared_log(frontmatter, existing_data)
 
                     # Write updated log
                     with open(log_path, "w") as f:
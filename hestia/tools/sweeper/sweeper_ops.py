@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Hestia Sweeper Shared File Operations
+Checksums and a bounded worker pool shared by the sweeper components
+
+Purpose: One checksum implementation (large-buffer sha256 via
+hashlib.file_digest instead of 4 KB reads) and one thread pool for the
+I/O-bound per-file work of naming_convention.py, sweeper.py and
+vault_warden.py. Threads rather than processes: the work is dominated by
+reads, copies and renames on a possibly network-mounted /config (Samba).
+
+Pool settings come from [automation.sweeper.performance] in hestia.toml
+(max_workers, batch_size, enable_parallel). Results are always returned in
+input order, so operation logs read the same as a sequential run.
+
+Checksums are cached in <index_dir>/sweeper__checksums.sqlite, keyed by
+(dev, inode, size, mtime_ns), so unchanged files (including files that were
+only renamed or moved on the same filesystem) are not re-read on later runs.
+``checksum_verify_fraction`` re-hashes that share of cache hits as a check.
+Components flush new entries after their (non-dry-run) operations; entries
+whose file is gone or changed are evicted once per pipeline run by
+backup_sweeper.py (evict_stale()).
+
+Compliance: ADR-0018, ADR-0024, ADR-0027
+"""
+
+import hashlib
+import logging
+import os
+import random
+import sqlite3
+import threading
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+CHECKSUM_LENGTH = 16
+CHECKSUM_DB_NAME = "sweeper__checksums.sqlite"
+UNAVAILABLE = "unavailable"
+
+logger = logging.getLogger(__name__)
+
+
+def _hash_file(file_path: Path | str) -> str:
+    try:
+        with open(file_path, "rb") as f:
+            return hashlib.file_digest(f, "sha256").hexdigest()[:CHECKSUM_LENGTH]
+    except (OSError, PermissionError):
+        return UNAVAILABLE
+
+
+def _file_key(st: os.stat_result) -> tuple[int, int, int, int]:
+    return (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+class ChecksumCache:
+    """Persistent (dev, inode, size, mtime_ns) -> checksum cache
+
+    Safe to call from FileOpPool threads; writes are buffered in memory and
+    only reach SQLite in flush(), which the owning component calls once its
+    operations are done.
+    """
+
+    def __init__(self, db_path: Path | str, verify_fraction: float = 0.0):
+        self.db_path = Path(db_path)
+        self.verify_fraction = max(0.0, min(1.0, float(verify_fraction)))
+        self._conn: sqlite3.Connection | None = None
+        self.entries: dict[tuple, tuple[str, str]] = {}
+        if self.db_path.exists():
+            # read-only until the first flush, so dry runs never create or write the DB
+            reader = sqlite3.connect(
+                f"file:{self.db_path}?mode=ro", uri=True, timeout=10
+            )
+            try:
+                self.entries = {
+                    tuple(r[:4]): (r[4], r[5])
+                    for r in reader.execute(
+                        "SELECT dev, inode, size, mtime_ns, path, checksum"
+                        " FROM checksums"
+                    )
+                }
+            except sqlite3.OperationalError:
+                pass  # no table yet
+            finally:
+                reader.close()
+        self.pending: dict[tuple, tuple[str, str]] = {}
+        self._lock = threading.Lock()
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "verified": 0,
+            "verify_mismatches": 0,
+            "bytes_hashed": 0,
+        }
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                str(self.db_path), timeout=10, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS checksums (dev INTEGER, inode INTEGER,"
+                " size INTEGER, mtime_ns INTEGER, path TEXT, checksum TEXT,"
+                " PRIMARY KEY (dev, inode, size, mtime_ns))"
+            )
+            self._conn = conn
+        return self._conn
+
+    def _bump(self, key: str, amount: int = 1) -> None:
+        with self._lock:
+            self.stats[key] += amount
+
+    def checksum(self, file_path: Path | str) -> str:
+        path = str(file_path)
+        try:
+            key = _file_key(os.stat(path))
+        except OSError:
+            return UNAVAILABLE
+        with self._lock:
+            hit = self.entries.get(key)
+        if hit is not None and not (
+            self.verify_fraction and random.random() < self.verify_fraction
+        ):
+            self._bump("hits")
+            if hit[0] != path:
+                # renamed/moved: remember where the file lives now for eviction
+                with self._lock:
+                    self.entries[key] = self.pending[key] = (path, hit[1])
+            return hit[1]
+
+        value = _hash_file(path)
+        if value == UNAVAILABLE:
+            return value
+        self._bump("bytes_hashed", key[2])
+        if hit is None:
+            self._bump("misses")
+        else:
+            self._bump("verified")
+            if hit[1] != value:
+                self._bump("verify_mismatches")
+                logger.warning(
+                    f"Checksum cache mismatch for {path}; cached entry replaced"
+                )
+        try:
+            unchanged = _file_key(os.stat(path)) == key
+        except OSError:
+            unchanged = False
+        # only cache a digest that belongs to the stat identity it is keyed by
+        if unchanged:
+            with self._lock:
+                self.entries[key] = self.pending[key] = (path, value)
+        return value
+
+    def flush(self) -> int:
+        """Persist entries added since the last flush; returns how many were written"""
+        with self._lock:
+            pending, self.pending = self.pending, {}
+        if not pending:
+            return 0
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO checksums VALUES (?, ?, ?, ?, ?, ?)",
+                [(*key, path, value) for key, (path, value) in pending.items()],
+            )
+        stats = self.stats
+        logger.info(
+            f"Checksum cache: hits={stats['hits']} misses={stats['misses']} "
+            f"verified={stats['verified']} mismatches={stats['verify_mismatches']} "
+            f"bytes_hashed={stats['bytes_hashed']} written={len(pending)}"
+        )
+        return len(pending)
+
+    def evict_stale(self) -> int:
+        """Flush, then drop entries whose file is gone or changed; returns evictions
+
+        Stats every cached path, so it is meant to run once per pipeline run.
+        """
+        self.flush()
+        with self._lock:
+            entries = list(self.entries.items())
+        stale = []
+        for key, (path, _) in entries:
+            try:
+                live = _file_key(os.stat(path)) == key
+            except OSError:
+                live = False
+            if not live:
+                stale.append(key)
+        if stale:
+            with self.conn:
+                self.conn.executemany(
+                    "DELETE FROM checksums"
+                    " WHERE dev=? AND inode=? AND size=? AND mtime_ns=?",
+                    stale,
+                )
+            with self._lock:
+                for key in stale:
+                    self.entries.pop(key, None)
+        logger.info(f"Checksum cache: evicted={len(stale)} of {len(entries)} entries")
+        return len(stale)
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+_CACHES: dict[str, ChecksumCache] = {}
+
+
+def sweeper_index_dir(config: dict) -> Path:
+    """Directory for the sweeper's persistent indexes (automation.sweeper.index_dir)"""
+    return Path(
+        config["automation"]["sweeper"].get(
+            "index_dir", f"{config['paths']['workspace_root']}/.hestia/index"
+        )
+    )
+
+
+def open_checksum_cache(config: dict) -> ChecksumCache | None:
+    """Process-wide checksum cache for this hestia.toml; None if disabled/unavailable
+
+    Components running in one process (backup_sweeper.py in-process mode)
+    share the same instance.
+    """
+    sweeper_config = config["automation"]["sweeper"]
+    if not sweeper_config.get("checksum_cache", True):
+        return None
+    db_path = str(sweeper_index_dir(config) / CHECKSUM_DB_NAME)
+    cache = _CACHES.get(db_path)
+    if cache is None:
+        try:
+            cache = ChecksumCache(
+                db_path, sweeper_config.get("checksum_verify_fraction", 0.0)
+            )
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Checksum cache unavailable ({e}); hashing without cache")
+            return None
+        _CACHES[db_path] = cache
+    return cache
+
+
+def calculate_checksum(
+    file_path: Path | str, cache: ChecksumCache | None = None
+) -> str:
+    """SHA256 checksum prefix of a file ("unavailable" when it cannot be read)"""
+    if cache is not None:
+        return cache.checksum(file_path)
+    return _hash_file(file_path)
+
+
+class FileOpPool:
+    """Bounded thread pool for per-file sweeper operations"""
+
+    def __init__(
+        self, max_workers: int = 4, batch_size: int = 100, enabled: bool = True
+    ):
+        self.max_workers = max(1, int(max_workers))
+        self.batch_size = max(1, int(batch_size))
+        self.enabled = enabled and self.max_workers > 1
+
+    @classmethod
+    def from_config(cls, sweeper_config: dict) -> "FileOpPool":
+        performance = sweeper_config.get("performance", {})
+        return cls(
+            max_workers=performance.get("max_workers", 4),
+            batch_size=performance.get("batch_size", 100),
+            enabled=performance.get("enable_parallel", True),
+        )
+
+    def map(self, fn: Callable, items: Iterable) -> list:
+        """``[fn(item) for item in items]``, run on the pool
+
+        Items are submitted in batches of ``batch_size``. If a call raises,
+        work not yet started is cancelled and the first exception (in input
+        order) is re-raised, as the sequential loop would have stopped there.
+        """
+        items = list(items)
+        if not self.enabled or len(items) < 2:
+            return [fn(item) for item in items]
+        results: list = []
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="sweeper-io"
+        ) as pool:
+            for start in range(0, len(items), self.batch_size):
+                futures = [
+                    pool.submit(fn, item)
+                    for item in items[start : start + self.batch_size]
+                ]
+                for i, future in enumerate(futures):
+                    try:
+                        results.append(future.result())
+                    except BaseException:
+                        for pending in futures[i + 1 :]:
+                            pending.cancel()
+                        raise
+        return results
+
+    def map_grouped(self, fn: Callable, items: Iterable, key: Callable) -> list:
+        """Like map(), but items sharing ``key(item)`` run one after another
+
+        Used where operations on the same directory must not interleave
+        (target-exists checks, backup names), while different directories
+        proceed in parallel.
+        """
+        items = list(items)
+        groups: dict = {}
+        for index, item in enumerate(items):
+            groups.setdefault(key(item), []).append(index)
+
+        def run_group(indices: list[int]) -> list:
+            return [(index, fn(items[index])) for index in indices]
+
+        results: list = [None] * len(items)
+        for group_results in self.map(run_group, groups.values()):
+            for index, result in group_results:
+                results[index] = result
+        return results
@@ -43,9 +43,14 @@ class ReportSummary:
 class SweeperReportGenerator:
     """Configuration-driven comprehensive reporting"""
 
-    def __init__(self, config_path: str = "/config/hestia/config/system/hestia.toml"):
+    def __init__(
+        self,
+        config_path: str = "/config/hestia/config/system/hestia.toml",
+        config: dict | None = None,
+    ):
         self.config_path = Path(config_path)
-        self.config = self._load_config()
+        # in-process pipelines pass the already-parsed hestia.toml
+        self.config = config if config is not None else self._load_config()
 
         # Extract configuration sections first
         self.reporting_config = self.config["reporting"]
@@ -304,10 +309,13 @@ class SweeperReportGenerator:
 
         return recommendations
 
-    def generate_comprehensive_report(self, shared_log_path: str) -> dict:
-        """Generate final comprehensive sweeper report"""
+    def generate_comprehensive_report(
+        self, shared_log_path: str, shared_log: dict | None = None
+    ) -> dict:
+        """Generate final comprehensive sweeper report (from an in-memory shared log)"""
         # Load shared log data
-        shared_log = self.load_shared_log(shared_log_path)
+        if shared_log is None:
+            shared_log = self.load_shared_log(shared_log_path)
 
         # Extract component statistics
         component_stats = self.extract_component_statistics(shared_log)
@@ -18,6 +18,7 @@ import json
 import logging
 import shutil
 import sys
+import threading
 from collections import defaultdict
 from dataclasses import asdict, dataclass
 from datetime import UTC, datetime
@@ -26,6 +27,13 @@ from pathlib import Path
 import toml
 import yaml
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from sweeper_ops import (  # noqa: E402
+    FileOpPool,
+    calculate_checksum as shared_checksum,
+    open_checksum_cache,
+)
+
 
 @dataclass
 class VaultOperation:
@@ -48,9 +56,14 @@ class VaultOperation:
 class VaultRetentionManager:
     """Configuration-driven vault retention management"""
 
-    def __init__(self, config_path: str = "/config/hestia/config/system/hestia.toml"):
+    def __init__(
+        self,
+        config_path: str = "/config/hestia/config/system/hestia.toml",
+        config: dict | None = None,
+    ):
         self.config_path = Path(config_path)
-        self.config = self._load_config()
+        # in-process pipelines pass the already-parsed hestia.toml
+        self.config = config if config is not None else self._load_config()
 
         # Extract configuration sections first
         self.retention_config = self.config["retention"]
@@ -77,6 +90,11 @@ class VaultRetentionManager:
             "processing_duration_seconds": 0,
         }
 
+        # Shared I/O pool for per-file operations
+        self.io_pool = FileOpPool.from_config(self.sweeper_config)
+        self.checksums = open_checksum_cache(self.config)
+        self._stats_lock = threading.Lock()
+
     def _load_config(self) -> dict:
         """Load configuration from hestia.toml"""
         try:
@@ -100,6 +118,11 @@ class VaultRetentionManager:
         )
         self.logger = logging.getLogger("hestia.sweeper.vault")
 
+    def _count(self, key: str, amount: int = 1) -> None:
+        """Thread-safe statistics increment (per-file work runs on the I/O pool)"""
+        with self._stats_lock:
+            self.stats[key] += amount
+
     def load_file_index(self, index_file_path: str) -> dict:
         """Load file index from previous component run"""
         try:
@@ -168,14 +191,7 @@ class VaultRetentionManager:
 
     def calculate_checksum(self, file_path: Path) -> str:
         """Calculate SHA256 checksum of file"""
-        try:
-            hasher = hashlib.sha256()
-            with open(file_path, "rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    hasher.update(chunk)
-            return hasher.hexdigest()[:16]
-        except (OSError, PermissionError):
-            return "unavailable"
+        return shared_checksum(file_path, self.checksums)
 
     def create_backup(self, original_path: Path) -> str | None:
         """Create backup of original file before vault operation"""
@@ -252,7 +268,7 @@ class VaultRetentionManager:
                     operation.operation_type = "retain"
                     operation.status = "retained"
                     operation.destination = "vault_kept"
-                    self.stats["files_retained"] += 1
+                    self._count("files_retained")
                     self.logger.debug(f"Retaining {file_path.name} (rank {i + 1})")
                 else:
                     # Remove this file (exceeds retention limit)
@@ -267,20 +283,20 @@ class VaultRetentionManager:
                     if self.remove_vault_file(file_path):
                         operation.status = "removed"
                         operation.destination = "deleted"
-                        self.stats["files_removed"] += 1
-                        self.stats["bytes_freed"] += operation.size_bytes
+                        self._count("files_removed")
+                        self._count("bytes_freed", operation.size_bytes)
                         self.logger.info(
                             f"Removed excess vault file: {file_path.name} (rank {i + 1})"
                         )
                     else:
                         operation.status = "remove_failed"
                         operation.error_message = "Failed to remove file"
-                        self.stats["vault_integrity_issues"] += 1
+                        self._count("vault_integrity_issues")
 
             except Exception as e:
                 operation.status = "error"
                 operation.error_message = str(e)
-                self.stats["vault_integrity_issues"] += 1
+                self._count("vault_integrity_issues")
                 self.logger.error(f"Error managing {file_path}: {e}")
 
             operations.append(operation)
@@ -298,19 +314,27 @@ class VaultRetentionManager:
         group_count = len(self.basename_groups)
         self.logger.info(f"Processing vault retention for {group_count} basename groups")
 
-        for basename, file_group in self.basename_groups.items():
-            if dry_run:
+        if dry_run:
+            for basename, file_group in self.basename_groups.items():
                 sorted_files = self.sort_files_by_age(file_group)
                 files_to_remove = len(sorted_files) - self.keep_latest_count
                 if files_to_remove > 0:
                     self.logger.info(
                         f"Would remove {files_to_remove} files from group '{basename}'"
                     )
-                self.stats["files_processed"] += len(file_group)
-            else:
-                group_operations = self.manage_basename_group(basename, file_group)
+                self._count("files_processed", len(file_group))
+        else:
+            # Basename groups in parallel; each group is ranked and pruned in order
+            for group_operations in self.io_pool.map(
+                lambda group: self.manage_basename_group(*group),
+                list(self.basename_groups.items()),
+            ):
                 self.operations.extend(group_operations)
-                self.stats["files_processed"] += len(file_group)
+            self._count(
+                "files_processed", sum(len(g) for g in self.basename_groups.values())
+            )
+            if self.checksums is not None:
+                self.checksums.flush()
 
         self.stats["processing_duration_seconds"] = int(
             (datetime.now(UTC) - start_time).total_seconds()
@@ -436,6 +460,24 @@ class VaultRetentionManager:
         content = json.dumps([asdict(op) for op in self.operations], sort_keys=True)
         return hashlib.sha256(content.encode()).hexdigest()[:16]
 
+    def merge_into_shared_log(self, frontmatter: dict, data: dict) -> None:
+        """Add vault operation results to a parsed shared log (frontmatter + body)"""
+        data["vault_operations"] = {
+            "statistics": self.stats,
+            "operations_count": len(self.operations),
+            "basename_groups": len(self.basename_groups),
+            "bytes_freed": self.stats["bytes_freed"],
+            "processing_timestamp": datetime.now(UTC).isoformat(),
+        }
+
+        # Update frontmatter
+        frontmatter["rows_processed"] = frontmatter.get("rows_processed", 0) + len(
+            self.operations
+        )
+        frontmatter["content_hash"] = hashlib.sha256(
+            json.dumps(data, sort_keys=True).encode()
+        ).hexdigest()[:16]
+
     def update_shared_log(self, log_file_path: str) -> None:
         """Update shared log file with vault operation results"""
         try:
@@ -460,22 +502,7 @@ class VaultRetentionManager:
                     frontmatter = yaml.safe_load(frontmatter_content)
                     existing_data = json.loads(json_content)
 
-                    # Add vault operation results
-                    existing_data["vault_operations"] = {
-                        "statistics": self.stats,
-                        "operations_count": len(self.operations),
-                        "basename_groups": len(self.basename_groups),
-                        "bytes_freed": self.stats["bytes_freed"],
-                        "processing_timestamp": datetime.now(UTC).isoformat(),
-                    }
-
-                    # Update frontmatter
-                    frontmatter["rows_processed"] = frontmatter.get("rows_processed", 0) + len(
-                        self.operations
-                    )
-                    frontmatter["content_hash"] = hashlib.sha256(
-                        json.dumps(existing_data, sort_keys=True).encode()
-                    ).hexdigest()[:16]
+                    self.merge_into_shared_log(frontmatter, existing_data)
 
                     # Write updated log
                     with open(log_path, "w") as f:
@@ -1,17 +1,33 @@
 #!/usr/bin/env python3
 import argparse
+import base64
 import csv
+import datetime
+import hashlib
+import importlib.util
+import io
 import json
 import os
 import re
+import sqlite3
 import sys
 from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 
-from jsonschema import validate
 from ruamel.yaml import YAML
 from tabulate import tabulate
 
+# Cached compiled validators (hestia/tools/utils/reportkit/schema_registry.py)
+if importlib.util.find_spec("reportkit") is None:
+    sys.path.append(str(Path(__file__).resolve().parents[1]))
+from reportkit import yaml_bulk  # noqa: E402
+from reportkit.schema_registry import (  # noqa: E402
+    REGISTRY as SCHEMA_REGISTRY,
+    format_error as format_schema_error,
+)
+
 # --- CONSTANTS & NORMALIZATION MAPS ---
 EXCL_DIRS = re.compile(r"(?:^|/)(legacy|deprecated|cache|\\.git|\\.venv|\\.storage|backups|node_modules|\\.cloud|\\.idea|\\.vscode|__pycache__)(?:/|$)", re.I)
 EXCL_FILES = re.compile(r".*(_legacy|_deprecated|_cache|\\.disabled|\\.example)\\.ya?ml$", re.I)
@@ -45,6 +61,36 @@ def parse_args():
     parser.add_argument("--force", action="store_true")
     parser.add_argument("--apply-normalize", type=str, default="")
     parser.add_argument("--shadow-migration", action="store_true")
+    parser.add_argument(
+        "--cache",
+        type=str,
+        default="",
+        help="Parse cache path (default: <reports>/parse_cache.sqlite)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Parse every file, bypassing the parse cache",
+    )
+    parser.add_argument(
+        "--invalidate-cache",
+        action="store_true",
+        help="Drop all parse cache entries before running",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=0,
+        help="Parse cache misses over N processes (default 0: in-process); "
+        "results do not depend on it",
+    )
+    parser.add_argument(
+        "--loader",
+        choices=["ruamel", "libyaml"],
+        default="ruamel",
+        help="YAML parser: ruamel safe loader (YAML 1.2, default) or PyYAML/LibYAML "
+        "(YAML 1.1, as Home Assistant parses; faster)",
+    )
     return parser.parse_args()
 
 # --- ENVIRONMENT ASSERTIONS ---
@@ -55,12 +101,13 @@ def assert_env(args):
     if not schema_path.exists() or schema_path.stat().st_size < 1024:
         print(f"ERROR: Schema file {schema_path} missing or too small.")
         sys.exit(1)
-    yaml_files = [p for p in root.rglob("*.yaml") if p.is_file() and p.stat().st_size < MAX_FILE_SIZE]
+    if not reports_dir.exists():
+        reports_dir.mkdir(parents=True, exist_ok=True)
+    # one walk shared by every phase (see scanned_files)
+    yaml_files = [p for p in scanned_files(args) if p.suffix.lower() == ".yaml"]
     if len(yaml_files) <= 50:
         print(f"ERROR: Only {len(yaml_files)} YAML files found under {root}. Require > 50.")
         sys.exit(1)
-    if not reports_dir.exists():
-        reports_dir.mkdir(parents=True, exist_ok=True)
     return yaml_files
 
 # --- LOAD SCHEMA ---
@@ -110,42 +157,344 @@ def scan_yaml(args):
         for path, reason in sorted(skipped):
             logf.write(f"{path}\t{reason}\n")
 
+def scanned_files(args):
+    """scan_yaml() result, walked once per run and shared by all phases."""
+    if getattr(args, "_scanned", None) is None:
+        args._scanned = list(scan_yaml(args))
+    return args._scanned
+
+# --- PARSE CACHE ---
+# Bump when the table layout or the cached payload changes shape; stale caches are
+# dropped.
+PARSE_CACHE_VERSION = "4"
+
+def _cache_encode(node):
+    """
+    JSON form of a safe-loaded document. Mappings with non-string keys and the
+    YAML types JSON lacks (timestamps, sets, binary) become {"__t": kind, "v": ...}
+    so decoding restores them exactly; anything else raises TypeError.
+    """
+    if isinstance(node, dict):
+        if all(isinstance(k, str) for k in node) and "__t" not in node:
+            return {k: _cache_encode(v) for k, v in node.items()}
+        return {
+            "__t": "map",
+            "v": [[_cache_encode(k), _cache_encode(v)] for k, v in node.items()],
+        }
+    if isinstance(node, list):
+        return [_cache_encode(v) for v in node]
+    if node is None or isinstance(node, (str, bool, int, float)):
+        return node
+    if isinstance(node, datetime.datetime):
+        return {"__t": "datetime", "v": node.isoformat()}
+    if isinstance(node, datetime.date):
+        return {"__t": "date", "v": node.isoformat()}
+    if isinstance(node, (set, frozenset)):
+        return {"__t": "set", "v": [_cache_encode(v) for v in node]}
+    if isinstance(node, bytes):
+        return {"__t": "bytes", "v": base64.b64encode(node).decode("ascii")}
+    raise TypeError(f"not cacheable: {type(node).__name__}")
+
+def _cache_decode(node):
+    if isinstance(node, list):
+        return [_cache_decode(v) for v in node]
+    if not isinstance(node, dict):
+        return node
+    kind = node.get("__t")
+    if kind is None:
+        return {k: _cache_decode(v) for k, v in node.items()}
+    if kind == "map":
+        return {_hashable(_cache_decode(k)): _cache_decode(v) for k, v in node["v"]}
+    if kind == "datetime":
+        return datetime.datetime.fromisoformat(node["v"])
+    if kind == "date":
+        return datetime.date.fromisoformat(node["v"])
+    if kind == "set":
+        return {_hashable(_cache_decode(v)) for v in node["v"]}
+    if kind == "bytes":
+        return base64.b64decode(node["v"])
+    raise ValueError(f"unknown cache tag {kind!r}")
+
+def _hashable(key):
+    # complex YAML keys (sequences) come back as lists; the loaders produced tuples
+    return tuple(_hashable(k) for k in key) if isinstance(key, list) else key
+
+def parse_yaml_bytes(raw, loader="ruamel"):
+    """(ok, document) for raw file bytes; module level so pool workers can run it."""
+    try:
+        text = raw.decode("utf-8")
+        data = (
+            yaml_bulk.load_text(text)
+            if loader == "libyaml"
+            else YAML(typ="safe").load(text)
+        )
+    except Exception:
+        return (False, None)
+    return (True, data)
+
+class ParseCache:
+    """
+    Persistent cache of safe-loaded YAML documents, keyed by path and validated
+    by (size, mtime_ns), then by sha256 of the content when the stat changed
+    (touch, checkout). Unchanged files are never re-parsed, across phases and
+    across runs. Unparseable files are cached too, so they are not retried until
+    they change.
+
+    Documents are stored as JSON (see _cache_encode), never pickled, so a cache
+    file edited by someone else can at worst yield wrong documents, not run code.
+    Documents holding types JSON cannot represent are parsed but not persisted.
+
+    ``loader`` picks the parser: "ruamel" (safe, YAML 1.2; the default) or
+    "libyaml" (yaml_bulk's PyYAML CSafeLoader, YAML 1.1 like Home Assistant
+    itself). ``jobs`` only changes where misses are parsed: with ``jobs`` > 0
+    prefetch() parses them across a process pool with the same loader. Entries
+    remember which loader produced them and are only reused by the same loader.
+    """
+
+    def __init__(self, path, enabled=True, jobs=0, loader="ruamel"):
+        self.enabled = enabled
+        self.jobs = jobs
+        self.parser = loader
+        self.loader = (
+            f"pyyaml:{yaml_bulk.LOADER_NAME}" if loader == "libyaml" else "ruamel:safe"
+        )
+        self.stats = Counter()
+        self._memo = {}
+        self.db = None
+        if not enabled:
+            return
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(path))
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+        )
+        row = self.db.execute("SELECT value FROM meta WHERE key='version'").fetchone()
+        if not row or row[0] != PARSE_CACHE_VERSION:
+            self.db.execute("DROP TABLE IF EXISTS files")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, size INTEGER,"
+            " mtime_ns INTEGER, sha256 TEXT, loader TEXT, payload TEXT)"
+        )
+        if not row or row[0] != PARSE_CACHE_VERSION:
+            self.invalidate()
+
+    def invalidate(self):
+        self._memo.clear()
+        if self.db is None:
+            return 0
+        with self.db:
+            n = self.db.execute("DELETE FROM files").rowcount
+            self.db.execute(
+                "INSERT OR REPLACE INTO meta(key, value) VALUES('version', ?)",
+                (PARSE_CACHE_VERSION,),
+            )
+        return n
+
+    def _probe(self, key):
+        """(cached result, None), or (None, (stat, sha256, raw)) to parse the file."""
+        st = os.stat(key)
+        row = (
+            self.db.execute(
+                "SELECT size, mtime_ns, sha256, loader, payload"
+                " FROM files WHERE path=?",
+                (key,),
+            ).fetchone()
+            if self.db
+            else None
+        )
+        if row and row[3] != self.loader:
+            row = None
+        cached = self._decode(row[4]) if row else None
+        if cached is None:
+            row = None
+        if row and row[0] == st.st_size and row[1] == st.st_mtime_ns:
+            self.stats["hit"] += 1
+            return cached, None
+        with open(key, "rb") as f:
+            raw = f.read()
+        digest = hashlib.sha256(raw).hexdigest()
+        if row and row[2] == digest:
+            self.stats["rehash_hit"] += 1
+            self.db.execute(
+                "UPDATE files SET size=?, mtime_ns=? WHERE path=?",
+                (st.st_size, st.st_mtime_ns, key),
+            )
+            return cached, None
+        return None, (st, digest, raw)
+
+    def _store(self, key, pending, result):
+        self.stats["miss"] += 1
+        self._memo[key] = result
+        if self.db is not None:
+            st, digest, _ = pending
+            try:
+                payload = json.dumps([result[0], _cache_encode(result[1])])
+            except (TypeError, ValueError):
+                self.stats["uncacheable"] += 1
+                return
+            self.db.execute(
+                "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?)",
+                (key, st.st_size, st.st_mtime_ns, digest, self.loader, payload),
+            )
+
+    @staticmethod
+    def _decode(payload):
+        """(ok, document) from a stored payload; None if it does not decode."""
+        try:
+            ok, doc = json.loads(payload)
+            return (bool(ok), _cache_decode(doc))
+        except (TypeError, ValueError, KeyError):
+            return None
+
+    def load(self, file_path):
+        """(ok, document) for one YAML file."""
+        key = str(file_path)
+        if key in self._memo:
+            self.stats["memo"] += 1
+            return self._memo[key]
+        try:
+            result, pending = self._probe(key)
+        except OSError:
+            return (False, None)
+        if pending is not None:
+            result = parse_yaml_bytes(pending[2], self.parser)
+            self._store(key, pending, result)
+        self._memo[key] = result
+        return result
+
+    def prefetch(self, paths):
+        """Resolve ``paths`` up front, parsing misses over a process pool (jobs > 0)."""
+        if not self.jobs:
+            return
+        pending = {}
+        for p in paths:
+            key = str(p)
+            if key in self._memo or key in pending:
+                continue
+            try:
+                result, miss = self._probe(key)
+            except OSError:
+                continue
+            if miss is None:
+                self._memo[key] = result
+            else:
+                pending[key] = miss
+        if not pending:
+            return
+        keys = list(pending)
+        parse = partial(parse_yaml_bytes, loader=self.parser)
+        if self.jobs == 1 or len(keys) < 2:
+            for key in keys:
+                self._store(key, pending[key], parse(pending[key][2]))
+            return
+        with ProcessPoolExecutor(max_workers=min(self.jobs, len(keys))) as pool:
+            results = pool.map(parse, (pending[k][2] for k in keys),
+                               chunksize=max(1, len(keys) // (self.jobs * 4)))
+            for key, result in zip(keys, results, strict=True):
+                self._store(key, pending[key], result)
+
+    def summary(self):
+        lookups = self.stats["hit"] + self.stats["rehash_hit"] + self.stats["miss"]
+        rate = (
+            (self.stats["hit"] + self.stats["rehash_hit"]) / lookups if lookups else 0.0
+        )
+        return (
+            f"[cache] files={lookups} hits={self.stats['hit']} "
+            f"rehash_hits={self.stats['rehash_hit']} misses={self.stats['miss']} "
+            f"in_run_reuse={self.stats['memo']} hit_rate={rate:.1%}"
+        )
+
+    def close(self, live_paths=None):
+        """Commit; entries for files outside ``live_paths`` (deleted/excluded) go."""
+        if self.db is None:
+            return
+        with self.db:
+            if live_paths:
+                self.db.execute(
+                    "CREATE TEMP TABLE IF NOT EXISTS live (path TEXT PRIMARY KEY)"
+                )
+                self.db.executemany(
+                    "INSERT OR IGNORE INTO live VALUES (?)",
+                    ((str(p),) for p in live_paths),
+                )
+                self.db.execute(
+                    "DELETE FROM files WHERE path NOT IN (SELECT path FROM live)"
+                )
+        self.db.close()
+        self.db = None
+
+PARSE_CACHE = ParseCache(None, enabled=False)
+
 # --- ENTITY EXTRACTION ---
 def extract_entities(files_iter, schema):
-    yaml = YAML(typ="safe")
+    """Stream (entity, file_path, json_pointer) for every entity in ``files_iter``."""
     for file_path in files_iter:
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                data = yaml.load(f)
-        except Exception:
+        ok, doc = PARSE_CACHE.load(file_path)
+        if ok:
+            yield from walk_entities(doc, str(file_path))
+
+def walk_entities(yaml_obj, file_path):
+    """
+    Yield (entity, file_path, json_pointer) for each mapping carrying _meta or
+    attributes, in document order (parent before children). Iterative with an
+    explicit stack, so nesting depth costs neither recursion nor list copies.
+    """
+    stack = [(yaml_obj, "")]
+    while stack:
+        node, pointer = stack.pop()
+        if isinstance(node, dict):
+            if "_meta" in node or "attributes" in node:
+                yield node, file_path, pointer
+            children = [(v, f"{pointer}/{escape_pointer(k)}") for k, v in node.items()]
+        elif isinstance(node, list):
+            children = [(v, f"{pointer}/{i}") for i, v in enumerate(node)]
+        else:
             continue
-        for ent, fpath in _extract_entities(data, str(file_path)):
-            yield ent, fpath
-
-def _extract_entities(yaml_obj, file_path):
-    entities = []
-    if isinstance(yaml_obj, dict):
-        if "_meta" in yaml_obj or "attributes" in yaml_obj:
-            entities.append((yaml_obj, file_path))
-        for v in yaml_obj.values():
-            entities.extend(_extract_entities(v, file_path))
-    elif isinstance(yaml_obj, list):
-        for item in yaml_obj:
-            entities.extend(_extract_entities(item, file_path))
-    return entities
+        stack.extend(reversed(children))
+
+def escape_pointer(token):
+    """RFC 6901 reference token for a mapping key."""
+    return str(token).replace("~", "~0").replace("/", "~1")
+
+def resolve_pointer(doc, pointer):
+    """
+    Node at ``pointer`` (as yielded by walk_entities) in ``doc``; raises
+    KeyError/IndexError if absent.
+    """
+    node = doc
+    for token in pointer.split("/")[1:]:
+        token = token.replace("~1", "/").replace("~0", "~")
+        if isinstance(node, list):
+            node = node[int(token)]
+        elif token in node:
+            node = node[token]
+        else:
+            # non-string keys (ints, bools) are stringified in the pointer
+            matches = [v for k, v in node.items() if str(k) == token]
+            if not matches:
+                raise KeyError(token)
+            node = matches[0]
+    return node
 
 # --- NORMALIZATION (unchanged) ---
-def normalize_entity(meta, file_path, entity_id, norm_flags, norm_changes):
+def normalize_entity(meta, file_path, entity_id, norm_flags, norm_changes, pointer=""):
+    """
+    Apply the --apply-normalize fixes to ``meta``; each change is recorded as
+    (file_path, json_pointer, change) where ``pointer`` locates the surface.
+    """
+    def note(key, change):
+        norm_changes.append((file_path, f"{pointer}/{escape_pointer(key)}", change))
+
     changed = False
     # file
     if "file" not in meta and "file" in norm_flags:
         meta["file"] = str(file_path)
-        norm_changes.append((file_path, "file"))
+        note("file", "file")
         changed = True
     # canonical_id
     if "canonical_id" not in meta and entity_id and "canonical_id" in norm_flags:
         meta["canonical_id"] = entity_id
-        norm_changes.append((file_path, "canonical_id"))
+        note("canonical_id", "canonical_id")
         changed = True
     # lists
     if "lists" in norm_flags:
@@ -156,7 +505,7 @@ def normalize_entity(meta, file_path, entity_id, norm_flags, norm_changes):
                     parsed = json.loads(v)
                     if isinstance(parsed, list):
                         meta[k] = parsed
-                        norm_changes.append((file_path, f"list:{k}"))
+                        note(k, f"list:{k}")
                         changed = True
                 except Exception:
                     pass
@@ -165,7 +514,7 @@ def normalize_entity(meta, file_path, entity_id, norm_flags, norm_changes):
         for k in ("module", "role", "type"):
             if k in meta and meta[k] in ENUM_NORMALIZE.get(k, {}):
                 meta[k] = ENUM_NORMALIZE[k][meta[k]]
-                norm_changes.append((file_path, k))
+                note(k, k)
                 changed = True
     return meta, changed
 
@@ -199,28 +548,120 @@ def write_report(path, content):
     with open(path, "w", encoding="utf-8") as f:
         f.write(content)
 
+def render_csv(rows, headers):
+    buf = io.StringIO(newline="")
+    writer = csv.DictWriter(buf, fieldnames=headers)
+    writer.writeheader()
+    for row in rows:
+        writer.writerow({k: row.get(k, "") for k in headers})
+    return buf.getvalue()
+
 def write_csv(path, rows, headers):
     Path(path).parent.mkdir(parents=True, exist_ok=True)
     with open(path, "w", newline='', encoding="utf-8") as csvf:
-        writer = csv.DictWriter(csvf, fieldnames=headers)
-        writer.writeheader()
-        for row in rows:
-            writer.writerow({k: row.get(k, "") for k in headers})
+        csvf.write(render_csv(rows, headers))
+
+# --- PHASE ENGINE ---
+class Table:
+    """
+    Column-oriented table of CSV cells ({column: [str, ...]}, rows aligned by
+    index). Holds exactly what a phase would read back from the artifact with
+    csv.DictReader, so passes over it behave the same as passes over the file.
+    """
+
+    def __init__(self, fieldnames, columns, nrows):
+        self.fieldnames = list(fieldnames)
+        self.columns = columns
+        self.nrows = nrows
+
+    @classmethod
+    def from_rows(cls, rows, fieldnames):
+        columns = {
+            f: ["" if r.get(f, "") is None else str(r.get(f, "")) for r in rows]
+            for f in fieldnames
+        }
+        return cls(fieldnames, columns, len(rows))
+
+    @classmethod
+    def read_csv(cls, path):
+        with open(path, newline='', encoding="utf-8") as csvf:
+            reader = csv.reader(csvf)
+            fieldnames = next(reader, [])
+            cells = list(reader)
+        columns = {
+            f: [r[i] if i < len(r) else "" for r in cells]
+            for i, f in enumerate(fieldnames)
+        }
+        return cls(fieldnames, columns, len(cells))
+
+    def __len__(self):
+        return self.nrows
+
+    def col(self, name):
+        return self.columns.get(name) or [""] * self.nrows
+
+class PhaseRun:
+    """
+    One validate_metadata run: files are scanned and parsed once and shared, phases
+    exchange tables in memory instead of through inventory.csv/b1_proposals.csv,
+    and every artifact is rendered to memory and written by flush() at the end.
+    Tables not produced in this run fall back to the artifact on disk, so single
+    phases still chain across invocations.
+    """
+
+    def __init__(self, args, schema, tier_rules):
+        self.args = args
+        self.schema = schema
+        self.tier_rules = tier_rules
+        self.reports = Path(args.reports)
+        self.artifacts = {}
+        self.tables = {}
+
+    def entities(self):
+        """Stream (entity, file_path, json_pointer) from the parse cache memo."""
+        return extract_entities(scanned_files(self.args), self.schema)
+
+    def emit_report(self, path, content):
+        self.artifacts[Path(path)] = (content, None)
+        return content
+
+    def emit_csv(self, path, rows, headers, table=None):
+        text = render_csv(rows, headers)
+        self.artifacts[Path(path)] = (text, "")
+        if table:
+            self.tables[table] = Table.from_rows(rows, headers)
+        return text
+
+    def table(self, name):
+        if name not in self.tables:
+            path = self.reports / f"{name}.csv"
+            self.tables[name] = Table.read_csv(path) if path.exists() else None
+        return self.tables[name]
+
+    def frame(self, name):
+        """pandas view of an artifact (from the in-memory CSV if this run wrote it)."""
+        import pandas as pd
+        path = self.reports / f"{name}.csv"
+        if path in self.artifacts:
+            return pd.read_csv(io.StringIO(self.artifacts[path][0]))
+        return pd.read_csv(path) if path.exists() else pd.DataFrame()
+
+    def flush(self):
+        for path, (content, newline) in self.artifacts.items():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "w", newline=newline, encoding="utf-8") as f:
+                f.write(content)
+        self.artifacts.clear()
 
 # --- PHASES ---
-def phase_a(args, schema, tier_rules):
+def phase_a(run):
+    schema, tier_rules = run.schema, run.tier_rules
     inventory = []
-    norm_changes = []
-    key_counter = Counter()
-    enum_drift = defaultdict(lambda: defaultdict(list))
-    naming_violations = []
-    orphaned = []
-    files_iter = list(scan_yaml(args))
+    files_iter = scanned_files(run.args)
     entity_count = 0
-    for ent, fpath in extract_entities(files_iter, schema):
+    for ent, fpath, _ in run.entities():
         meta_raw = ent.get("_meta") or ent.get("attributes")
         meta = dict(meta_raw) if meta_raw else {}
-        entity_id = meta.get("entity_id") or meta.get("canonical_id")
         valid, errors = validate_entity(meta, fpath, schema, tier_rules)
         row = {"entity_id": meta.get("canonical_id", ""), "file_path": fpath, **meta, "validation_errors": "; ".join(errors)}
         inventory.append(row)
@@ -231,21 +672,29 @@ def phase_a(args, schema, tier_rules):
     for row in inventory:
         all_fields.update(row.keys())
     fieldnames = sorted(all_fields)
-    write_csv(Path(args.reports) / "inventory.csv", inventory, fieldnames)
+    inv_text = run.emit_csv(
+        run.reports / "inventory.csv", inventory, fieldnames, table="inventory"
+    )
     # Markdown
     def section(title, rows):
         return f"\n## {title}\n\n" + (tabulate([list(r.values()) for r in rows], headers=rows[0].keys(), tablefmt="github") if rows else "_None found._")
-    md_path = Path(args.reports) / "inventory.md"
-    write_report(md_path, "# HESTIA Metadata Inventory\n" + section("Entities with full valid metadata", []) + section("Entities with partial/missing metadata", []) + section("Entities with invalid metadata", inventory))
+    md = run.emit_report(
+        run.reports / "inventory.md",
+        "# HESTIA Metadata Inventory\n"
+        + section("Entities with full valid metadata", [])
+        + section("Entities with partial/missing metadata", [])
+        + section("Entities with invalid metadata", inventory),
+    )
     # Acceptance
-    inv_lines = sum(1 for _ in open(Path(args.reports) / "inventory.csv", encoding="utf-8"))
-    md_size = os.stat(md_path).st_size
+    inv_lines = sum(1 for _ in io.StringIO(inv_text, newline=None))
+    md_size = len(md.encode("utf-8"))
     print(f"[Phase A] YAML scanned: {len(files_iter)} | Entities: {entity_count}")
     if inv_lines <= 1 or md_size <= 200:
         print(f"Phase A output insufficient. CSV lines: {inv_lines}, MD size: {md_size}")
         sys.exit(1)
 
-def phase_b(args, schema, tier_rules):
+def phase_b(run):
+    args, schema, tier_rules = run.args, run.schema, run.tier_rules
     norm_flags = set(args.apply_normalize.split(",")) if args.apply_normalize else set()
     norm_changes = []
     key_counter = Counter()
@@ -253,12 +702,15 @@ def phase_b(args, schema, tier_rules):
     naming_violations = []
     orphaned = []
     inventory = []
-    files_iter = list(scan_yaml(args))
-    for ent, fpath in extract_entities(files_iter, schema):
-        meta_raw = ent.get("_meta") or ent.get("attributes")
+    for ent, fpath, pointer in run.entities():
+        surfkey = "_meta" if ent.get("_meta") else "attributes"
+        meta_raw = ent.get(surfkey)
         meta = dict(meta_raw) if meta_raw else {}
         entity_id = meta.get("entity_id") or meta.get("canonical_id")
-        meta, changed = normalize_entity(meta, fpath, entity_id, norm_flags, norm_changes)
+        meta, changed = normalize_entity(
+            meta, fpath, entity_id, norm_flags, norm_changes,
+            f"{pointer}/{surfkey}",
+        )
         for k in meta:
             key_counter[k] += 1
         for k in ["module", "role", "type", "subsystem", "tier"]:
@@ -276,50 +728,120 @@ def phase_b(args, schema, tier_rules):
     # Write normalization_changes.md
     if norm_changes:
         norm_changes.sort()
-        write_report(Path(args.reports) / "normalization_changes.md", "# Normalization Changes (minimal safe apply)\n\n" + tabulate(norm_changes, headers=["file_path", "change"], tablefmt="github"))
+        run.emit_report(
+            run.reports / "normalization_changes.md",
+            "# Normalization Changes (minimal safe apply)\n\n"
+            + tabulate(
+                norm_changes,
+                headers=["file_path", "json_pointer", "change"],
+                tablefmt="github",
+            ),
+        )
     # Write schema_gap_report.md
-    write_report(Path(args.reports) / "schema_gap_report.md", "# Schema Gap Report\n\n## Key Frequency Table\n\n" + tabulate(sorted(key_counter.items()), headers=["key", "count"], tablefmt="github") + "\n\n## Enum Drift\n\n" + "\n".join([f"### {k}\n\n" + "\n".join([f"- {val}: {len(ids)} examples (e.g., {ids[:3]})" for val, ids in v.items()]) for k, v in enum_drift.items() if v]) + "\n## Naming Violations\n\n" + (tabulate(naming_violations, headers=["entity_id/file", "field", "offending_value"], tablefmt="github") if naming_violations else "_None found._\n"))
+    run.emit_report(
+        run.reports / "schema_gap_report.md",
+        "# Schema Gap Report\n\n## Key Frequency Table\n\n"
+        + tabulate(
+            sorted(key_counter.items()), headers=["key", "count"], tablefmt="github"
+        )
+        + "\n\n## Enum Drift\n\n"
+        + "\n".join(
+            [
+                f"### {k}\n\n"
+                + "\n".join(
+                    [
+                        f"- {val}: {len(ids)} examples (e.g., {ids[:3]})"
+                        for val, ids in v.items()
+                    ]
+                )
+                for k, v in enum_drift.items()
+                if v
+            ]
+        )
+        + "\n## Naming Violations\n\n"
+        + (
+            tabulate(
+                naming_violations,
+                headers=["entity_id/file", "field", "offending_value"],
+                tablefmt="github",
+            )
+            if naming_violations
+            else "_None found._\n"
+        ),
+    )
     # Write orphaned_entities.md
     if orphaned:
         orphaned.sort()
-        write_report(Path(args.reports) / "orphaned_entities.md", "# Orphaned Entities\n\n" + tabulate(orphaned, headers=["file_path", "domain", "tier"], tablefmt="github"))
+        run.emit_report(
+            run.reports / "orphaned_entities.md",
+            "# Orphaned Entities\n\n"
+            + tabulate(
+                orphaned, headers=["file_path", "domain", "tier"], tablefmt="github"
+            ),
+        )
     # Write inventory.csv and inventory.md as before
     inventory.sort(key=lambda r: (r.get("entity_id", ""), r.get("file_path", "")))
     all_fields = set()
     for row in inventory:
         all_fields.update(row.keys())
     fieldnames = sorted(all_fields)
-    write_csv(Path(args.reports) / "inventory.csv", inventory, fieldnames)
+    run.emit_csv(
+        run.reports / "inventory.csv", inventory, fieldnames, table="inventory"
+    )
     def section(title, rows):
         return f"\n## {title}\n\n" + (tabulate([list(r.values()) for r in rows], headers=rows[0].keys(), tablefmt="github") if rows else "_None found._")
-    write_report(Path(args.reports) / "inventory.md", "# HESTIA Metadata Inventory\n" + section("Entities with full valid metadata", []) + section("Entities with partial/missing metadata", []) + section("Entities with invalid metadata", inventory))
+    run.emit_report(
+        run.reports / "inventory.md",
+        "# HESTIA Metadata Inventory\n"
+        + section("Entities with full valid metadata", [])
+        + section("Entities with partial/missing metadata", [])
+        + section("Entities with invalid metadata", inventory),
+    )
 
 
-def phase_b1(args, schema, tier_rules):
-    inv_path = Path(args.reports) / "inventory.csv"
-    if not inv_path.exists():
+def phase_b1(run):
+    schema = run.schema
+    inv = run.table("inventory")
+    if inv is None:
         print("ERROR: inventory.csv not found. Run Phase B first.")
         sys.exit(1)
-    with open(inv_path, newline='', encoding="utf-8") as csvf:
-        reader = list(csv.DictReader(csvf))
+    entity_ids, file_paths, tiers = (
+        inv.col("entity_id"),
+        inv.col("file_path"),
+        inv.col("tier"),
+    )
     canonical_id_map = defaultdict(list)
     b1_rows = []
-    for row in reader:
-        cid = row.get("canonical_id", "")
+    for i, cid in enumerate(inv.col("canonical_id")):
         if cid:
-            canonical_id_map[cid].append(row)
-    for row in reader:
-        entity_id = row.get("entity_id", "")
-        file_path = row.get("file_path", "")
-        tier = row.get("tier", "")
-        upstream_sources = row.get("upstream_sources", "")
+            canonical_id_map[cid].append(i)
+    for (
+        entity_id,
+        file_path,
+        tier,
+        upstream_sources,
+        device_class,
+        state_class,
+        alpha_source,
+        source_entity,
+        formula_type,
+    ) in zip(
+        entity_ids,
+        file_paths,
+        tiers,
+        inv.col("upstream_sources"),
+        inv.col("device_class"),
+        inv.col("state_class"),
+        inv.col("alpha_source"),
+        inv.col("source_entity"),
+        inv.col("formula_type"),
+        strict=True,
+    ):
         try:
             upstream_list = json.loads(upstream_sources) if upstream_sources and upstream_sources.startswith("[") else []
         except Exception:
             upstream_list = []
-        device_class = row.get("device_class", "")
-        state_class = row.get("state_class", "")
-        if tier == "β" and not row.get("alpha_source"):
+        if tier == "β" and not alpha_source:
             rationale = ""
             proposed = ""
             if len(upstream_list) == 1:
@@ -333,87 +855,311 @@ def phase_b1(args, schema, tier_rules):
                 rationale = "No upstream_sources"
             b1_rows.append({"entity_id": entity_id, "file_path": file_path, "tier": tier, "proposal_type": "beta_alpha_source", "proposed": proposed, "rationale": rationale})
         if tier == "γ":
-            if not row.get("source_entity") and len(upstream_list) == 1:
+            if not source_entity and len(upstream_list) == 1:
                 b1_rows.append({"entity_id": entity_id, "file_path": file_path, "tier": tier, "proposal_type": "gamma_source_entity", "proposed": upstream_list[0], "rationale": "Single upstream, deterministic"})
-            if not row.get("formula_type"):
+            if not formula_type:
                 b1_rows.append({"entity_id": entity_id, "file_path": file_path, "tier": tier, "proposal_type": "gamma_formula_type", "proposed": "", "rationale": "Missing formula_type, manual author input required"})
         if state_class in {"measurement", "total", "total_increasing"}:
             uom = UOM_MAP.get(device_class, "no deterministic UoM")
             b1_rows.append({"entity_id": entity_id, "file_path": file_path, "tier": tier, "proposal_type": "uom_proposal", "proposed": uom, "rationale": f"device_class: {device_class}"})
-    for cid, rows in canonical_id_map.items():
-        if len(rows) > 1:
-            b1_rows.append({"entity_id": cid, "file_path": ", ".join([r["file_path"] for r in rows]), "tier": ", ".join(set(r["tier"] for r in rows)), "proposal_type": "canonical_id_collision", "proposed": ", ".join([r.get("entity_id","") for r in rows]), "rationale": "Duplicate canonical_id, propose suffixing _1, _2, ..."})
-    for row in reader:
-        for k in ["module", "role", "type", "subsystem", "tier"]:
-            val = row.get(k, "")
-            if val and k in schema and "enum" in schema[k] and val not in schema[k]["enum"]:
-                b1_rows.append({"entity_id": row.get("entity_id", ""), "file_path": row.get("file_path", ""), "tier": row.get("tier", ""), "proposal_type": f"enum_drift_{k}", "proposed": val, "rationale": "Unknown enum value, recommend normalization or schema expansion"})
-    for row in reader:
-        for k in ["area_id", "subarea_id", "container_id"]:
-            val = row.get(k, "")
-            if val and not NAMING_RE.match(str(val)):
+    for cid, idx in canonical_id_map.items():
+        if len(idx) > 1:
+            b1_rows.append(
+                {
+                    "entity_id": cid,
+                    "file_path": ", ".join([file_paths[i] for i in idx]),
+                    "tier": ", ".join(set(tiers[i] for i in idx)),
+                    "proposal_type": "canonical_id_collision",
+                    "proposed": ", ".join([entity_ids[i] for i in idx]),
+                    "rationale": (
+                        "Duplicate canonical_id, propose suffixing _1, _2, ..."
+                    ),
+                }
+            )
+    enum_cols = [
+        (k, inv.col(k))
+        for k in ["module", "role", "type", "subsystem", "tier"]
+        if k in schema and "enum" in schema[k]
+    ]
+    for i in range(len(inv)):
+        for k, values in enum_cols:
+            val = values[i]
+            if val and val not in schema[k]["enum"]:
+                b1_rows.append(
+                    {
+                        "entity_id": entity_ids[i],
+                        "file_path": file_paths[i],
+                        "tier": tiers[i],
+                        "proposal_type": f"enum_drift_{k}",
+                        "proposed": val,
+                        "rationale": "Unknown enum value, recommend "
+                        "normalization or schema expansion",
+                    }
+                )
+    naming_cols = [(k, inv.col(k)) for k in ["area_id", "subarea_id", "container_id"]]
+    for i in range(len(inv)):
+        for k, values in naming_cols:
+            val = values[i]
+            if val and not NAMING_RE.match(val):
                 suggested = re.sub(r"[^a-z0-9]+", "_", val.lower())
-                b1_rows.append({"entity_id": row.get("entity_id", ""), "file_path": row.get("file_path", ""), "tier": row.get("tier", ""), "proposal_type": f"naming_violation_{k}", "proposed": suggested, "rationale": f"Regex violation: {val}"})
+                b1_rows.append(
+                    {
+                        "entity_id": entity_ids[i],
+                        "file_path": file_paths[i],
+                        "tier": tiers[i],
+                        "proposal_type": f"naming_violation_{k}",
+                        "proposed": suggested,
+                        "rationale": f"Regex violation: {val}",
+                    }
+                )
     b1_rows.sort(key=lambda r: (r.get("entity_id", ""), r.get("file_path", "")))
     fieldnames = ["entity_id", "file_path", "tier", "proposal_type", "proposed", "rationale"]
-    write_csv(Path(args.reports) / "b1_proposals.csv", b1_rows, fieldnames)
-    write_report(Path(args.reports) / "b1_proposals.md", "# Phase B.1 Proposals\n\n" + tabulate(b1_rows, headers="keys", tablefmt="github"))
-    print(f"Phase B.1 proposals written to {Path(args.reports) / 'b1_proposals.csv'} and {Path(args.reports) / 'b1_proposals.md'}")
-
-def phase_c(args, schema, tier_rules):
-    from collections import defaultdict
+    run.emit_csv(
+        run.reports / "b1_proposals.csv", b1_rows, fieldnames, table="b1_proposals"
+    )
+    run.emit_report(
+        run.reports / "b1_proposals.md",
+        "# Phase B.1 Proposals\n\n"
+        + tabulate(b1_rows, headers="keys", tablefmt="github"),
+    )
+    print(
+        f"Phase B.1 proposals written to {run.reports / 'b1_proposals.csv'} "
+        f"and {run.reports / 'b1_proposals.md'}"
+    )
 
+def plan_phase_c(inv, b1):
+    """
+    Phase C planner on whole columns of the inventory / B.1 frames: priority
+    from str.contains masks over the ';'-separated violations, collisions via
+    groupby, naming via a vectorized NAMING_RE match. Same result as the
+    row-at-a-time reference in bench_phase_c.py on the frames' records.
+    """
+    import numpy as np
     import pandas as pd
-    reports_dir = Path(args.reports)
-    # Load prior artifacts
-    inv_path = reports_dir / "inventory.csv"
-    b1_path = reports_dir / "b1_proposals.csv"
-    norm_path = reports_dir / "normalization_changes.md"
-    orphan_path = reports_dir / "orphaned_entities.md"
-    gap_path = reports_dir / "schema_gap_report.md"
-    # Load inventory
-    inv = pd.read_csv(inv_path) if inv_path.exists() else pd.DataFrame()
-    b1 = pd.read_csv(b1_path) if b1_path.exists() else pd.DataFrame()
+
+    def col(df, name):
+        return (
+            df[name]
+            if name in df.columns
+            else pd.Series([""] * len(df), index=df.index, dtype=object)
+        )
+
+    def text(s):
+        # str() of every cell (NaN -> "nan"), as the f-strings/str() in the row loop
+        return s.map(str).astype(object)
+
+    def per_unique(s, fn):
+        # string work runs once per distinct value and is broadcast back by code
+        codes, uniques = pd.factorize(s, use_na_sentinel=False)
+        return pd.Series(
+            np.asarray(fn(pd.Series(uniques, dtype=object)), dtype=object)[codes],
+            index=s.index,
+        )
+
+    def records(df):
+        cols = list(df.columns)
+        return [
+            dict(zip(cols, t, strict=True))
+            for t in zip(*(df[c].to_numpy(dtype=object) for c in cols), strict=True)
+        ]
+
     # --- 1. Priority fix plan ---
-    fix_rows = []
-    for _, row in inv.iterrows():
-        violations = [v.strip() for v in str(row.get("validation_errors", "")).split(";") if v.strip()]
-        tier = row.get("tier", "")
-        entity_id = row.get("entity_id", "")
-        file_path = row.get("file_path", "")
-        # Priority assignment
-        priority = "P2"
-        if tier in {"ε", "ζ"} or any("Tier " in v and ("ε" in v or "ζ" in v) for v in violations):
-            priority = "P0"
-        elif tier in {"γ", "β"} or any("Tier " in v and ("γ" in v or "β" in v) for v in violations):
-            priority = "P1"
-        elif any("Missing required field" in v for v in violations):
-            priority = "P0"
-        elif any("enum" in v for v in violations):
-            priority = "P1"
-        fix_rows.append({
-            "entity_id": entity_id,
-            "file_path": file_path,
+    # violations: split on ';', strip, drop empties -> segments joined by \x00
+    def segments(u):
+        return (
+            text(u)
+            .str.replace(r"^[\s;]+|[\s;]+$", "", regex=True)
+            .str.replace(r"\s*;[\s;]*", "\x00", regex=True)
+        )
+
+    def classify(u):
+        segs = segments(u)
+        p0 = segs.str.contains(r"Tier [^\x00]*[εζ]|[εζ][^\x00]*Tier ", regex=True)
+        p1 = segs.str.contains(r"Tier [^\x00]*[γβ]|[γβ][^\x00]*Tier ", regex=True)
+        missing = segs.str.contains("Missing required field", regex=False)
+        enum = segs.str.contains("enum", regex=False)
+        # bit flags: 1 tier ε/ζ, 2 tier γ/β, 4 missing required, 8 enum
+        return (
+            p0.astype(int)
+            | p1.astype(int) * 2
+            | missing.astype(int) * 4
+            | enum.astype(int) * 8
+        )
+
+    def summarize(u):
+        segs = segments(u)
+        summary = segs.str.split("\x00", n=2).str[:2].str.join("; ")
+        return summary.where(segs != "", "review")
+
+    ve = col(inv, "validation_errors")
+    flags = per_unique(ve, classify).astype(int)
+    tier = col(inv, "tier")
+    p0 = tier.isin(["ε", "ζ"]) | (flags & 1).astype(bool)
+    p1 = tier.isin(["γ", "β"]) | (flags & 2).astype(bool)
+    priority = np.select(
+        [p0, p1, (flags & 4).astype(bool), (flags & 8).astype(bool)],
+        ["P0", "P1", "P0", "P1"],
+        "P2",
+    )
+    fix = pd.DataFrame(
+        {
+            "entity_id": col(inv, "entity_id"),
+            "file_path": col(inv, "file_path"),
             "tier": tier,
-            "violations[]": ", ".join(violations),
-            "proposed_fix_summary": "; ".join(violations[:2]) if violations else "review",
-            "priority": priority
-        })
-    fix_rows.sort(key=lambda r: (r["priority"], str(r["entity_id"]), str(r["file_path"])))
-    fieldnames = ["entity_id", "file_path", "tier", "violations[]", "proposed_fix_summary", "priority"]
-    write_csv(reports_dir / "phase_c_fixplan.csv", fix_rows, fieldnames)
-    write_report(reports_dir / "phase_c_fixplan.md", "# Phase C: Remediation Plan\n\n" + tabulate(fix_rows, headers="keys", tablefmt="github"))
+            "violations[]": per_unique(
+                ve, lambda u: segments(u).str.replace("\x00", ", ", regex=False)
+            ),
+            "proposed_fix_summary": per_unique(ve, summarize),
+            "priority": priority,
+        }
+    )
+    # stable sort on (priority, str(entity_id), str(file_path)) via rank codes
+    ranks = [
+        pd.factorize(k, sort=True)[0]
+        for k in (
+            per_unique(fix["file_path"], text),
+            per_unique(fix["entity_id"], text),
+            fix["priority"],
+        )
+    ]
+    fix_rows = records(fix.iloc[np.lexsort(ranks)])
+
+    # --- 2. Enum normalization map / 4. dry-run diffs ---
+    if len(b1) and "proposal_type" in b1.columns:
+        ptype = b1["proposal_type"]
+        proposed = col(b1, "proposed")
+        fp_text, prop_text = text(col(b1, "file_path")), text(proposed)
+        is_enum = ptype.str.startswith("enum_drift_").fillna(False).astype(bool)
+        truthy = proposed.astype(object).astype(bool)
+        masks = {
+            "beta": (ptype == "beta_alpha_source").fillna(False).astype(bool) & truthy,
+            "gamma": (ptype == "gamma_source_entity").fillna(False).astype(bool)
+            & truthy,
+            "uom": (ptype == "uom_proposal").fillna(False).astype(bool) & truthy,
+        }
+        drift = pd.DataFrame(
+            {
+                "k": ptype[is_enum].str.replace("enum_drift_", "", regex=False),
+                "v": prop_text[is_enum],
+                "e": text(col(b1, "entity_id"))[is_enum],
+                "f": fp_text[is_enum],
+            }
+        )
+        groups = {
+            k: g
+            for k, g in drift.sort_values(["v", "e", "f"], kind="stable").groupby(
+                "k", sort=False
+            )
+        }
+        enum_groups = [
+            (k, list(zip(groups[k]["v"], groups[k]["e"], groups[k]["f"], strict=True)))
+            for k in pd.unique(drift["k"])
+        ]
+        verbs = {
+            "beta": "alpha_source",
+            "gamma": "source_entity",
+            "uom": "unit_of_measurement",
+        }
+        dryrun = {
+            "enum": (
+                "- "
+                + fp_text[is_enum]
+                + ": "
+                + text(ptype[is_enum])
+                + " → "
+                + prop_text[is_enum]
+            ).tolist()
+        }
+        for name, m in masks.items():
+            dryrun[name] = (
+                "- " + fp_text[m] + f": set {verbs[name]} = " + prop_text[m]
+            ).tolist()
+        affected = is_enum | masks["beta"] | masks["gamma"] | masks["uom"]
+        dryrun["files_affected"] = len(set(col(b1, "file_path")[affected].tolist()))
+    else:
+        enum_groups = []
+        dryrun = {"enum": [], "beta": [], "gamma": [], "uom": [], "files_affected": 0}
+
+    # --- 5. Collision & naming guard ---
+    cid = col(inv, "canonical_id")
+    has_cid = cid.astype(object).astype(bool)
+    # the row loop keyed a dict by cell value: object NaNs share one key,
+    # float-column NaNs do not
+    shared_nan = not pd.api.types.is_float_dtype(cid)
+    cand = pd.DataFrame({"c": cid[has_cid], "f": col(inv, "file_path")[has_cid]})
+    if not shared_nan:
+        cand = cand[cand["c"].notna()]
+    dup = cand[cand["c"].duplicated(keep=False)]
+    # groupby-style split without per-group frames: stable sort by first-appearance code
+    codes, cids = pd.factorize(dup["c"], use_na_sentinel=False)
+    files = dup["f"].to_numpy(dtype=object)[np.argsort(codes, kind="stable")]
+    bounds = np.cumsum(np.bincount(codes, minlength=len(cids)))[:-1]
+    collisions = [
+        f"- {c}: {list(fs)}"
+        for c, fs in zip(cids, np.split(files, bounds), strict=True)
+    ]
+    eid_text, fp_text = (
+        per_unique(col(inv, "entity_id"), text),
+        per_unique(col(inv, "file_path"), text),
+    )
+    hits = []
+    for pos, k in enumerate(["area_id", "subarea_id", "container_id"]):
+        if k not in inv.columns:
+            continue
+        val = per_unique(inv[k], text)
+        bad = per_unique(
+            inv[k],
+            lambda u: (text(u) != "") & ~text(u).str.match(NAMING_RE).astype(bool),
+        ).astype(bool)
+        lines = (
+            f"- {k}: "
+            + val[bad]
+            + " (entity_id: "
+            + eid_text[bad]
+            + ", file: "
+            + fp_text[bad]
+            + ")"
+        )
+        hits.append(pd.DataFrame({"row": lines.index, "k": pos, "line": lines.values}))
+    naming = (
+        pd.concat(hits).sort_values(["row", "k"], kind="stable")["line"].tolist()
+        if hits
+        else []
+    )
+    return {
+        "fix_rows": fix_rows,
+        "enum_groups": enum_groups,
+        "dryrun": dryrun,
+        "collisions": collisions,
+        "naming": naming,
+    }
+
+def phase_c(run):
+    reports_dir = run.reports
+    # Load prior artifacts (in memory when this run produced them)
+    plan = plan_phase_c(run.frame("inventory"), run.frame("b1_proposals"))
+    # --- 1. Priority fix plan ---
+    fix_rows = plan["fix_rows"]
+    fieldnames = [
+        "entity_id",
+        "file_path",
+        "tier",
+        "violations[]",
+        "proposed_fix_summary",
+        "priority",
+    ]
+    run.emit_csv(reports_dir / "phase_c_fixplan.csv", fix_rows, fieldnames)
+    run.emit_report(
+        reports_dir / "phase_c_fixplan.md",
+        "# Phase C: Remediation Plan\n\n"
+        + tabulate(fix_rows, headers="keys", tablefmt="github"),
+    )
 
     # --- 2. Enum normalization map (proposal only) ---
-    enum_map = defaultdict(list)
-    for _, row in b1.iterrows():
-        if row["proposal_type"].startswith("enum_drift_"):
-            k = row["proposal_type"].replace("enum_drift_", "")
-            enum_map[k].append((row["proposed"], row["entity_id"], row["file_path"]))
     enum_md = ["# Phase C: Enum Normalization Map\n"]
-    for k, vals in enum_map.items():
+    for k, vals in plan["enum_groups"]:
         enum_md.append(f"## {k}\n")
-        for val, eid, fpath in sorted((str(val), str(eid), str(fpath)) for val, eid, fpath in vals):
+        for val, eid, fpath in vals:
             enum_md.append(f"- `{val}` (entity_id: `{eid}` file: `{fpath}`)")
         enum_md.append("")
     # Seed suggestions
@@ -421,7 +1167,7 @@ def phase_c(args, schema, tier_rules):
     enum_md.append("- role: room_timer→timer; monitor→observer; motion_timeout→delayer; beta_motion→classifier; summary→decorator; formatter→transformer; standardized→transformer")
     enum_md.append("- type: fallback/presence_state/last_known_zone→sensor; delay_proxy→sensor+role=delayer; preference_proxy→sensor+role=controller; logic_sensor/status_proxy/info/status→sensor")
     enum_md.append("- module: motion→tracking; sleep→health; illuminance/room_temperature/rooms/room_merged_sensors→lighting/climate; occupancy→presence")
-    write_report(reports_dir / "phase_c_enum_map.md", "\n".join(enum_md))
+    run.emit_report(reports_dir / "phase_c_enum_map.md", "\n".join(enum_md))
 
     # --- 3. Tier remediation cookbook ---
     tier_md = ["# Phase C: Tier Remediation Cookbook\n"]
@@ -429,60 +1175,42 @@ def phase_c(args, schema, tier_rules):
     tier_md.append("## γ\n- Require formula_type (author-supplied); propose source_entity when a single upstream exists.")
     tier_md.append("## ε\n- Require threshold + validation_type; explicit fallback.")
     tier_md.append("## ζ\n- Ensure primary_source + fallback_behavior + decision_path.")
-    write_report(reports_dir / "phase_c_tier_cookbook.md", "\n".join(tier_md))
+    run.emit_report(reports_dir / "phase_c_tier_cookbook.md", "\n".join(tier_md))
 
     # --- 4. Dry-run diffs (no writes) ---
+    dryrun = plan["dryrun"]
     dryrun_md = ["# Phase C: Dry-run Diffs (no writes)\n"]
-    # Deterministic fixes: enum normalization, β/γ proposals, UoM
-    enum_fixes = [r for _, r in b1.iterrows() if r["proposal_type"].startswith("enum_drift_")]
-    beta_fixes = [r for _, r in b1.iterrows() if r["proposal_type"] == "beta_alpha_source" and r["proposed"]]
-    gamma_fixes = [r for _, r in b1.iterrows() if r["proposal_type"] == "gamma_source_entity" and r["proposed"]]
-    uom_fixes = [r for _, r in b1.iterrows() if r["proposal_type"] == "uom_proposal" and r["proposed"]]
-    dryrun_md.append(f"## Enum normalization: {len(enum_fixes)} changes\n")
-    for r in enum_fixes:
-        dryrun_md.append(f"- {r['file_path']}: {r['proposal_type']} → {r['proposed']}")
-    dryrun_md.append(f"\n## β alpha_source: {len(beta_fixes)} changes\n")
-    for r in beta_fixes:
-        dryrun_md.append(f"- {r['file_path']}: set alpha_source = {r['proposed']}")
-    dryrun_md.append(f"\n## γ source_entity: {len(gamma_fixes)} changes\n")
-    for r in gamma_fixes:
-        dryrun_md.append(f"- {r['file_path']}: set source_entity = {r['proposed']}")
-    dryrun_md.append(f"\n## UoM: {len(uom_fixes)} changes\n")
-    for r in uom_fixes:
-        dryrun_md.append(f"- {r['file_path']}: set unit_of_measurement = {r['proposed']}")
-    dryrun_md.append(f"\n## Files affected: {len(set(r['file_path'] for r in enum_fixes + beta_fixes + gamma_fixes + uom_fixes))}\n")
-    write_report(reports_dir / "phase_c_dryrun_diffs.md", "\n".join(dryrun_md))
+    dryrun_md.append(f"## Enum normalization: {len(dryrun['enum'])} changes\n")
+    dryrun_md.extend(dryrun["enum"])
+    dryrun_md.append(f"\n## β alpha_source: {len(dryrun['beta'])} changes\n")
+    dryrun_md.extend(dryrun["beta"])
+    dryrun_md.append(f"\n## γ source_entity: {len(dryrun['gamma'])} changes\n")
+    dryrun_md.extend(dryrun["gamma"])
+    dryrun_md.append(f"\n## UoM: {len(dryrun['uom'])} changes\n")
+    dryrun_md.extend(dryrun["uom"])
+    dryrun_md.append(f"\n## Files affected: {dryrun['files_affected']}\n")
+    run.emit_report(reports_dir / "phase_c_dryrun_diffs.md", "\n".join(dryrun_md))
 
     # --- 5. Collision & naming guard ---
-    # Canonical ID uniqueness
-    canon_map = defaultdict(list)
-    for _, row in inv.iterrows():
-        cid = row.get("canonical_id", "")
-        if cid:
-            canon_map[cid].append(row.get("file_path", ""))
-    collision_md = ["# Phase C: Canonical ID Collisions\n"]
-    for cid, files in canon_map.items():
-        if len(files) > 1:
-            collision_md.append(f"- {cid}: {files}")
-    write_report(reports_dir / "phase_c_canonical_collisions.md", "\n".join(collision_md))
-    # Naming violations
-    naming_md = ["# Phase C: Naming Violations\n"]
-    for _, row in inv.iterrows():
-        for k in ["area_id", "subarea_id", "container_id"]:
-            val = str(row.get(k, ""))
-            if val and not NAMING_RE.match(val):
-                naming_md.append(f"- {k}: {val} (entity_id: {row.get('entity_id','')}, file: {row.get('file_path','')})")
-    write_report(reports_dir / "phase_c_naming_violations.md", "\n".join(naming_md))
+    run.emit_report(
+        reports_dir / "phase_c_canonical_collisions.md",
+        "\n".join(["# Phase C: Canonical ID Collisions\n"] + plan["collisions"]),
+    )
+    run.emit_report(
+        reports_dir / "phase_c_naming_violations.md",
+        "\n".join(["# Phase C: Naming Violations\n"] + plan["naming"]),
+    )
 
-def phase_dprime(args, schema, tier_rules):
+def phase_dprime(run):
     import copy
     from io import StringIO
 
-    reports_dir = Path(args.reports)
+    schema, tier_rules = run.schema, run.tier_rules
+    reports_dir = run.reports
     diffs_dir = reports_dir / "phase_dprime_diffs"
     diffs_dir.mkdir(parents=True, exist_ok=True)
     # Scan parity with Phase A
-    files_iter = list(scan_yaml(args))
+    files_iter = scanned_files(run.args)
     eligible = []
     skips = []
     dryrun_rows = []
@@ -490,10 +1218,8 @@ def phase_dprime(args, schema, tier_rules):
     schema_keys = set(schema.keys())
     for file_path in files_iter:
         yaml = YAML(typ="safe")
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                orig_data = yaml.load(f)
-        except Exception:
+        ok, orig_data = PARSE_CACHE.load(file_path)
+        if not ok:
             skips.append({"file_path": str(file_path), "reason": "[unreadable]"})
             continue
         # Helper: find metadata surface
@@ -592,11 +1318,8 @@ def phase_dprime(args, schema, tier_rules):
             sim = copy.deepcopy(orig_data)
             orig_map = dict(leaf_paths_and_values(orig))
             # Find the same entity in the copy
-            sim_ent = None
-            if ent_key is not None and ent_key in sim:
-                sim_ent = sim[ent_key]
-            else:
-                sim_ent = sim
+            pointer = "" if ent_key is None else f"/{escape_pointer(ent_key)}"
+            sim_ent = resolve_pointer(sim, pointer)
             sim_surface, _ = find_surface(sim_ent)
             if not (sim_surface and isinstance(sim_surface, dict)):
                 skips.append({"file_path": str(file_path), "reason": "[no-metadata-surface-copy]"})
@@ -623,12 +1346,15 @@ def phase_dprime(args, schema, tier_rules):
                 skips.append({"file_path": str(file_path), "reason": "[unexpected-deletion]", "details": str(unexpected[:5])})
                 continue
             # Validation
-            schema_ok = True
             tier_ok = True
             try:
-                validate(sim_surface, schema)
-            except Exception:
-                schema_ok = False
+                schema_errors = [
+                    format_schema_error(e)
+                    for e in SCHEMA_REGISTRY.for_schema(schema).iter_errors(sim_surface)
+                ]
+            except Exception as e:
+                schema_errors = [f"invalid schema: {e}"]
+            schema_ok = not schema_errors
             tier = sim_surface.get("tier", "")
             if tier and tier in tier_rules:
                 for req in tier_rules[tier].get("required_fields", []):
@@ -649,8 +1375,7 @@ def phase_dprime(args, schema, tier_rules):
                 continue
             if touched:
                 diff_path = diffs_dir / (Path(file_path).name + ".dryrun.diff")
-                with open(diff_path, "w", encoding="utf-8") as df:
-                    df.writelines(diff)
+                run.emit_report(diff_path, "".join(diff))
                 diff_count += 1
             dryrun_rows.append({
                 "file_path": str(file_path),
@@ -666,14 +1391,21 @@ def phase_dprime(args, schema, tier_rules):
                 "unique_id": unique_id_str,
                 "name": name_str,
                 "canonical_id_proposed_from": canonical_id_proposed_from,
-                "notes": ""
+                "notes": "; ".join(schema_errors)
             })
     # Sorting & output
     dryrun_rows.sort(key=lambda r: (r["file_path"], r["entity_id_str"]))
     fieldnames = ["file_path","entity_id","tier","placement","add_canonical_id","add_file","schema_ok","tier_ok","touched_ok","entity_id_str","unique_id","name","canonical_id_proposed_from","notes"]
-    write_csv(reports_dir / "phase_dprime_dryrun.csv", dryrun_rows, fieldnames)
-    write_report(reports_dir / "phase_dprime_dryrun.md", "# Phase D′ Dry-run Table\n\n" + tabulate(dryrun_rows, headers="keys", tablefmt="github"))
-    write_report(reports_dir / "phase_dprime_skips.md", "# Phase D′ Skips\n\n" + tabulate(skips, headers="keys", tablefmt="github"))
+    run.emit_csv(reports_dir / "phase_dprime_dryrun.csv", dryrun_rows, fieldnames)
+    run.emit_report(
+        reports_dir / "phase_dprime_dryrun.md",
+        "# Phase D′ Dry-run Table\n\n"
+        + tabulate(dryrun_rows, headers="keys", tablefmt="github"),
+    )
+    run.emit_report(
+        reports_dir / "phase_dprime_skips.md",
+        "# Phase D′ Skips\n\n" + tabulate(skips, headers="keys", tablefmt="github"),
+    )
     # Summary
     eligible_entities = len(dryrun_rows)
     touched_ok_count = sum(1 for r in dryrun_rows if r["touched_ok"])
@@ -685,7 +1417,7 @@ def phase_dprime(args, schema, tier_rules):
         f"Diffs generated = {diff_count}",
         f"Acceptance: {'PASS' if eligible_entities >= 1 and touched_ok_count >= 1 else 'FAIL'}"
     ]
-    write_report(reports_dir / "phase_dprime_summary.md", "\n".join(summary))
+    run.emit_report(reports_dir / "phase_dprime_summary.md", "\n".join(summary))
 
 def phase_d_apply(args, schema, tier_rules):
     import copy
@@ -807,11 +1539,8 @@ def phase_d_apply(args, schema, tier_rules):
             sim = copy.deepcopy(orig_data)
             orig_map = dict(leaf_paths_and_values(orig))
             # Find the same entity in the copy
-            sim_ent = None
-            if ent_key is not None and ent_key in sim:
-                sim_ent = sim[ent_key]
-            else:
-                sim_ent = sim
+            pointer = "" if ent_key is None else f"/{escape_pointer(ent_key)}"
+            sim_ent = resolve_pointer(sim, pointer)
             sim_surface, _ = find_surface(sim_ent)
             if not (sim_surface and isinstance(sim_surface, dict)):
                 skips.append({"file_path": rel_path, "reason": "[no-metadata-surface-copy]"})
@@ -907,7 +1636,27 @@ def phase_d_apply(args, schema, tier_rules):
 
 # --- MAIN ---
 def main():
+    global PARSE_CACHE
     args = parse_args()
+    cache_path = (
+        Path(args.cache) if args.cache else Path(args.reports) / "parse_cache.sqlite"
+    )
+    if args.loader == "libyaml" and yaml_bulk.yaml is None:
+        print("ERROR: --loader libyaml requires PyYAML.")
+        sys.exit(1)
+    PARSE_CACHE = ParseCache(
+        cache_path, enabled=not args.no_cache, jobs=args.jobs, loader=args.loader
+    )
+    if args.invalidate_cache:
+        print(f"[cache] invalidated {PARSE_CACHE.invalidate()} entries in {cache_path}")
+    try:
+        run_phases(args)
+    finally:
+        if PARSE_CACHE.enabled:
+            print(PARSE_CACHE.summary())
+        PARSE_CACHE.close(live_paths=getattr(args, "_scanned", None))
+
+def run_phases(args):
     yaml_files = assert_env(args)
     schema, tier_rules = load_schema(args.schema)
     # Mutually exclusive D apply/dry-run
@@ -925,9 +1674,15 @@ def main():
         (getattr(args, 'phase_c', False), phase_c),
         (getattr(args, 'phase_dprime', False), phase_dprime)
     ]
-    for enabled, fn in phases:
-        if enabled:
-            fn(args, schema, tier_rules)
+    if args.phase_a or args.phase_b or getattr(args, 'phase_dprime', False):
+        PARSE_CACHE.prefetch(scanned_files(args))
+    run = PhaseRun(args, schema, tier_rules)
+    try:
+        for enabled, fn in phases:
+            if enabled:
+                fn(run)
+    finally:
+        run.flush()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,7 @@
+"""Shared report/ledger helpers for hestia tools.
+
+Import submodules by package name (``from reportkit.ledger_index import ...``).
+Tools running from the tree append ``hestia/tools/utils`` to ``sys.path`` only
+when ``reportkit`` is not already importable; the CLI scripts in this directory
+(``compact_index.py``, ``link_latest.py``) still run standalone.
+"""
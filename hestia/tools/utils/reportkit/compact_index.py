@@ -1,12 +1,11 @@
 #!/usr/bin/env python3
 import argparse
 import datetime as dt
-import hashlib
 import pathlib
 import sys
 
+from ledger_retention import compact_by_age
 
-def sha(s: bytes) -> str: return hashlib.sha256(s).hexdigest()
 
 def main():
     ap = argparse.ArgumentParser(
@@ -28,54 +27,31 @@ def main():
         dt.datetime.now(dt.UTC)
         - dt.timedelta(days=args.keep_days)
     )
-    keep, move = [], []
 
-    # Parse index and split lines by age
-    with idx.open("rb") as f:
-        for line in f:
-            try:
-                s = line.decode("utf-8", "ignore")
-                t = None
-                # crude parse: look for 20-char UTC ISO or our UTC stamps
-                for token in s.split():
-                    for fmt in ("%Y-%m-%dT%H:%M:%SZ", "%Y%m%dT%H%M%SZ"):
-                        try:
-                            t = dt.datetime.strptime(token, fmt)
-                            break
-                        except Exception:
-                            pass
-                    if t:
-                        break
-                if t and t < cutoff:
-                    move.append(line)
-                else:
-                    keep.append(line)
-            except Exception:
-                keep.append(line)
-
-    arch_shas = set()
-    added = 0
-
-    if arch.exists():
-        with arch.open("rb") as f:
-            for l in f:
-                arch_shas.add(sha(l))
-
-    with arch.open("ab") as f:
-        for line in move:
-            h = sha(line)
-            if h in arch_shas:
-                continue
-            f.write(line)
-            added += 1
+    def is_old(line: bytes) -> bool:
+        s = line.decode("utf-8", "ignore")
+        t = None
+        # crude parse: look for 20-char UTC ISO or our UTC stamps
+        for token in s.split():
+            for fmt in ("%Y-%m-%dT%H:%M:%SZ", "%Y%m%dT%H%M%SZ"):
+                try:
+                    t = dt.datetime.strptime(token, fmt).replace(tzinfo=dt.UTC)
+                    break
+                except Exception:
+                    pass
+            if t:
+                break
+        return bool(t and t < cutoff)
+
+    # Streams the index once; archive dedupe uses the persisted digest set
+    # (_index.archive.jsonl.digests.sqlite) instead of re-hashing the archive.
+    res = compact_by_age(idx, arch, is_old)
 
     print(
-        f"COMPACT keep={len(keep)} moved={len(move)} added_to_archive={added}"
+        f"COMPACT keep={res['keep']} moved={res['moved']} "
+        f"added_to_archive={res['added_to_archive']}"
     )
 
-    with idx.open("wb") as f:
-        f.writelines(keep)
-
     return 0
 
 if __name__ == "__main__":
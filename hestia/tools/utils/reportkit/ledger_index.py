@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+ledger_index.py
+
+Sidecar "latest applied sha" index for Hestia ``*__index.jsonl`` ledgers.
+
+The JSONL ledger stays the source of truth. A SQLite sidecar next to it
+(``<name>__index.sqlite``) maps ``target -> sha256`` of the most recent applied
+result and remembers how far into the ledger it has read, so idempotency
+checks are a single primary-key lookup instead of a scan of the ledger.
+
+- Appends through ``LedgerIndex.append`` update the sidecar in the same call.
+- Lines appended by other writers are picked up incrementally on ``open()``.
+- Tail-keep retention (a suffix of the ledger survives) is detected via the
+  signature of the last indexed bytes and keeps the existing mappings.
+- A missing, corrupt or out-of-sync sidecar is rebuilt from the JSONL.
+
+Usage:
+  ledger_index.py rebuild <ledger.jsonl> --kind glances_bridge
+  ledger_index.py get <ledger.jsonl> <target> --kind meta_capture
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import os
+import sqlite3
+import sys
+from collections.abc import Callable, Iterable
+from pathlib import Path
+
+SCHEMA_VERSION = "1"
+SIG_BYTES = 64
+# how far back to look for the last indexed bytes after the ledger was trimmed
+RESEAT_WINDOW = 1024 * 1024
+
+
+# --- Result extractors: ledger entry -> (target, sha256) of applied results
+
+
+def applied_apu_results(entry: dict) -> Iterable[tuple[str, str]]:
+    """glances_bridge style: results[].target_path + apu.provenance.sha256."""
+    for r in entry.get("results", []) or []:
+        tp = r.get("target_path")
+        sha = (r.get("apu") or {}).get("provenance", {}).get("sha256")
+        if tp and r.get("applied") and sha:
+            yield tp, sha
+
+
+def applied_flat_results(entry: dict) -> Iterable[tuple[str, str]]:
+    """meta_capture style: results[].target + results[].sha256."""
+    for r in entry.get("results", []) or []:
+        tp = r.get("target")
+        sha = r.get("sha256")
+        if tp and r.get("applied") and sha:
+            yield tp, sha
+
+
+EXTRACTORS: dict[str, Callable[[dict], Iterable[tuple[str, str]]]] = {
+    "glances_bridge": applied_apu_results,
+    "meta_capture": applied_flat_results,
+}
+
+
+class LedgerIndex:
+    def __init__(
+        self,
+        ledger: Path,
+        extract: Callable[[dict], Iterable[tuple[str, str]]],
+        sidecar: Path | None = None,
+    ):
+        self.ledger = Path(ledger)
+        self.extract = extract
+        self.sidecar = Path(sidecar) if sidecar else self.ledger.with_suffix(".sqlite")
+        self.conn: sqlite3.Connection | None = None
+
+    # --- lifecycle
+
+    def open(self) -> LedgerIndex:
+        self.sidecar.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            self._connect()
+            self.sync()
+        except sqlite3.DatabaseError:
+            # corrupt sidecar: drop it and rebuild from the JSONL
+            self.close()
+            for suffix in ("", "-wal", "-shm"):
+                with contextlib.suppress(FileNotFoundError):
+                    Path(str(self.sidecar) + suffix).unlink()
+            self._connect()
+            self.rebuild()
+        return self
+
+    def close(self) -> None:
+        if self.conn is not None:
+            with contextlib.suppress(Exception):
+                self.conn.close()
+            self.conn = None
+
+    def __enter__(self) -> LedgerIndex:
+        return self.open()
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _connect(self) -> None:
+        self.conn = sqlite3.connect(str(self.sidecar), timeout=10)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS latest"
+            " (target TEXT PRIMARY KEY, sha256 TEXT NOT NULL)"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+        )
+        if self._meta("schema_version") != SCHEMA_VERSION:
+            with self.conn:
+                self.conn.execute("DELETE FROM latest")
+                self.conn.execute("DELETE FROM meta")
+                self._set_meta(schema_version=SCHEMA_VERSION, offset="0", sig="")
+
+    def _meta(self, key: str) -> str | None:
+        row = self.conn.execute("SELECT value FROM meta WHERE key=?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, **kv: str) -> None:
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO meta(key, value) VALUES(?, ?)", list(kv.items())
+        )
+
+    # --- sync
+
+    def sync(self) -> None:
+        """Bring the sidecar up to date with the ledger (incremental when possible)."""
+        if not self.ledger.exists():
+            with self.conn:
+                self.conn.execute("DELETE FROM latest")
+                self._set_meta(offset="0", sig="")
+            return
+        size = self.ledger.stat().st_size
+        offset = int(self._meta("offset") or 0)
+        sig = bytes.fromhex(self._meta("sig") or "")
+        if offset == 0 or not sig:
+            self.rebuild()
+            return
+        with self.ledger.open("rb") as fh:
+            if size >= offset:
+                fh.seek(offset - len(sig))
+                if fh.read(len(sig)) == sig:
+                    if size > offset:
+                        self._scan_from(offset)
+                    return
+            # trimmed by tail-keep retention? the last indexed bytes survive
+            start = max(0, size - RESEAT_WINDOW)
+            fh.seek(start)
+            pos = fh.read().rfind(sig)
+        if pos >= 0:
+            self._scan_from(start + pos + len(sig))
+        else:
+            self.rebuild()
+
+    def rebuild(self) -> None:
+        with self.conn:
+            self.conn.execute("DELETE FROM latest")
+            self._set_meta(offset="0", sig="")
+        if self.ledger.exists():
+            self._scan_from(0)
+
+    def _scan_from(self, offset: int) -> None:
+        rows: dict[str, str] = {}
+        end = offset
+        with self.ledger.open("rb") as fh:
+            fh.seek(offset)
+            for line in fh:
+                if not line.endswith(b"\n"):
+                    break  # writer mid-append; pick it up next time
+                end += len(line)
+                try:
+                    entry = json.loads(line)
+                except Exception:
+                    continue
+                if isinstance(entry, dict):
+                    for target, sha in self.extract(entry):
+                        rows[target] = sha
+            fh.seek(max(0, end - SIG_BYTES))
+            sig = fh.read(min(SIG_BYTES, end))
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO latest(target, sha256) VALUES(?, ?)",
+                rows.items(),
+            )
+            self._set_meta(offset=str(end), sig=sig.hex())
+
+    # --- queries / writes
+
+    def latest(self, target: str) -> str | None:
+        row = self.conn.execute(
+            "SELECT sha256 FROM latest WHERE target=?", (target,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def append(self, payload: dict) -> None:
+        """Append one ledger line and index it in the same call."""
+        self.ledger.parent.mkdir(parents=True, exist_ok=True)
+        with self.ledger.open("a", encoding="utf-8") as fh:
+            fh.write(json.dumps(payload, separators=(",", ":")) + "\n")
+            fh.flush()
+            os.fsync(fh.fileno())
+        # the line is durable; a stale sidecar just catches up on the next open()
+        with contextlib.suppress(sqlite3.Error):
+            self.sync()
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Sidecar index for *__index.jsonl ledgers")
+    ap.add_argument("cmd", choices=["rebuild", "get"])
+    ap.add_argument("ledger")
+    ap.add_argument("target", nargs="?")
+    ap.add_argument("--kind", choices=sorted(EXTRACTORS), required=True)
+    args = ap.parse_args()
+    with LedgerIndex(Path(args.ledger), EXTRACTORS[args.kind]) as idx:
+        if args.cmd == "rebuild":
+            idx.rebuild()
+            n = idx.conn.execute("SELECT COUNT(1) FROM latest").fetchone()[0]
+            print(f"REBUILT targets={n} sidecar={idx.sidecar}")
+        else:
+            if not args.target:
+                ap.error("get requires a target")
+            print(idx.latest(args.target) or "")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
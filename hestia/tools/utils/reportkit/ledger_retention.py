@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+ledger_retention.py
+
+Streaming, constant-memory retention for Hestia JSONL ledgers.
+
+- keep_tail: keep the last N lines. The cut point is found by reading the
+  ledger backwards in fixed-size blocks, the surviving suffix is streamed into
+  a temp file next to the ledger and swapped in with os.replace.
+- compact_by_age: move lines selected by a predicate into an append-only
+  archive. Archive membership is tracked in a persisted digest set
+  (``<archive>.digests.sqlite``) so the archive is never re-hashed; only bytes
+  appended to it by someone else are hashed on the next run.
+
+Memory use is bounded by the block size, independent of ledger length.
+
+Usage:
+  ledger_retention.py tail <ledger.jsonl> --keep-lines 20000
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import hashlib
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+from collections.abc import Callable
+from pathlib import Path
+
+BLOCK_SIZE = 64 * 1024
+COPY_BUFFER = 1024 * 1024
+
+
+def tail_offset(path: Path, keep_lines: int, block_size: int = BLOCK_SIZE) -> int:
+    """Byte offset where the last ``keep_lines`` lines start (0 = keep everything)."""
+    if keep_lines <= 0:
+        return path.stat().st_size
+    with path.open("rb") as fh:
+        fh.seek(0, os.SEEK_END)
+        pos = fh.tell()
+        if pos == 0:
+            return 0
+        fh.seek(pos - 1)
+        # the newline terminating the final line does not start a new one
+        if fh.read(1) == b"\n":
+            pos -= 1
+        seen = 0
+        while pos > 0:
+            start = max(0, pos - block_size)
+            fh.seek(start)
+            block = fh.read(pos - start)
+            idx = len(block)
+            while True:
+                idx = block.rfind(b"\n", 0, idx)
+                if idx < 0:
+                    break
+                seen += 1
+                if seen == keep_lines:
+                    return start + idx + 1
+            pos = start
+    return 0
+
+
+def _copy_range(src: Path, dst_fh, offset: int) -> int:
+    with src.open("rb") as fh:
+        fh.seek(offset)
+        shutil.copyfileobj(fh, dst_fh, COPY_BUFFER)
+        return fh.tell()
+
+
+def _swap_in(path: Path, write: Callable[[object], None]) -> None:
+    """Stream new content into a temp file beside ``path`` and atomically replace it."""
+    fd, tmp = tempfile.mkstemp(
+        prefix=path.name + ".", suffix=".tmp", dir=str(path.parent)
+    )
+    try:
+        with os.fdopen(fd, "wb") as out:
+            write(out)
+            out.flush()
+            os.fsync(out.fileno())
+        with contextlib.suppress(OSError):
+            os.chmod(tmp, path.stat().st_mode & 0o777)
+        os.replace(tmp, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(tmp)
+        raise
+
+
+def keep_tail(path: Path, keep_lines: int) -> dict:
+    """Trim ``path`` to its last ``keep_lines`` lines; returns counters."""
+    path = Path(path)
+    if not path.exists():
+        return {"trimmed": False, "reason": "missing"}
+    offset = tail_offset(path, keep_lines)
+    if offset == 0:
+        return {"trimmed": False, "bytes_dropped": 0}
+
+    def write(out):
+        end = _copy_range(path, out, offset)
+        # pick up lines appended while we were copying before swapping in
+        while path.stat().st_size > end:
+            end = _copy_range(path, out, end)
+
+    _swap_in(path, write)
+    return {"trimmed": True, "bytes_dropped": offset}
+
+
+class DigestSet:
+    """Persisted sha256 set of archive lines, kept in step with the archive size."""
+
+    def __init__(self, archive: Path):
+        self.archive = archive
+        self.db = sqlite3.connect(str(archive) + ".digests.sqlite")
+        self.db.execute("CREATE TABLE IF NOT EXISTS digests (d BLOB PRIMARY KEY)")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+        )
+        row = self.db.execute(
+            "SELECT value FROM meta WHERE key='archive_size'"
+        ).fetchone()
+        self.size = int(row[0]) if row else 0
+
+    def catch_up(self) -> int:
+        """Hash only archive bytes this set has not seen; full reseed if it shrank."""
+        actual = self.archive.stat().st_size if self.archive.exists() else 0
+        if actual < self.size:
+            self.db.execute("DELETE FROM digests")
+            self.size = 0
+        hashed = 0
+        if actual > self.size:
+            with self.archive.open("rb") as fh:
+                fh.seek(self.size)
+                batch = []
+                for line in fh:
+                    batch.append((hashlib.sha256(line).digest(),))
+                    hashed += 1
+                    if len(batch) >= 10000:
+                        self.db.executemany(
+                            "INSERT OR IGNORE INTO digests VALUES (?)", batch
+                        )
+                        batch.clear()
+                self.db.executemany("INSERT OR IGNORE INTO digests VALUES (?)", batch)
+            self.size = actual
+        self._commit()
+        return hashed
+
+    def add(self, line: bytes) -> bool:
+        """Record ``line``; False if the archive already holds it."""
+        cur = self.db.execute(
+            "INSERT OR IGNORE INTO digests VALUES (?)", (hashlib.sha256(line).digest(),)
+        )
+        return cur.rowcount == 1
+
+    def _commit(self) -> None:
+        self.db.execute(
+            "INSERT OR REPLACE INTO meta(key, value) VALUES('archive_size', ?)",
+            (str(self.size),),
+        )
+        self.db.commit()
+
+    def close(self, archive_size: int) -> None:
+        self.size = archive_size
+        self._commit()
+        self.db.close()
+
+
+def compact_by_age(path: Path, archive: Path, is_old: Callable[[bytes], bool]) -> dict:
+    """Move lines where ``is_old(line)`` to ``archive`` (deduplicated), keep others."""
+    path, archive = Path(path), Path(archive)
+    if not path.exists():
+        return {"keep": 0, "moved": 0, "added_to_archive": 0}
+    digests = DigestSet(archive)
+    rehashed = digests.catch_up()
+    counts = {
+        "keep": 0,
+        "moved": 0,
+        "added_to_archive": 0,
+        "archive_rehashed": rehashed,
+    }
+
+    def write(keep_fh):
+        with path.open("rb") as src, archive.open("ab") as arch:
+            end = 0
+            # like keep_tail: pick up lines appended while we were copying
+            while path.stat().st_size > end:
+                for line in src:
+                    try:
+                        old = is_old(line)
+                    except Exception:
+                        old = False
+                    if not old:
+                        keep_fh.write(line)
+                        counts["keep"] += 1
+                        continue
+                    counts["moved"] += 1
+                    if digests.add(line):
+                        arch.write(line)
+                        counts["added_to_archive"] += 1
+                end = src.tell()
+            arch.flush()
+            os.fsync(arch.fileno())
+
+    try:
+        _swap_in(path, write)
+    finally:
+        digests.close(archive.stat().st_size if archive.exists() else 0)
+    return counts
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Streaming retention for JSONL ledgers")
+    ap.add_argument("cmd", choices=["tail"])
+    ap.add_argument("ledger")
+    ap.add_argument("--keep-lines", type=int, default=20000)
+    args = ap.parse_args()
+    res = keep_tail(Path(args.ledger), args.keep_lines)
+    print(f"TAIL keep_lines={args.keep_lines} trimmed={res.get('trimmed')} "
+          f"bytes_dropped={res.get('bytes_dropped', 0)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+schema_registry.py
+
+Compiled JSON Schema validators for Hestia tools, built once and reused.
+
+``jsonschema.validate`` resolves the validator class, re-checks the schema and
+builds a new validator on every call; with one call per entity that dominates
+a full ``/config`` run. The registry instead:
+
+- loads a schema file once and memoizes the validator by (path, mtime_ns, size),
+  so edits are picked up without restarting long-running callers;
+- runs ``check_schema`` once per schema, not once per instance;
+- reports every error via ``iter_errors`` rather than the first exception.
+
+In-memory schemas (e.g. the ``metadata_schema`` mapping validate_metadata.py
+loads from YAML) are memoized by identity for the lifetime of the dict.
+
+Usage:
+  schema_registry.py check <schema.json> <instance.json|yaml>...
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+try:
+    import jsonschema
+    from jsonschema.validators import validator_for
+except Exception:
+    jsonschema = None
+
+try:
+    import yaml
+except Exception:
+    yaml = None
+
+
+def _load_document(path: Path):
+    text = path.read_text(encoding="utf-8")
+    if path.suffix.lower() in (".yaml", ".yml"):
+        if yaml is None:
+            raise RuntimeError("PyYAML required to load YAML schemas")
+        return yaml.safe_load(text)
+    return json.loads(text)
+
+
+def format_error(err) -> str:
+    """``<json/pointer>: message`` for one ValidationError (``/`` for the root)."""
+    pointer = "/" + "/".join(str(p) for p in err.absolute_path)
+    return f"{pointer}: {err.message}"
+
+
+class SchemaRegistry:
+    def __init__(self):
+        self._files: dict[str, tuple[tuple[int, int], object]] = {}
+        # id(schema) -> (schema, validator); the schema ref keeps the id stable
+        self._inline: dict[int, tuple[object, object]] = {}
+
+    @staticmethod
+    def _compile(schema):
+        cls = validator_for(schema)
+        cls.check_schema(schema)
+        # no format checker: jsonschema.validate() never asserted "format" either
+        return cls(schema)
+
+    def for_path(self, schema_path: str | os.PathLike):
+        """Validator for a schema file, or None when jsonschema/the file is unavailable.
+
+        Raises ``jsonschema.SchemaError`` (cached until the file changes) when the
+        schema itself is invalid.
+        """
+        if jsonschema is None or not schema_path:
+            return None
+        key = os.path.realpath(schema_path)
+        try:
+            st = os.stat(key)
+        except OSError:
+            return None
+        stamp = (st.st_mtime_ns, st.st_size)
+        hit = self._files.get(key)
+        if hit is None or hit[0] != stamp:
+            try:
+                value = self._compile(_load_document(Path(key)))
+            except Exception as e:
+                value = e
+            self._files[key] = hit = (stamp, value)
+        if isinstance(hit[1], Exception):
+            raise hit[1]
+        return hit[1]
+
+    def for_schema(self, schema):
+        """Validator for an in-memory schema mapping (memoized by identity)."""
+        if jsonschema is None:
+            return None
+        hit = self._inline.get(id(schema))
+        if hit is None or hit[0] is not schema:
+            try:
+                value = self._compile(schema)
+            except Exception as e:
+                value = e
+            self._inline[id(schema)] = hit = (schema, value)
+        if isinstance(hit[1], Exception):
+            raise hit[1]
+        return hit[1]
+
+    def errors(self, instance, schema_path: str | os.PathLike) -> list:
+        """All ValidationErrors for ``instance``, ordered by location."""
+        validator = self.for_path(schema_path)
+        if validator is None:
+            return []
+        return sorted(
+            validator.iter_errors(instance),
+            key=lambda e: list(map(str, e.absolute_path)),
+        )
+
+
+# Process-wide registry; worker processes each build their own on first use.
+REGISTRY = SchemaRegistry()
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(
+        description="Validate documents against a cached JSON Schema"
+    )
+    ap.add_argument("cmd", choices=["check"])
+    ap.add_argument("schema")
+    ap.add_argument("instances", nargs="+")
+    args = ap.parse_args()
+    if jsonschema is None:
+        print("E-SCHEMA-000: jsonschema not installed", file=sys.stderr)
+        return 4
+    failed = 0
+    for inst in args.instances:
+        errs = REGISTRY.errors(_load_document(Path(inst)), args.schema)
+        for e in errs:
+            print(f"{inst}:{format_error(e)}")
+        failed += bool(errs)
+    print(f"CHECKED files={len(args.instances)} failed={failed}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
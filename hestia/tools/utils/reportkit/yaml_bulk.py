@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+yaml_bulk.py
+
+Bulk YAML loading for Hestia tools that parse a whole config tree.
+
+- Uses PyYAML's LibYAML-backed ``CSafeLoader`` when available and falls back to
+  the pure-Python ``SafeLoader`` otherwise (``LOADER_NAME`` says which).
+- ``load_many`` fans files out over a process pool and returns one
+  ``LoadResult`` per input path, in input order, with per-file errors instead
+  of raising.
+- Optional loader features:
+  * ``custom_tags``: local tags such as ``!include``, ``!secret``, ``!input``
+    are constructed as their plain scalar/sequence/mapping value, so Home
+    Assistant config files parse instead of failing on the tag.
+  * ``unique_keys``: duplicate mapping keys raise ``DuplicateKeyError``
+    (merge keys ``<<`` are not counted as duplicates).
+
+Usage:
+  yaml_bulk.py <file.yaml>... [--jobs 4] [--custom-tags] [--unique-keys]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import cache, partial
+from typing import Any
+
+try:
+    import yaml
+except Exception:
+    yaml = None
+
+if yaml is not None:
+    BaseLoader = getattr(yaml, "CSafeLoader", None) or yaml.SafeLoader
+    LOADER_NAME = BaseLoader.__name__
+
+    class DuplicateKeyError(yaml.constructor.ConstructorError):
+        pass
+else:
+    BaseLoader = None
+    LOADER_NAME = "unavailable"
+
+    class DuplicateKeyError(Exception):
+        pass
+
+
+@dataclass
+class LoadResult:
+    path: str
+    ok: bool
+    data: Any = None
+    error: str | None = None
+    # "io" | "yaml" | "duplicate_key" when ok is False
+    error_kind: str | None = None
+
+
+def _construct_untagged(loader, tag_suffix, node):
+    if isinstance(node, yaml.MappingNode):
+        return loader.construct_mapping(node, deep=True)
+    if isinstance(node, yaml.SequenceNode):
+        return loader.construct_sequence(node, deep=True)
+    return loader.construct_scalar(node)
+
+
+class _UniqueKeysMixin:
+    def construct_mapping(self, node, deep=False):
+        if isinstance(node, yaml.MappingNode):
+            seen = set()
+            for key_node, _ in node.value:
+                if key_node.tag == "tag:yaml.org,2002:merge":
+                    continue
+                key = self.construct_object(key_node, deep=deep)
+                try:
+                    dup = key in seen
+                except TypeError:
+                    continue
+                if dup:
+                    raise DuplicateKeyError(
+                        "while constructing a mapping", node.start_mark,
+                        f"found duplicate key {key!r}", key_node.start_mark,
+                    )
+                seen.add(key)
+        return super().construct_mapping(node, deep)
+
+
+@cache
+def loader_class(custom_tags: bool = False, unique_keys: bool = False):
+    """Loader class for the requested features (built once per combination)."""
+    bases = ((_UniqueKeysMixin,) if unique_keys else ()) + (BaseLoader,)
+    cls = type(f"Hestia{LOADER_NAME}", bases, {})
+    if custom_tags:
+        cls.add_multi_constructor("!", _construct_untagged)
+    return cls
+
+
+def load_text(text: str, custom_tags: bool = False, unique_keys: bool = False):
+    return yaml.load(text, Loader=loader_class(custom_tags, unique_keys))
+
+
+def load_file(
+    path: str, custom_tags: bool = False, unique_keys: bool = False
+) -> LoadResult:
+    path = str(path)
+    try:
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+    except (OSError, UnicodeDecodeError) as e:
+        return LoadResult(path, False, error=str(e), error_kind="io")
+    try:
+        return LoadResult(path, True, data=load_text(text, custom_tags, unique_keys))
+    except DuplicateKeyError as e:
+        return LoadResult(path, False, error=str(e), error_kind="duplicate_key")
+    except Exception as e:
+        return LoadResult(path, False, error=str(e), error_kind="yaml")
+
+
+def load_many(
+    paths, jobs: int = 1, custom_tags: bool = False, unique_keys: bool = False
+) -> list[LoadResult]:
+    """Parse ``paths`` (serially when ``jobs`` <= 1); results come in input order."""
+    if yaml is None:
+        raise RuntimeError("E-YAML-000: PyYAML is required for bulk loading")
+    paths = [str(p) for p in paths]
+    fn = partial(load_file, custom_tags=custom_tags, unique_keys=unique_keys)
+    if jobs <= 1 or len(paths) < 2:
+        return [fn(p) for p in paths]
+    jobs = min(jobs, len(paths))
+    chunksize = max(1, len(paths) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(fn, paths, chunksize=chunksize))
+
+
+def default_jobs() -> int:
+    return os.cpu_count() or 1
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(
+        description="Parse YAML files in bulk and report per-file errors"
+    )
+    ap.add_argument("files", nargs="+")
+    ap.add_argument("--jobs", type=int, default=default_jobs())
+    ap.add_argument("--custom-tags", action="store_true")
+    ap.add_argument("--unique-keys", action="store_true")
+    args = ap.parse_args()
+    t0 = time.perf_counter()
+    results = load_many(args.files, args.jobs, args.custom_tags, args.unique_keys)
+    failed = [r for r in results if not r.ok]
+    for r in failed:
+        print(
+            f"{r.path}: [{r.error_kind}] {r.error.splitlines()[0] if r.error else ''}"
+        )
+    print(f"LOADED files={len(results)} failed={len(failed)} loader={LOADER_NAME} "
+          f"jobs={args.jobs} seconds={time.perf_counter() - t0:.3f}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
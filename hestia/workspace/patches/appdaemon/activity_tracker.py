@@ -1,12 +1,15 @@
 """
 Activity Tracker for Room-DB
 Monitors occupancy/motion sensors and writes last_activity timestamps to Room-DB
+
+Writes go through RoomDbUpdater's write-behind queue when that app runs in
+the same AppDaemon (bursts are coalesced per room, nothing is dropped); the
+rate-limited rest_command path is the fallback.
 """
 
-from datetime import datetime
-import time
-import json
 import random
+import time
+from datetime import datetime
 
 import appdaemon.plugins.hass.hassapi as hass
 
@@ -20,6 +23,7 @@ class ActivityTracker(hass.Hass):
         )
         self.rate_limit_seconds = int(self.args.get("rate_limit_seconds", 2))
         self._dedupe_ttl = int(self.args.get("dedupe_ttl_seconds", 5))
+        self.room_db_app = self.args.get("room_db_app", "room_db_updater")
 
         # Room → Sensor mapping (occupancy preferred, motion fallback)
         # IMPORTANT: room_id (key) must match canonical mapping in area_mapping.yaml
@@ -34,10 +38,12 @@ class ActivityTracker(hass.Hass):
             "entrance": "binary_sensor.entrance_motion_beta",
         }
 
-    # Track last write per room (rate limiting)
-    self._last_write = {}
-    # Track last event per room:sensor for dedupe
-    self._last_event = {}
+        # Track last write per room (rate limiting, REST fallback only)
+        self._last_write = {}
+        # Track last event per room:sensor for dedupe
+        self._last_event = {}
+        # Last trigger_count written per room (REST fallback); the HA sensor lags writes
+        self._trigger_counts = {}
 
         # Listen to all sensors
         for room, sensor in self.room_sensors.items():
@@ -68,7 +74,31 @@ class ActivityTracker(hass.Hass):
             return
         self._last_event[ekey] = now
 
-        # Rate limiting check (per room)
+        activity = {
+            "last_activity": datetime.now().isoformat(),
+            "activity_source": sensor,
+        }
+
+        # Preferred: RoomDbUpdater write-behind queue. trigger_count is bumped
+        # inside the DB (json_set), so no read-back of the HA sensor is needed
+        # and other keys in the motion_lighting config are left untouched.
+        updater = self._room_db()
+        if updater is not None:
+            result, code = updater.enqueue_update(
+                room, "motion_lighting", activity, increment={"trigger_count": 1}
+            )
+            if code == 202:
+                self.log(
+                    f"Activity queued: {room} from {sensor} "
+                    f"(pending: {result.get('pending')})"
+                )
+            else:
+                self.error(
+                    f"Failed to queue activity for {room}: {result.get('error')}"
+                )
+            return
+
+        # Fallback: direct REST write of the full config, rate limited per room
         last = self._last_write.get(room, 0)
 
         if now - last < self.rate_limit_seconds:
@@ -76,26 +106,29 @@ class ActivityTracker(hass.Hass):
             return
 
         # Get current trigger count
-        current_count = self._get_current_count(room)
-
-        # Write to Room-DB
+        current_count = max(
+            self._trigger_counts.get(room, 0), self._get_current_count(room)
+        )
         payload = dict(
             room_id=room,
             domain="motion_lighting",
-            config_data={
-                "last_activity": datetime.now().isoformat(),
-                "activity_source": sensor,
-                "trigger_count": current_count + 1,
-            },
+            config_data={**activity, "trigger_count": current_count + 1},
             schema_expected=1,
         )
-        if self._post_update(payload):
-            self._last_write[room] = now
-            self.log(
-                f"Activity logged: {room} from {sensor} (count: {current_count + 1})"
-            )
-        else:
-            self.error(f"Failed to write activity for {room}")
+
+        def done(ok):
+            # called once, after the first success or the last failed retry
+            if ok:
+                self._trigger_counts[room] = current_count + 1
+                self._last_write[room] = now
+                self.log(
+                    f"Activity logged: {room} from {sensor} "
+                    f"(count: {current_count + 1})"
+                )
+            else:
+                self.error(f"Failed to write activity for {room}")
+
+        self._post_update(payload, done)
 
     def _get_current_count(self, room):
         """Read current trigger count from Room-DB sensor"""
@@ -112,23 +145,36 @@ class ActivityTracker(hass.Hass):
 
         return 0
 
-    def _post_update(self, payload: dict) -> bool:
-        """Post update via HA rest_command or AppDaemon endpoint with backoff+jitter.
-        Returns True on success, False on failure.
+    def _room_db(self):
+        """The RoomDbUpdater app when it runs in this AppDaemon instance, else None."""
+        try:
+            app = self.get_app(self.room_db_app)
+        except Exception:
+            return None
+        return app if hasattr(app, "enqueue_update") else None
+
+    def _post_update(self, payload: dict, on_done, attempt: int = 1) -> None:
+        """Post update via HA rest_command with backoff+jitter.
+        Retries are scheduled with run_in rather than sleeping in the callback
+        thread, so the outcome is reported through on_done(ok), exactly once.
         """
         max_attempts = 3
-        for attempt in range(1, max_attempts + 1):
-            try:
-                # Primary: HA rest_command
-                self.call_service(self.update_service, **payload)
-                return True
-            except Exception as e:
-                # Backoff with small jitter
-                jitter = random.uniform(0.2, 0.8)
-                delay = min(2.0, 0.3 * attempt) + jitter
-                self.log(
-                    f"post_update attempt {attempt} failed: {e}. retrying in {delay:.2f}s",
-                    level="WARNING",
-                )
-                time.sleep(delay)
-        return False
+        try:
+            self.call_service(self.update_service, **payload)
+        except Exception as e:
+            if attempt >= max_attempts:
+                self.error(f"post_update failed after {attempt} attempts: {e}")
+                on_done(False)
+                return
+            # Backoff with small jitter
+            jitter = random.uniform(0.2, 0.8)
+            delay = min(2.0, 0.3 * attempt) + jitter
+            self.log(
+                f"post_update attempt {attempt} failed: {e}. retrying in {delay:.2f}s",
+                level="WARNING",
+            )
+            self.run_in(
+                lambda *_: self._post_update(payload, on_done, attempt + 1), delay
+            )
+            return
+        on_done(True)
@@ -5,11 +5,19 @@
 #   class: RoomDbExporter
 #   db_path: /config/room_database.db
 # Then restart the add-on. Endpoint: /api/appdaemon/room_db_export
+#
+# The export model is kept in memory and patched incrementally: PRAGMA
+# data_version tells whether anything was committed since the last look, and
+# only room_configs rows with updated_at >= the high-water mark are re-read.
+# A full scan happens on first use, on schema changes and when rows disappear.
+# Disk writes are debounced (export_debounce_seconds, capped by
+# export_max_delay_seconds) and skipped when the export content is unchanged.
 
 import contextlib
 import json
 import os
 import sqlite3
+import threading
 import time
 
 import appdaemon.plugins.hass.hassapi as hass
@@ -21,74 +29,214 @@ class RoomDbExporter(hass.Hass):
         self.export_path = self.args.get("export_path", "/config/hestia/workspace/operations/logs/room_db/room_db_export.json")
         self.schema_version = int(self.args.get("schema_version", 1))
         self._debounce_handle = None
+        self.debounce_seconds = float(self.args.get("export_debounce_seconds", 5))
+        self.max_delay_seconds = float(self.args.get("export_max_delay_seconds", 30))
+        self._lock = threading.RLock()
+        self._conn = None
+        self._model = None  # export payload without exported_at
+        self._rooms = {}  # {(config_domain, room_id): updated_at}
+        self._watermark = ""
+        self._data_version = None
+        self._schema_cookie = None
+        self._has_updated_at = False
+        self._dirty = False
+        self._dirty_since = None
+        self.stats = {"full_scans": 0, "incremental": 0, "unchanged": 0, "writes": 0}
         # Expose a simple global endpoint
         self.register_endpoint(self._handle_export, "room_db_export")
         self.register_endpoint(self._write_once_ep, "room_db_export_write_once", methods=["POST"])
         self.log(f"RoomDbExporter initialized with db_path={self.db_path} export_path={self.export_path}")
 
+    def terminate(self):
+        with contextlib.suppress(Exception):
+            self.flush_export()
+        self._close()
+
+    def _connection(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(
+                f"file:{self.db_path}?mode=ro", uri=True, check_same_thread=False
+            )
+        return self._conn
+
+    def _close(self):
+        with self._lock:
+            if self._conn is not None:
+                with contextlib.suppress(Exception):
+                    self._conn.close()
+                self._conn = None
+
+    def _full_scan(self, cur):
+        cur.execute("SELECT name FROM sqlite_master WHERE type='table'")
+        tables = [r[0] for r in cur.fetchall()]
+        result = {
+            "schema_version": self.schema_version,
+            "db_path": self.db_path,
+            "tables": tables,
+            "by_domain": {},
+            "counts": {},
+        }
+        # counts for each table
+        for t in tables:
+            try:
+                cur.execute(f"SELECT COUNT(1) FROM {t}")
+                result["counts"][t] = int(cur.fetchone()[0])
+            except Exception:
+                result["counts"][t] = None
+        self._rooms = {}
+        self._watermark = ""
+        self._has_updated_at = False
+        # If room_configs exists, extract domain→rooms
+        if "room_configs" in tables:
+            cur.execute("PRAGMA table_info(room_configs)")
+            cols = [r[1] for r in cur.fetchall()]
+            if set(["config_domain", "room_id"]).issubset(set(cols)):
+                self._has_updated_at = "updated_at" in cols
+                updated = "updated_at" if self._has_updated_at else "NULL"
+                cur.execute(
+                    f"SELECT config_domain, room_id, {updated} FROM room_configs"
+                )
+                for domain, room, updated_at in cur.fetchall():
+                    self._note_room(domain, room, updated_at)
+                result["by_domain"] = self._by_domain()
+        self._model = result
+        self.stats["full_scans"] += 1
+
+    def _note_room(self, domain, room, updated_at):
+        """Record one room_configs row; True when it adds a new domain/room pair."""
+        if isinstance(updated_at, str) and updated_at > self._watermark:
+            self._watermark = updated_at
+        # every key is tracked (so _incremental can compare key counts), but
+        # only string pairs are exported
+        is_new = (domain, room) not in self._rooms
+        self._rooms[(domain, room)] = updated_at
+        return is_new and isinstance(domain, str) and isinstance(room, str)
+
+    def _by_domain(self):
+        by_domain = {}
+        for domain, room in self._rooms:
+            if isinstance(domain, str) and isinstance(room, str):
+                by_domain.setdefault(domain, set()).add(room)
+        return {k: sorted(list(v)) for k, v in by_domain.items()}
+
+    def _incremental(self, cur):
+        """Patch the model from rows at/after the watermark; False: full scan needed."""
+        if not self._has_updated_at:
+            return False
+        cur.execute(
+            "SELECT config_domain, room_id, updated_at FROM room_configs"
+            " WHERE updated_at >= ?",
+            (self._watermark,),
+        )
+        added = False
+        for domain, room, updated_at in cur.fetchall():
+            added = self._note_room(domain, room, updated_at) or added
+        # Deletes leave no row behind, and a delete plus an insert keeps COUNT
+        # unchanged. Every live key is tracked by now, so the tracked set only
+        # matches the table when no tracked key has gone.
+        keys = cur.execute(
+            "SELECT COUNT(1) FROM"
+            " (SELECT DISTINCT config_domain, room_id FROM room_configs)"
+        ).fetchone()[0]
+        if int(keys) != len(self._rooms):
+            return False
+        count = int(cur.execute("SELECT COUNT(1) FROM room_configs").fetchone()[0])
+        if added:
+            self._model["by_domain"] = self._by_domain()
+        self._model["counts"]["room_configs"] = count
+        self.stats["incremental"] += 1
+        return True
+
+    def _refresh(self):
+        """Bring the in-memory model up to date; True if the export content changed."""
+        with self._lock:
+            try:
+                cur = self._connection().cursor()
+                data_version = cur.execute("PRAGMA data_version").fetchone()[0]
+                if self._model is not None and data_version == self._data_version:
+                    self.stats["unchanged"] += 1
+                    return False
+                before = json.dumps(self._model, sort_keys=True)
+                schema_cookie = cur.execute("PRAGMA schema_version").fetchone()[0]
+                if (
+                    self._model is None
+                    or schema_cookie != self._schema_cookie
+                    or not self._incremental(cur)
+                ):
+                    self._full_scan(cur)
+                self._data_version = data_version
+                self._schema_cookie = schema_cookie
+                return json.dumps(self._model, sort_keys=True) != before
+            except sqlite3.Error:
+                self._close()
+                raise
+
     def _handle_export(self, data):
         try:
-            conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
-            cur = conn.cursor()
-            cur.execute("SELECT name FROM sqlite_master WHERE type='table'")
-            tables = [r[0] for r in cur.fetchall()]
-            result = {
-                "schema_version": self.schema_version,
-                "db_path": self.db_path,
-                "exported_at": int(time.time()),
-                "tables": tables,
-                "by_domain": {},
-                "counts": {},
-            }
-            # counts for each table
-            for t in tables:
-                try:
-                    cur.execute(f"SELECT COUNT(1) FROM {t}")
-                    result["counts"][t] = int(cur.fetchone()[0])
-                except Exception:
-                    result["counts"][t] = None
-            # If room_configs exists, extract domain→rooms
-            if "room_configs" in tables:
-                cur.execute("PRAGMA table_info(room_configs)")
-                cols = [r[1] for r in cur.fetchall()]
-                if set(["config_domain", "room_id"]).issubset(set(cols)):
-                    cur.execute("SELECT DISTINCT config_domain, room_id FROM room_configs")
-                    by_domain = {}
-                    for domain, room in cur.fetchall():
-                        if isinstance(domain, str) and isinstance(room, str):
-                            by_domain.setdefault(domain, set()).add(room)
-                    result["by_domain"] = {k: sorted(list(v)) for k, v in by_domain.items()}
+            self._refresh()
+            with self._lock:
+                result = json.loads(json.dumps(self._model))
+            result["exported_at"] = int(time.time())
             return result, 200
         except Exception as e:
             return {"error": str(e)}, 500
-        finally:
-            with contextlib.suppress(Exception):
-                conn.close()
 
     # ---- Debounced write support ----
     def _write_once_ep(self, request, data):
         try:
-            self.write_once()
-            return ({"status": "ok"}, 200)
+            self._refresh()
+            self.flush_export(force=True)
+            return ({"status": "ok", "stats": dict(self.stats)}, 200)
         except Exception as e:
             return ({"status": "error", "error": str(e)}, 500)
 
-    def write_once(self):
-        """Export once to disk (debounced via schedule)."""
+    def write_once(self, *args, **kwargs):
+        """Pick up Room-DB changes; schedule a debounced write if the export changed."""
         try:
-            payload, code = self._handle_export({})
-            if code != 200:
-                raise RuntimeError(payload)
-            self._atomic_write_json(self.export_path, payload)
-            self.log(f"Room-DB exported to {self.export_path}")
+            changed = self._refresh()
+            with self._lock:
+                if (
+                    changed or not os.path.exists(self.export_path)
+                ) and not self._dirty:
+                    self._dirty, self._dirty_since = True, time.monotonic()
+                dirty = self._dirty
+            if dirty:
+                self.schedule_debounced(self.debounce_seconds)
         except Exception as e:
             self.error(f"Export write_once failed: {e}")
 
+    def flush_export(self, force: bool = False):
+        """Write the export file atomically if it is out of date (or ``force``)."""
+        with self._lock:
+            self._debounce_handle = None
+            if not (self._dirty or force) or self._model is None:
+                return False
+            payload = json.loads(json.dumps(self._model))
+            self._dirty, self._dirty_since = False, None
+        payload["exported_at"] = int(time.time())
+        self._atomic_write_json(self.export_path, payload)
+        self.stats["writes"] += 1
+        self.log(f"Room-DB exported to {self.export_path}")
+        return True
+
+    def _flush_export_cb(self, *args, **kwargs):
+        try:
+            self.flush_export()
+        except Exception as e:
+            self.error(f"Export write failed: {e}")
+
     def schedule_debounced(self, delay: float = 1.0):
-        if self._debounce_handle:
-            with contextlib.suppress(Exception):
-                self.cancel_timer(self._debounce_handle)
-        self._debounce_handle = self.run_in(lambda *_: self.write_once(), delay)
+        """(Re)start the debounce timer; a write never waits past max_delay_seconds."""
+        with self._lock:
+            if self._dirty_since is not None:
+                remaining = self.max_delay_seconds - (
+                    time.monotonic() - self._dirty_since
+                )
+                delay = max(0.0, min(delay, remaining))
+            if self._debounce_handle:
+                with contextlib.suppress(Exception):
+                    self.cancel_timer(self._debounce_handle)
+            self._debounce_handle = self.run_in(self._flush_export_cb, delay)
 
     def _atomic_write_json(self, path: str, data: dict):
         os.makedirs(os.path.dirname(path), exist_ok=True)
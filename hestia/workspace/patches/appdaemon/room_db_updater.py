@@ -1,9 +1,13 @@
+import contextlib
+import functools
 import json
 import os
+import random
 import re
 import sqlite3
+import threading
 import time
-import random
+from collections import deque
 
 import yaml
 
@@ -33,6 +37,299 @@ except Exception:
 ROOM_ID_RE = re.compile(r"^[a-z0-9_]+$")
 
 
+class MappingDenied(ValueError):
+    """domain:room_id combination not granted by the mapping capabilities (HTTP 422)."""
+
+
+class WriteRateLimited(RuntimeError):
+    """A domain is still cooling down; ``retry_after`` is in seconds (HTTP 429)."""
+
+    def __init__(self, retry_after):
+        super().__init__("WRITE_RATE_LIMIT")
+        self.retry_after = retry_after
+
+# Statement text is kept constant so sqlite3's per-connection statement cache
+# reuses the prepared statement instead of re-parsing it on every write.
+SQL_SCHEMA_VERSION = "SELECT version FROM schema_version"
+SQL_UPSERT_CONFIG = (
+    "INSERT OR REPLACE INTO room_configs "
+    "(room_id, config_domain, config_data, updated_at) "
+    "VALUES (?,?,?, datetime('now'))"
+)
+
+
+def json_path(key):
+    """SQLite JSON path for a dotted config key (``a.b`` -> ``$."a"."b"``)."""
+    parts = str(key).split(".")
+    if not all(parts) or any('"' in part for part in parts):
+        raise ValueError(f"Invalid config key path: {key!r}")
+    return "$" + "".join(f'."{part}"' for part in parts)
+
+
+@functools.lru_cache(maxsize=16)
+def merge_upsert_sql(n_increments):
+    """Upsert applying a merge patch and ``n_increments`` counter bumps at once.
+
+    Named parameters: ``:room_id``, ``:domain``, ``:patch`` (JSON object,
+    RFC 7396: nested objects merge, ``null`` deletes a key) and ``:p<i>`` /
+    ``:d<i>`` (JSON path / numeric delta; a missing counter starts at 0).
+    The statement text depends only on the number of increments, so each
+    shape is prepared once and then served from the statement cache.
+    """
+
+    def merged(current):
+        valid = f"CASE WHEN json_valid({current}) THEN {current} ELSE '{{}}' END"
+        doc = f"json_patch({valid}, :patch)"
+        if not n_increments:
+            return doc
+        bumps = ", ".join(
+            f":p{i}, COALESCE(json_extract({doc}, :p{i}), 0) + :d{i}"
+            for i in range(n_increments)
+        )
+        return f"json_set({doc}, {bumps})"
+
+    new_row = merged("'{}'")
+    return (
+        "INSERT INTO room_configs (room_id, config_domain, config_data, updated_at) "
+        f"VALUES (:room_id, :domain, {new_row}, datetime('now')) "
+        "ON CONFLICT(room_id, config_domain) DO UPDATE SET "
+        f"config_data = {merged('room_configs.config_data')}, "
+        "updated_at = excluded.updated_at"
+    )
+
+
+def merge_params(room_id, domain, patch, increment):
+    params = {
+        "room_id": room_id,
+        "domain": domain,
+        "patch": json.dumps(patch, separators=(",", ":")),
+    }
+    for i, (key, delta) in enumerate(sorted(increment.items())):
+        params[f"p{i}"] = json_path(key)
+        params[f"d{i}"] = delta
+    return params
+
+
+def compose_patches(first, second):
+    """One merge patch equivalent to applying ``first`` and then ``second``.
+
+    Returns None when there is none: if ``first`` sets a key to a scalar (or
+    deletes it) and ``second`` sets it to an object, the object must replace
+    the value, but as a merge patch it would merge into whatever the stored
+    document held before ``first``.
+    """
+    out = dict(first)
+    for key, value in second.items():
+        if isinstance(value, dict) and key in first:
+            if not isinstance(first[key], dict):
+                return None
+            value = compose_patches(first[key], value)
+            if value is None:
+                return None
+        out[key] = value
+    return out
+
+
+def patch_effect(patch, key):
+    """What merge patch ``patch`` does to the value at dotted ``key``.
+
+    ``"untouched"``, ``"replaced"`` (it or an ancestor is set to a scalar or
+    deleted) or ``"merged"`` (an object is merged into it or an ancestor, so
+    the outcome depends on what is stored there).
+    """
+    node = patch
+    for depth, part in enumerate(str(key).split(".")):
+        if part not in node:
+            return "merged" if depth else "untouched"
+        node = node[part]
+        if not isinstance(node, dict):
+            return "replaced"
+    return "merged"
+
+
+def nested_keys(first, second):
+    return first != second and (
+        first.startswith(f"{second}.") or second.startswith(f"{first}.")
+    )
+
+
+def add_increments(first, second):
+    out = dict(first)
+    for key, delta in second.items():
+        out[key] = out.get(key, 0) + delta
+    return out
+
+
+def coalesce(first, second):
+    """One ``(patch, increment)`` update equivalent to ``first`` then ``second``.
+
+    An upsert applies its patch before its increments, so increments from
+    ``first`` on keys that ``second`` replaces are dropped rather than
+    re-applied on top of the new value. Returns None when the two cannot be
+    folded into one statement: see compose_patches, or ``second`` merges an
+    object over a counter ``first`` bumps, or the increments would mix a
+    counter and one of its ancestors.
+    """
+    patch = compose_patches(first[0], second[0])
+    if patch is None:
+        return None
+    kept = {}
+    for key, delta in first[1].items():
+        effect = patch_effect(second[0], key)
+        if effect == "merged":
+            return None
+        if effect == "untouched":
+            kept[key] = delta
+    if any(nested_keys(a, b) for a in kept for b in second[1]):
+        return None
+    return patch, add_increments(kept, second[1])
+
+
+def append_update(updates, update):
+    """Add ``update`` to a room/domain's ordered list of pending updates.
+
+    It is folded into the last one when possible (returns True), otherwise
+    appended and written after it, in the same transaction.
+    """
+    merged = coalesce(updates[-1], update) if updates else None
+    if merged is None:
+        updates.append(update)
+        return False
+    updates[-1] = merged
+    return True
+
+
+class RoomDbConnection:
+    """Long-lived, thread-safe SQLite connection for the Room-DB app.
+
+    Opened once (WAL, synchronous=NORMAL, busy timeout, as database_init.sql
+    declares); the schema is created/verified when the connection is opened,
+    not per request. A connection that fails with anything other than a busy
+    or constraint error is dropped and reopened (and re-verified) on next use.
+    """
+
+    def __init__(
+        self, db_path, schema_expected, busy_timeout_ms=5000, statement_cache_size=64
+    ):
+        self.db_path = db_path
+        self.schema_expected = schema_expected
+        self.busy_timeout_ms = int(busy_timeout_ms)
+        self.statement_cache_size = int(statement_cache_size)
+        self.connects = 0
+        self._conn = None
+        self._lock = threading.RLock()
+
+    def _open(self):
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.busy_timeout_ms / 1000.0,
+            isolation_level=None,  # explicit BEGIN IMMEDIATE / COMMIT below
+            check_same_thread=False,  # AppDaemon calls endpoints from worker threads
+            cached_statements=self.statement_cache_size,
+        )
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={self.busy_timeout_ms}")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS schema_version"
+                " (version INTEGER PRIMARY KEY)"
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS room_configs (
+                    room_id TEXT,
+                    config_domain TEXT,
+                    config_data TEXT,
+                    updated_at TIMESTAMP,
+                    PRIMARY KEY (room_id, config_domain)
+                )
+            """
+            )
+            # lets RoomDbExporter read only rows changed since its high-water mark
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_room_configs_updated_at"
+                " ON room_configs (updated_at)"
+            )
+            conn.execute(
+                "INSERT OR IGNORE INTO schema_version (version) VALUES (?)",
+                (self.schema_expected,),
+            )
+            row = conn.execute(SQL_SCHEMA_VERSION).fetchone()
+            if not row:
+                raise RuntimeError("SCHEMA_VERSION_TABLE_MISSING")
+            if int(row[0]) != self.schema_expected:
+                raise RuntimeError("SCHEMA_VERSION_MISMATCH")
+        except Exception:
+            conn.close()
+            raise
+        return conn
+
+    def connection(self):
+        """The open connection, (re)connecting and re-checking the schema if needed."""
+        with self._lock:
+            if self._conn is None:
+                self._conn = self._open()
+                self.connects += 1
+            return self._conn
+
+    @staticmethod
+    def _keeps_connection(err):
+        msg = str(err).lower()
+        return (
+            isinstance(err, sqlite3.IntegrityError) or "locked" in msg or "busy" in msg
+        )
+
+    def write(self, sql, params=()):
+        """Run one statement in its own BEGIN IMMEDIATE transaction."""
+        self.write_many(sql, [params])
+
+    def write_many(self, sql, rows):
+        """Run ``sql`` per row in one BEGIN IMMEDIATE transaction (all or nothing)."""
+        self.write_batch([(sql, rows)])
+
+    def write_batch(self, statements):
+        """Run several ``(sql, rows)`` executemany calls in one transaction (atomic)."""
+        statements = [(sql, list(rows)) for sql, rows in statements]
+        with self._lock:
+            try:
+                self._write_once(statements)
+            except sqlite3.ProgrammingError:
+                # stale handle (closed underneath us): reconnect and retry once
+                self._write_once(statements)
+
+    def _write_once(self, statements):
+        with self._lock:
+            conn = self.connection()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                for sql, rows in statements:
+                    conn.executemany(sql, rows)
+                conn.execute("COMMIT")
+            except sqlite3.Error as e:
+                with contextlib.suppress(sqlite3.Error):
+                    if conn.in_transaction:
+                        conn.execute("ROLLBACK")
+                if not self._keeps_connection(e):
+                    self.close()
+                raise
+
+    def ping(self):
+        with self._lock:
+            try:
+                self.connection().execute("SELECT 1").fetchone()
+            except sqlite3.Error:
+                self.close()
+                raise
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                with contextlib.suppress(sqlite3.Error):
+                    self._conn.close()
+                self._conn = None
+
+
 class RoomDbUpdater(hassapi.Hass):
     def initialize(self):
         self.db_path = self.args.get("db_path", "/config/room_database.db")
@@ -45,18 +342,57 @@ class RoomDbUpdater(hassapi.Hass):
         self.write_rate_limit_seconds = int(self.args.get("write_rate_limit_seconds", 2))
 
         self._last_write = {}
-    self._canonical_rooms = None
-    self._allowed_matrix = None  # {room_id: set(domains)} built from mapping capabilities
-    self._next_write_ts = {}  # per-domain limiter with jitter
+        self._canonical_rooms = None
+        # {room_id: set(domains)} built from mapping capabilities
+        self._allowed_matrix = None
+        self._next_write_ts = {}  # per-domain limiter with jitter
         self._mapping_path = None
         self._init_error = None
+        self.db = RoomDbConnection(
+            self.db_path,
+            self.schema_expected,
+            busy_timeout_ms=int(self.args.get("busy_timeout_ms", 5000)),
+        )
+
+        # Write-behind queue: {(room_id, domain): [(patch, increment), ...]} in
+        # arrival order (coalesced where possible), flushed on a timer
+        self.flush_interval_seconds = float(
+            self.args.get(
+                "flush_interval_seconds", max(1, self.write_rate_limit_seconds)
+            )
+        )
+        self.max_pending = int(self.args.get("max_pending", 64))
+        # failed flushes back off exponentially; an update that failed
+        # flush_max_retries times is dropped into the dead-letter list
+        self.flush_max_retries = int(self.args.get("flush_max_retries", 5))
+        self.flush_max_backoff_seconds = float(
+            self.args.get("flush_max_backoff_seconds", 300)
+        )
+        self._pending = {}
+        self._inflight = {}
+        self._attempts = {}  # {(room_id, domain): failed flushes}
+        self._flush_failures = 0  # consecutive failed flushes
+        self.dead_letters = deque(
+            maxlen=int(self.args.get("dead_letter_limit", 100))
+        )
+        self._pending_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._flush_handle = None
+        self.queue_stats = {
+            "enqueued": 0,
+            "coalesced": 0,
+            "flushes": 0,
+            "rows_written": 0,
+            "flush_errors": 0,
+            "dead_lettered": 0,
+        }
 
         self.log("Registering health endpoint")
         self.register_endpoint(self.health_check, "health")
         self.log("Health endpoint registered with name: health")
 
-    self.log("Registering update_config endpoint")
-    self.register_endpoint(self.update_config, "update_config")
+        self.log("Registering update_config endpoint")
+        self.register_endpoint(self.update_config, "update_config")
         self.log("Update_config endpoint registered with name: update_config")
 
         try:
@@ -76,9 +412,17 @@ class RoomDbUpdater(hassapi.Hass):
             # New endpoints
             self.register_endpoint(self.bulk_update_ep, "room_db_bulk_update", methods=["POST"])
             self.register_endpoint(self.reload_mapping_ep, "room_db_reload_mapping", methods=["POST"])
+            self.register_endpoint(
+                self.enqueue_update_ep, "room_db_enqueue_update", methods=["POST"]
+            )
+            self.register_endpoint(
+                self.patch_config_ep, "room_db_patch_config", methods=["POST"]
+            )
             self.log(
                 "Global endpoints registered: "
-                "room_db_health, room_db_update_config, room_db_test, room_db_bulk_update, room_db_reload_mapping"
+                "room_db_health, room_db_update_config, room_db_test, "
+                "room_db_bulk_update, "
+                "room_db_reload_mapping, room_db_enqueue_update, room_db_patch_config"
             )
         except Exception as e:
             self.log(f"Global endpoint registration failed: {e}", level="WARNING")
@@ -106,38 +450,21 @@ class RoomDbUpdater(hassapi.Hass):
             self._init_error = str(e)
             self.error(f"Initialization encountered an issue: {e}")
 
+    def terminate(self):
+        try:
+            self._flush_pending()
+        finally:
+            self.db.close()
+
     def _init_database(self):
-        conn = sqlite3.connect(self.db_path)
         try:
-            cur = conn.cursor()
-            cur.execute(
-                """
-                CREATE TABLE IF NOT EXISTS schema_version (
-                    version INTEGER PRIMARY KEY
-                )
-            """
-            )
-            cur.execute(
-                """
-                CREATE TABLE IF NOT EXISTS room_configs (
-                    room_id TEXT,
-                    config_domain TEXT,
-                    config_data TEXT,
-                    updated_at TIMESTAMP,
-                    PRIMARY KEY (room_id, config_domain)
-                )
-            """
-            )
-            cur.execute(
-                "INSERT OR IGNORE INTO schema_version (version) VALUES (?)", (self.schema_expected,)
+            self.db.connection()
+            self.log(
+                f"Database initialized at {self.db_path} (WAL, persistent connection)"
             )
-            conn.commit()
-            self.log(f"Database initialized at {self.db_path}")
         except Exception as e:
             self.error(f"Database initialization failed: {e}")
             raise
-        finally:
-            conn.close()
 
     def _validate_config(self):
         self._mapping_path = self._resolve_mapping_path()
@@ -254,24 +581,137 @@ class RoomDbUpdater(hassapi.Hass):
                 f"Available rooms: {sorted(canonical_rooms)}"
             )
 
-    def _schema_ok(self, cur):
-        cur.execute("SELECT version FROM schema_version")
-        row = cur.fetchone()
-        if not row:
-            raise RuntimeError("SCHEMA_VERSION_TABLE_MISSING")
-        v = int(row[0])
-        if v != self.schema_expected:
-            raise RuntimeError("SCHEMA_VERSION_MISMATCH")
+    def _respect_write_limiter(self, *domains: str, wait: bool = False):
+        """Take one write token covering ``domains``.
 
-    def _respect_write_limiter(self, domain: str):
+        Raises WriteRateLimited when any of them is still cooling down, unless
+        ``wait`` is set, in which case it sleeps once until all are free.
+        """
         limit = int(self.write_rate_limit_seconds)
         jitter = random.uniform(-1.0, 1.0)
         now = time.monotonic()
-        next_ts = self._next_write_ts.get(domain, 0.0)
+        next_ts = max((self._next_write_ts.get(d, 0.0) for d in domains), default=0.0)
         if now < next_ts:
-            raise RuntimeError("WRITE_RATE_LIMIT")
+            if not wait:
+                raise WriteRateLimited(next_ts - now)
+            time.sleep(next_ts - now)
+            now = time.monotonic()
         # set next write time with jitter but never less than 1s in the future
-        self._next_write_ts[domain] = now + max(1.0, limit + jitter)
+        for domain in domains:
+            self._next_write_ts[domain] = now + max(1.0, limit + jitter)
+
+    def _prepare_item(self, data):
+        """Validate one update payload; returns the (room_id, domain, config_json) row.
+
+        Raises ValueError/FileNotFoundError for invalid input and MappingDenied
+        when the mapping does not grant the domain to the room.
+        """
+        required_fields = ["room_id", "domain", "config_data"]
+        missing = [f for f in required_fields if f not in data]
+        if missing:
+            raise ValueError(f"Missing required fields: {missing}")
+
+        room_id = data.get("room_id")
+        domain = data.get("domain")
+        cfg = data.get("config_data")
+
+        if domain is None:
+            raise ValueError("domain is required and cannot be None")
+
+        if domain not in self.allowed_domains:
+            raise ValueError(
+                f"Domain '{domain}' not allowed. "
+                f"Allowed domains: {list(self.allowed_domains)}"
+            )
+
+        if room_id is None:
+            raise ValueError("room_id is required and cannot be None")
+
+        self._validate_room(room_id)
+
+        # Mapping-based admission control (capability check)
+        if not self._is_allowed(domain, room_id):
+            raise MappingDenied(f"{domain}:{room_id} not allowed by mapping")
+
+        cfg_json = json.dumps(cfg, separators=(",", ":"))
+        if len(cfg_json.encode("utf-8")) > self.max_config_size_bytes:
+            raise ValueError(
+                f"Config too large: {len(cfg_json.encode('utf-8'))} bytes > "
+                f"{self.max_config_size_bytes}"
+            )
+        return room_id, domain, cfg_json
+
+    def _prepare_patch(self, data):
+        """Validate a partial update; returns (room_id, domain, patch, increment).
+
+        ``config_data`` is a JSON merge patch (object) and ``increment`` maps
+        dotted keys to numeric deltas. Same room/domain/mapping/size rules as
+        _prepare_item, with the size limit applied to the patch.
+        """
+        data = dict(data)
+        data.setdefault("config_data", {})
+        room_id, domain, _ = self._prepare_item(data)
+        patch = data.get("config_data")
+        if not isinstance(patch, dict):
+            raise ValueError("config_data must be an object for partial updates")
+        increment = data.get("increment") or {}
+        if not isinstance(increment, dict):
+            raise ValueError("increment must be an object of key -> number")
+        for key, delta in increment.items():
+            json_path(key)
+            if isinstance(delta, bool) or not isinstance(delta, (int, float)):
+                raise ValueError(f"increment for '{key}' must be a number")
+        return room_id, domain, patch, increment
+
+    def patch_config(self, data=None, **kwargs):
+        """Apply a merge patch and/or counter increments to one room/domain config.
+
+        The read-modify-write happens inside SQLite (json_patch/json_set in a
+        single upsert), so concurrent writers no longer overwrite each other
+        and counters need no read back through HA state.
+        """
+        try:
+            room_id, domain, patch, increment = self._prepare_patch(data or {})
+            self._respect_write_limiter(domain)
+            self.db.write(
+                merge_upsert_sql(len(increment)),
+                merge_params(room_id, domain, patch, increment),
+            )
+            self.log(f"Patched config for room '{room_id}', domain '{domain}'")
+            self._export_async()
+            return {"status": "ok", "room_id": room_id, "domain": domain}, 200
+        except MappingDenied as e:
+            return {"status": "error", "error": str(e)}, 422
+        except WriteRateLimited as e:
+            return {
+                "status": "error",
+                "error": str(e),
+                "retry_after_seconds": round(e.retry_after, 2),
+            }, 429
+        except (ValueError, FileNotFoundError) as e:
+            self.log(f"Validation error: {e}", level="WARNING")
+            return {"status": "error", "error": str(e)}, 400
+        except sqlite3.Error as e:
+            self.error(f"Database error: {e}")
+            self._notify_db_error(
+                e, (data or {}).get("room_id"), (data or {}).get("domain")
+            )
+            return {"status": "error", "error": "Database operation failed"}, 500
+        except Exception as e:
+            self.error(f"Unexpected error in patch_config: {e}")
+            return {"status": "error", "error": "Internal server error"}, 500
+
+    def patch_config_ep(self, request, data):
+        return self.patch_config(data)
+
+    def _notify_db_error(self, err, room_id=None, domain=None):
+        kwargs = {
+            "title": "Room DB Database Error",
+            "message": f"Database operation failed: {str(err)}",
+        }
+        if room_id and domain:
+            kwargs["notification_id"] = f"roomdb_err__{domain}__{room_id}"
+        self.call_service("persistent_notification/create", **kwargs)
 
     def index_endpoint(self, data=None, **kwargs):
         return {
@@ -287,6 +727,8 @@ class RoomDbUpdater(hassapi.Hass):
                 "/api/appdaemon/room_db_update_config",
                 "/api/appdaemon/room_db_bulk_update",
                 "/api/appdaemon/room_db_reload_mapping",
+                "/api/appdaemon/room_db_enqueue_update",
+                "/api/appdaemon/room_db_patch_config",
             ],
         }, 200
 
@@ -299,10 +741,7 @@ class RoomDbUpdater(hassapi.Hass):
 
     def health_check(self, data=None, **kwargs):
         try:
-            conn = sqlite3.connect(self.db_path)
-            cur = conn.cursor()
-            self._schema_ok(cur)
-            conn.close()
+            self.db.ping()
             canonical_rooms = []
             try:
                 canonical_rooms = list(self._load_canonical_mapping())
@@ -319,6 +758,10 @@ class RoomDbUpdater(hassapi.Hass):
                 "db_path": self.db_path,
                 "canonical_rooms_count": len(canonical_rooms),
                 "allowed_domains": list(self.allowed_domains),
+                "pending_writes": len(self._pending),
+                "write_queue": dict(self.queue_stats),
+                "flush_failure_streak": self._flush_failures,
+                "dead_letters": list(self.dead_letters),
                 "app_init_error": self._init_error,
             }, 200
         except Exception as e:
@@ -327,88 +770,28 @@ class RoomDbUpdater(hassapi.Hass):
     def update_config(self, data=None, **kwargs):
         try:
             data = data or {}
-            try:
-                conn = sqlite3.connect(self.db_path)
-                cur = conn.cursor()
-                self._schema_ok(cur)
-                conn.close()
-            except Exception:
-                self._init_database()
-
-            required_fields = ["room_id", "domain", "config_data"]
-            missing = [f for f in required_fields if f not in data]
-            if missing:
-                raise ValueError(f"Missing required fields: {missing}")
-
-            room_id = data.get("room_id")
-            domain = data.get("domain")
-            cfg = data.get("config_data")
-
-            if domain is None:
-                raise ValueError("domain is required and cannot be None")
-
-            if domain not in self.allowed_domains:
-                raise ValueError(
-                    f"Domain '{domain}' not allowed. Allowed domains: {list(self.allowed_domains)}"
-                )
-
-            if room_id is None:
-                raise ValueError("room_id is required and cannot be None")
-
-            self._validate_room(room_id)
-
-            # Mapping-based admission control (capability check)
-            if not self._is_allowed(domain, room_id):
-                return {"status": "error", "error": f"{domain}:{room_id} not allowed by mapping"}, 422
-
-            cfg_json = json.dumps(cfg, separators=(",", ":"))
-            if len(cfg_json.encode("utf-8")) > self.max_config_size_bytes:
-                raise ValueError(
-                    f"Config too large: {len(cfg_json.encode('utf-8'))} bytes > "
-                    f"{self.max_config_size_bytes}"
-                )
+            room_id, domain, cfg_json = self._prepare_item(data)
 
             self._respect_write_limiter(domain)
 
-            conn = sqlite3.connect(self.db_path)
-            cur = conn.cursor()
-            try:
-                self._schema_ok(cur)
-                conn.execute("BEGIN IMMEDIATE")
-                cur.execute(
-                    "INSERT OR REPLACE INTO room_configs "
-                    "(room_id, config_domain, config_data, updated_at) "
-                    "VALUES (?,?,?, datetime('now'))",
-                    (room_id, domain, cfg_json),
-                )
-                conn.commit()
-                self.log(f"Successfully updated config for room '{room_id}', domain '{domain}'")
-            except Exception:
-                conn.rollback()
-                raise
-            finally:
-                conn.close()
+            self.db.write(SQL_UPSERT_CONFIG, (room_id, domain, cfg_json))
+            self.log(
+                f"Successfully updated config for room '{room_id}', domain '{domain}'"
+            )
             # exporter hook (debounced)
             self._export_async()
             return {"status": "ok", "room_id": room_id, "domain": domain}, 200
 
+        except MappingDenied as e:
+            return {"status": "error", "error": str(e)}, 422
         except (ValueError, FileNotFoundError) as e:
             self.log(f"Validation error: {e}", level="WARNING")
             return {"status": "error", "error": str(e)}, 400
         except sqlite3.Error as e:
             self.error(f"Database error: {e}")
-            room_id = (data or {}).get("room_id")
-            domain = (data or {}).get("domain")
-            notif_id = None
-            if room_id and domain:
-                notif_id = f"roomdb_err__{domain}__{room_id}"
-            kwargs = {
-                "title": "Room DB Database Error",
-                "message": f"Database operation failed: {str(e)}",
-            }
-            if notif_id:
-                kwargs["notification_id"] = notif_id
-            self.call_service("persistent_notification/create", **kwargs)
+            self._notify_db_error(
+                e, (data or {}).get("room_id"), (data or {}).get("domain")
+            )
             return {"status": "error", "error": "Database operation failed"}, 500
         except Exception as e:
             self.error(f"Unexpected error in update_config: {e}")
@@ -448,28 +831,62 @@ class RoomDbUpdater(hassapi.Hass):
 
     # -------- New endpoints --------
     def bulk_update_ep(self, request, data):
-        """POST endpoint to process array of updates with per-item backoff.
+        """POST endpoint to apply an array of updates in one transaction.
         Accepts either a list of items or an object with 'items' key.
+
+        Every item is validated up front; the valid ones are written with a
+        single executemany in one BEGIN IMMEDIATE transaction and take one
+        rate-limit token for the batch. Results are returned per item, in
+        input order; items later in the batch win for the same room/domain.
         """
         try:
             items = data if isinstance(data, list) else (data or {}).get("items", [])
             if not items:
                 return ({"status": "error", "error": "no items"}, 400)
-            results = []
-            for it in items:
+            results = [None] * len(items)
+            rows, row_index = [], []
+            for i, it in enumerate(items):
                 payload = {
-                    "room_id": it.get("room_id"),
-                    "domain": it.get("domain"),
-                    "config_data": it.get("config_data", {}),
+                    "room_id": (it or {}).get("room_id"),
+                    "domain": (it or {}).get("domain"),
+                    "config_data": (it or {}).get("config_data", {}),
                 }
-                res, code = self.update_config(payload)
-                # On rate limit, backoff a bit and retry once
-                if code == 500 and res.get("error") == "Internal server error":
-                    time.sleep(0.5 + random.uniform(0, 0.5))
-                    res, code = self.update_config(payload)
-                results.append({"code": code, "result": res})
-            # exporter hook once after batch
-            self._export_async()
+                try:
+                    rows.append(self._prepare_item(payload))
+                    row_index.append(i)
+                except MappingDenied as e:
+                    results[i] = {
+                        "code": 422,
+                        "result": {"status": "error", "error": str(e)},
+                    }
+                except (ValueError, FileNotFoundError) as e:
+                    results[i] = {
+                        "code": 400,
+                        "result": {"status": "error", "error": str(e)},
+                    }
+
+            if rows:
+                # one token for the whole batch; wait for it once instead of per item
+                self._respect_write_limiter(*sorted({r[1] for r in rows}), wait=True)
+                try:
+                    self.db.write_many(SQL_UPSERT_CONFIG, rows)
+                    outcome = [
+                        ({"status": "ok", "room_id": r[0], "domain": r[1]}, 200)
+                        for r in rows
+                    ]
+                    self.log(
+                        f"Bulk update committed {len(rows)} configs in one transaction"
+                    )
+                except sqlite3.Error as e:
+                    self.error(f"Database error in bulk update: {e}")
+                    self._notify_db_error(e)
+                    outcome = [
+                        ({"status": "error", "error": "Database operation failed"}, 500)
+                    ] * len(rows)
+                for i, (res, code) in zip(row_index, outcome, strict=True):
+                    results[i] = {"code": code, "result": res}
+                # exporter hook once after batch
+                self._export_async()
             return ({"status": "ok", "results": results}, 200)
         except Exception as e:
             self.error(f"bulk_update_ep failed: {e}")
@@ -482,9 +899,216 @@ class RoomDbUpdater(hassapi.Hass):
         except Exception as e:
             return ({"status": "error", "error": str(e)}, 500)
 
+    # -------- Write-behind queue --------
+    def enqueue_update(self, room_id, domain, config_data=None, increment=None):
+        """Queue a config delta for (room_id, domain); returns (result, code).
+
+        ``config_data`` is a merge patch and ``increment`` maps keys to numeric
+        deltas (see patch_config). Deltas for the same room/domain are composed
+        (see coalesce; the result equals applying them in order, otherwise they
+        stay separate, ordered writes) and applied on the next timed flush, in
+        one transaction with everything else pending, via the json_patch
+        upsert. Nothing is rejected for
+        rate limiting: when ``max_pending`` distinct rooms/domains are already
+        waiting, the caller's thread flushes them first (back-pressure) and the
+        response says so. While flushes are failing the queue is not flushed
+        early and a full queue answers 503 with ``retry_after_seconds``.
+        Validation errors are returned immediately (400/422).
+        Other AppDaemon apps can call this directly via ``get_app``.
+        """
+        try:
+            key = (room_id, domain)
+            backpressure = False
+            if self._queue_full(key):
+                backpressure = True
+                self._flush_pending(backpressure=True)
+                if self._queue_full(key):
+                    return {
+                        "status": "error",
+                        "error": "Write queue full while database writes fail",
+                        "retry_after_seconds": self._flush_delay(),
+                    }, 503
+            _, _, patch, inc = self._prepare_patch(
+                {
+                    "room_id": room_id,
+                    "domain": domain,
+                    "config_data": config_data or {},
+                    "increment": increment,
+                }
+            )
+            with self._pending_lock:
+                updates = self._pending.setdefault(key, [])
+                merged = coalesce(updates[-1], (patch, inc)) if updates else None
+                # a composed patch over the size limit is kept as a separate write
+                coalesced = merged is not None and (
+                    len(json.dumps(merged[0], separators=(",", ":")).encode("utf-8"))
+                    <= self.max_config_size_bytes
+                )
+                if coalesced:
+                    updates[-1] = merged
+                else:
+                    updates.append((patch, inc))
+                self.queue_stats["enqueued"] += 1
+                if coalesced:
+                    self.queue_stats["coalesced"] += 1
+                pending = len(self._pending)
+            self._schedule_flush()
+            return {
+                "status": "queued",
+                "room_id": room_id,
+                "domain": domain,
+                "coalesced": coalesced,
+                "pending": pending,
+                "max_pending": self.max_pending,
+                "flush_in_seconds": self._flush_delay(),
+                "backpressure": backpressure,
+            }, 202
+        except MappingDenied as e:
+            return {"status": "error", "error": str(e)}, 422
+        except (ValueError, FileNotFoundError) as e:
+            self.log(f"Validation error: {e}", level="WARNING")
+            return {"status": "error", "error": str(e)}, 400
+        except Exception as e:
+            self.error(f"enqueue_update failed: {e}")
+            return {"status": "error", "error": "Internal server error"}, 500
+
+    def enqueue_update_ep(self, request, data):
+        data = data or {}
+        return self.enqueue_update(
+            data.get("room_id"),
+            data.get("domain"),
+            data.get("config_data", {}),
+            data.get("increment"),
+        )
+
+    def _queue_full(self, key):
+        """True if ``key`` would exceed max_pending (queued or in-flight keys)."""
+        with self._pending_lock:
+            if key in self._pending or key in self._inflight:
+                return False
+            return len(self._pending.keys() | self._inflight.keys()) >= self.max_pending
+
+    def _flush_delay(self):
+        """Seconds until the next flush: the interval, doubled per failed flush."""
+        if not self._flush_failures:
+            return self.flush_interval_seconds
+        return min(
+            self.flush_interval_seconds * 2**self._flush_failures,
+            max(self.flush_interval_seconds, self.flush_max_backoff_seconds),
+        )
+
+    def _schedule_flush(self):
+        with self._pending_lock:
+            if self._flush_handle is None and self._pending:
+                self._flush_handle = self.run_in(
+                    self._flush_pending, self._flush_delay()
+                )
+
+    def _flush_pending(self, *args, backpressure=False, **kwargs):
+        """Write every pending delta in one transaction; failed batches are requeued.
+
+        A failed batch is retried with exponential backoff (see _flush_delay);
+        updates that failed ``flush_max_retries`` flushes are dead-lettered.
+        Back-pressure flushes are skipped while the failure streak lasts.
+        """
+        with self._flush_lock:
+            if backpressure and self._flush_failures:
+                return 0
+            with self._pending_lock:
+                batch, self._pending = self._pending, {}
+                self._inflight = batch
+                self._flush_handle = None
+            if not batch:
+                return 0
+            # the n-th update of every room/domain goes in round n, one
+            # executemany per statement shape (number of increments), so
+            # updates that could not be coalesced still land in order
+            statements = []
+            rows = 0
+            for depth in range(max(len(updates) for updates in batch.values())):
+                by_shape = {}
+                for (room_id, domain), updates in batch.items():
+                    if depth < len(updates):
+                        patch, inc = updates[depth]
+                        by_shape.setdefault(len(inc), []).append(
+                            merge_params(room_id, domain, patch, inc)
+                        )
+                        rows += 1
+                statements.extend(
+                    (merge_upsert_sql(n), shape_rows)
+                    for n, shape_rows in by_shape.items()
+                )
+            try:
+                self.db.write_batch(statements)
+            except Exception as e:
+                self._requeue_failed(batch, e)
+                self.error(
+                    f"Write-behind flush of {rows} updates failed "
+                    f"({self._flush_failures} in a row): {e}"
+                )
+                if self._flush_failures == 1:
+                    # one notification per failure streak, not per retry
+                    self._notify_db_error(e)
+                self._schedule_flush()
+                return 0
+            with self._pending_lock:
+                self._inflight = {}
+                for key in batch:
+                    self._attempts.pop(key, None)
+                streak, self._flush_failures = self._flush_failures, 0
+                self.queue_stats["flushes"] += 1
+                self.queue_stats["rows_written"] += rows
+            if streak:
+                self.log(f"Write-behind queue recovered after {streak} failed flushes")
+            self.log(f"Write-behind flush committed {rows} updates")
+        self._export_async()
+        return rows
+
+    def _requeue_failed(self, batch, err):
+        """Put a failed batch back ahead of newer updates, or dead-letter it."""
+        with self._pending_lock:
+            self._inflight = {}
+            self._flush_failures += 1
+            self.queue_stats["flush_errors"] += 1
+            newer, self._pending = self._pending, {}
+            for key, updates in batch.items():
+                attempts = self._attempts.get(key, 0) + 1
+                if attempts >= self.flush_max_retries:
+                    self._attempts.pop(key, None)
+                    self.dead_letters.append(
+                        {
+                            "room_id": key[0],
+                            "domain": key[1],
+                            "updates": [
+                                {"config_data": patch, "increment": inc}
+                                for patch, inc in updates
+                            ],
+                            "attempts": attempts,
+                            "error": str(err),
+                            "failed_at": int(time.time()),
+                        }
+                    )
+                    self.queue_stats["dead_lettered"] += len(updates)
+                    self.error(
+                        f"Dropped {len(updates)} updates for {key[0]}/{key[1]} "
+                        f"after {attempts} failed flushes"
+                    )
+                    continue
+                self._attempts[key] = attempts
+                for update in newer.pop(key, []):
+                    append_update(updates, update)
+                self._pending[key] = updates
+            self._pending.update(newer)
+            # a timer armed by an enqueue during the flush would skip the backoff
+            if self._flush_handle is not None:
+                with contextlib.suppress(Exception):
+                    self.cancel_timer(self._flush_handle)
+                self._flush_handle = None
+
     def _export_async(self):
         """If exporter app is present, schedule a write_once soon (debounced)."""
-        try:
+        # exporter not available is non-fatal
+        with contextlib.suppress(Exception):
             # Slight delay to coalesce bursts
             self.run_in(
                 lambda *_: self.call_service(
@@ -492,6 +1116,3 @@ class RoomDbUpdater(hassapi.Hass):
                 ),
                 0.5,
             )
-        except Exception:
-            # exporter not available is non-fatal
-            pass
@@ -0,0 +1,291 @@
+import json
+import sqlite3
+import sys
+import threading
+from collections import deque
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import room_db_updater  # noqa: E402
+
+
+class FlakyConnection(room_db_updater.RoomDbConnection):
+    """Real connection whose next ``fail`` write_batch calls raise."""
+
+    fail = 0
+
+    def write_batch(self, statements):
+        if self.fail:
+            self.fail -= 1
+            raise sqlite3.OperationalError("disk I/O error")
+        super().write_batch(statements)
+
+
+@pytest.fixture
+def updater(tmp_path):
+    # the dummy hassapi fallback stands in for AppDaemon; set what initialize() would
+    upd = room_db_updater.RoomDbUpdater()
+    upd.args = {}
+    upd.allowed_domains = {"motion_lighting", "shared"}
+    upd.max_config_size_bytes = 4096
+    upd.db_path = str(tmp_path / "room.db")
+    upd.db = FlakyConnection(upd.db_path, 1)
+    upd._init_error = None
+    upd.flush_interval_seconds = 1
+    upd.max_pending = 64
+    upd.flush_max_retries = 3
+    upd.flush_max_backoff_seconds = 3
+    upd._pending = {}
+    upd._inflight = {}
+    upd._attempts = {}
+    upd._flush_failures = 0
+    upd.dead_letters = deque(maxlen=10)
+    upd._pending_lock = threading.Lock()
+    upd._flush_lock = threading.Lock()
+    upd._flush_handle = None
+    upd.queue_stats = {
+        "enqueued": 0,
+        "coalesced": 0,
+        "flushes": 0,
+        "rows_written": 0,
+        "flush_errors": 0,
+        "dead_lettered": 0,
+    }
+    upd.scheduled = []
+    upd.delays = []
+    upd.notified = []
+
+    def run_in(cb, delay, **kw):
+        upd.scheduled.append(cb)
+        upd.delays.append(delay)
+        return len(upd.scheduled)
+
+    upd.run_in = run_in
+    upd._notify_db_error = upd.notified.append
+    upd._validate_room = lambda room_id: None
+    upd._is_allowed = lambda domain, room_id: True
+    yield upd
+    upd.db.close()
+
+
+def stored(upd, room_id, domain="motion_lighting"):
+    row = upd.db.connection().execute(
+        "SELECT config_data FROM room_configs WHERE room_id=? AND config_domain=?",
+        (room_id, domain),
+    ).fetchone()
+    return None if row is None else json.loads(row[0])
+
+
+def test_enqueue_coalesces_per_room_domain(updater):
+    first, code = updater.enqueue_update(
+        "office", "motion_lighting", {"timeout": 60}, {"trigger_count": 1}
+    )
+    assert code == 202 and not first["coalesced"]
+    second, code = updater.enqueue_update(
+        "office",
+        "motion_lighting",
+        {"timeout": 90, "lux": {"max": 20}},
+        {"trigger_count": 1},
+    )
+    assert code == 202 and second["coalesced"] and second["pending"] == 1
+    assert stored(updater, "office") is None  # nothing written before the flush
+
+    assert updater._flush_pending() == 1
+    assert stored(updater, "office") == {
+        "timeout": 90,
+        "lux": {"max": 20},
+        "trigger_count": 2,
+    }
+    assert updater.queue_stats["enqueued"] == 2
+    assert updater.queue_stats["coalesced"] == 1
+    assert updater.queue_stats["rows_written"] == 1
+
+
+def test_flush_is_scheduled_once(updater):
+    updater.enqueue_update("office", "motion_lighting", {"a": 1})
+    updater.enqueue_update("kitchen", "motion_lighting", {"a": 1})
+    assert updater.scheduled == [updater._flush_pending]
+
+
+def test_failed_flush_requeues_and_keeps_newer_updates(updater):
+    updater.enqueue_update(
+        "office", "motion_lighting", {"timeout": 60}, {"trigger_count": 1}
+    )
+    updater.db.fail = 1
+    assert updater._flush_pending() == 0
+    assert updater.queue_stats["flush_errors"] == 1
+    assert stored(updater, "office") is None
+    # a new flush is scheduled for the re-queued batch
+    assert updater.scheduled[-1] == updater._flush_pending
+
+    updater.enqueue_update(
+        "office", "motion_lighting", {"timeout": 90}, {"trigger_count": 1}
+    )
+    assert updater._flush_pending() == 1
+    assert stored(updater, "office") == {"timeout": 90, "trigger_count": 2}
+
+
+def test_failed_flushes_back_off_and_notify_once(updater):
+    updater.enqueue_update("office", "motion_lighting", {"a": 1})
+    updater.db.fail = 3
+    for _ in range(3):
+        updater._flush_handle = None  # the timer fired
+        assert updater._flush_pending() == 0
+    # interval 1s doubled per failure, capped at flush_max_backoff_seconds
+    assert updater.delays == [1, 2, 3]
+    assert len(updater.notified) == 1
+    assert updater.queue_stats["flush_errors"] == 3
+
+    # the cap is reached: the update is dropped and reported, not retried forever
+    assert not updater._pending
+    assert updater.queue_stats["dead_lettered"] == 1
+    updater._load_canonical_mapping = lambda: {}
+    health, _ = updater.health_check()
+    assert health["flush_failure_streak"] == 3
+    assert health["dead_letters"][0]["room_id"] == "office"
+    assert health["dead_letters"][0]["updates"] == [
+        {"config_data": {"a": 1}, "increment": {}}
+    ]
+
+    # a successful flush ends the streak; the next failure notifies again
+    updater.enqueue_update("office", "motion_lighting", {"a": 2})
+    assert updater._flush_pending() == 1
+    assert updater._flush_failures == 0
+    assert stored(updater, "office") == {"a": 2}
+    updater.enqueue_update("office", "motion_lighting", {"a": 3})
+    updater.db.fail = 1
+    updater._flush_pending()
+    assert len(updater.notified) == 2
+
+
+def test_full_queue_is_not_flushed_while_writes_fail(updater):
+    updater.max_pending = 1
+    updater.enqueue_update("office", "motion_lighting", {"a": 1})
+    updater.db.fail = 1
+    assert updater._flush_pending() == 0
+    result, code = updater.enqueue_update("kitchen", "motion_lighting", {"a": 1})
+    assert code == 503 and result["retry_after_seconds"] == 2
+    assert list(updater._pending) == [("office", "motion_lighting")]
+    # updates for a key already queued are still accepted
+    assert updater.enqueue_update("office", "motion_lighting", {"b": 2})[1] == 202
+
+
+def test_invalid_update_is_rejected_without_queueing(updater):
+    result, code = updater.enqueue_update(
+        "office", "motion_lighting", {"a": 1}, {"count": "one"}
+    )
+    assert code == 400 and result["status"] == "error"
+    assert updater._flush_pending() == 0
+
+
+def test_backpressure_flushes_when_queue_is_full(updater):
+    updater.max_pending = 2
+    assert not updater.enqueue_update("office", "motion_lighting", {"a": 1})[0][
+        "backpressure"
+    ]
+    assert not updater.enqueue_update("kitchen", "motion_lighting", {"a": 1})[0][
+        "backpressure"
+    ]
+    # another delta for a key that is already waiting does not grow the queue
+    assert not updater.enqueue_update("office", "motion_lighting", {"b": 2})[0][
+        "backpressure"
+    ]
+    assert stored(updater, "office") is None
+
+    result, code = updater.enqueue_update("hallway", "motion_lighting", {"a": 1})
+    assert code == 202 and result["backpressure"] and result["pending"] == 1
+    assert stored(updater, "office") == {"a": 1, "b": 2}
+    assert stored(updater, "kitchen") == {"a": 1}
+    assert stored(updater, "hallway") is None
+
+
+SEQUENCES = {
+    "increment then reset": [({}, {"trigger_count": 1}), ({"trigger_count": 0}, {})],
+    "increment then delete": [
+        ({}, {"trigger_count": 1}),
+        ({"trigger_count": None}, {"other": 1}),
+    ],
+    "reset parent of counter": [
+        ({}, {"stats.hits": 1}),
+        ({"stats": {"hits": 5}}, {"stats.hits": 1}),
+    ],
+    "counter beside patched sibling": [
+        ({}, {"stats.hits": 1}),
+        ({"stats": {"misses": 2}}, {}),
+    ],
+    "scalar then object": [({"lux": 5}, {}), ({"lux": {"max": 20}}, {})],
+    "delete then object": [({"lux": None}, {}), ({"lux": {"max": 20}}, {"n": 1})],
+    "nested scalar then object": [
+        ({"a": {"b": 1}}, {}),
+        ({"a": {"b": {"c": 2}}}, {}),
+        ({"a": {"d": 3}}, {}),
+    ],
+    "object then scalar then increment": [
+        ({"a": {"b": 1}}, {}),
+        ({"a": 7}, {}),
+        ({}, {"a": 1}),
+    ],
+    "object over bumped counter": [({}, {"a": 1}), ({"a": {"b": 2}}, {})],
+}
+
+
+@pytest.mark.parametrize("updates", SEQUENCES.values(), ids=SEQUENCES.keys())
+def test_coalesced_flush_equals_sequential_application(updater, tmp_path, updates):
+    initial = {
+        "trigger_count": 3,
+        "lux": {"min": 1},
+        "a": {"x": 1},
+        "stats": {"hits": 2, "misses": 0},
+    }
+    reference = room_db_updater.RoomDbConnection(str(tmp_path / "reference.db"), 1)
+    for db in (reference, updater.db):
+        db.write(
+            room_db_updater.merge_upsert_sql(0),
+            room_db_updater.merge_params("office", "motion_lighting", initial, {}),
+        )
+    for patch, inc in updates:
+        reference.write(
+            room_db_updater.merge_upsert_sql(len(inc)),
+            room_db_updater.merge_params("office", "motion_lighting", patch, inc),
+        )
+        assert updater.enqueue_update("office", "motion_lighting", patch, inc)[1] == 202
+    updater._flush_pending()
+
+    expected = json.loads(
+        reference.connection()
+        .execute("SELECT config_data FROM room_configs")
+        .fetchone()[0]
+    )
+    reference.close()
+    assert stored(updater, "office") == expected
+
+
+def test_compose_patches_cannot_merge_object_over_scalar():
+    assert room_db_updater.compose_patches({"a": {"b": 1}}, {"a": {"c": 2}}) == {
+        "a": {"b": 1, "c": 2}
+    }
+    assert room_db_updater.compose_patches({"a": {"b": 1}}, {"a": 2}) == {"a": 2}
+    assert room_db_updater.compose_patches({"a": 1}, {"a": {"c": 2}}) is None
+    assert room_db_updater.compose_patches({"a": None}, {"a": {"c": 2}}) is None
+
+
+def test_patch_config_rate_limit_is_429(updater):
+    updater.write_rate_limit_seconds = 2
+    updater._next_write_ts = {}
+    updater._export_async = lambda: None
+    assert (
+        updater.patch_config(
+            {"room_id": "office", "domain": "motion_lighting", "config_data": {"a": 1}}
+        )[1]
+        == 200
+    )
+    result, code = updater.patch_config(
+        {"room_id": "office", "domain": "motion_lighting", "config_data": {"a": 2}}
+    )
+    assert code == 429
+    assert (
+        result["error"] == "WRITE_RATE_LIMIT" and 0 < result["retry_after_seconds"] <= 3
+    )
@@ -58,6 +58,8 @@ class ValetudoDefaultActivity(hass.Hass):
         )
         # AppDaemon wants domain/service with '/', accept dot and normalize:
         self.update_service = update_service_cfg.replace(".", "/")
+        # RoomDbUpdater app providing the write-behind queue (same AppDaemon instance)
+        self.room_db_app = self.args.get("room_db_app", "room_db_updater")
 
         self.cfg = {
             "mqtt": {
@@ -340,8 +342,30 @@ class ValetudoDefaultActivity(hass.Hass):
                 return False
         return True
 
+    def _room_db(self):
+        """The RoomDbUpdater app when it runs in this AppDaemon instance, else None."""
+        try:
+            app = self.get_app(self.room_db_app)
+        except Exception:
+            return None
+        return app if hasattr(app, "enqueue_update") else None
+
     def _writeback(self, room, config_delta: dict):
         domain = "vacuum_control"
+        # Preferred: write-behind queue; room deltas are merged, not rate-limited
+        updater = self._room_db()
+        if updater is not None:
+            result, code = updater.enqueue_update(room, domain, config_delta)
+            if code == 202:
+                self.log(
+                    f"Room-DB writeback queued: {room} {config_delta}", level="INFO"
+                )
+            else:
+                self.error(
+                    f"Room-DB writeback rejected for {room}: {result.get('error')}"
+                )
+            return
+
         key = (room, domain)
         last = self.last_write_ts.get(key, 0)
         now = time.time()